@@ -7,7 +7,7 @@ from alembic import context
 from app.config import settings
 from app.database import Base
 # 导入所有模型
-from app.models import user, article, tag, question, ability, progress, checkin, badge, user_ability
+from app.models import user, article, tag, question, ability, progress, checkin, badge, user_ability, recommendation, outbox, user_stats, checkin_calendar, rollup
 
 config = context.config
 
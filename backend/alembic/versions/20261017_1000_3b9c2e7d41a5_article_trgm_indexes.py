@@ -0,0 +1,52 @@
+"""article trgm indexes
+
+Revision ID: 3b9c2e7d41a5
+Revises: 60801e59976b
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9c2e7d41a5'
+down_revision: Union[str, None] = '60801e59976b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRGM_COLUMNS = ('title', 'source_book', 'content')
+
+
+def upgrade() -> None:
+    # 仅 PostgreSQL：文章搜索的 pg_trgm GIN 索引，无权限创建扩展时跳过（搜索回退到内存索引）
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("""
+        DO $$
+        BEGIN
+            CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        EXCEPTION WHEN insufficient_privilege THEN
+            RAISE NOTICE 'pg_trgm extension not installed';
+        END
+        $$;
+    """)
+    for column in TRGM_COLUMNS:
+        op.execute(f"""
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+                    CREATE INDEX IF NOT EXISTS ix_articles_{column}_trgm
+                        ON articles USING gin ({column} gin_trgm_ops);
+                END IF;
+            END
+            $$;
+        """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column in TRGM_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_articles_{column}_trgm")
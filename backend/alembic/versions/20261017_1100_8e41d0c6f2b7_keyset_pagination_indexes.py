@@ -0,0 +1,29 @@
+"""keyset pagination indexes
+
+Revision ID: 8e41d0c6f2b7
+Revises: 3b9c2e7d41a5
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e41d0c6f2b7'
+down_revision: Union[str, None] = '3b9c2e7d41a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_user_progresses_user_completed', 'user_progresses', ['user_id', 'completed_at', 'id'], unique=False)
+    op.create_index('ix_articles_created_at_id', 'articles', ['created_at', 'id'], unique=False)
+    op.create_index('ix_questions_article_order', 'questions', ['article_id', 'display_order', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_questions_article_order', table_name='questions')
+    op.drop_index('ix_articles_created_at_id', table_name='articles')
+    op.drop_index('ix_user_progresses_user_completed', table_name='user_progresses')
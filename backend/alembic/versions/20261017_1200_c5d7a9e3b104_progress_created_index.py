@@ -0,0 +1,25 @@
+"""progress created index
+
+Revision ID: c5d7a9e3b104
+Revises: 8e41d0c6f2b7
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d7a9e3b104'
+down_revision: Union[str, None] = '8e41d0c6f2b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_user_progresses_user_created', 'user_progresses', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_progresses_user_created', table_name='user_progresses')
@@ -0,0 +1,40 @@
+"""user recommendations
+
+Revision ID: d2f8b6a4c913
+Revises: c5d7a9e3b104
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f8b6a4c913'
+down_revision: Union[str, None] = 'c5d7a9e3b104'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_recommendations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.Enum('TODAY', 'WEAK_POINT', name='recommendationkindenum'), nullable=False, comment='推荐类型'),
+    sa.Column('for_date', sa.Date(), nullable=False, comment='适用日期'),
+    sa.Column('article_ids', sa.JSON(), nullable=False, comment='待推荐的文章 ID 队列'),
+    sa.Column('created_at', sa.DateTime(), nullable=True, comment='生成时间'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'kind', name='uq_user_recommendation_kind')
+    )
+    op.create_index(op.f('ix_user_recommendations_id'), 'user_recommendations', ['id'], unique=False)
+    op.create_index(op.f('ix_user_recommendations_user_id'), 'user_recommendations', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_user_recommendations_user_id'), table_name='user_recommendations')
+    op.drop_index(op.f('ix_user_recommendations_id'), table_name='user_recommendations')
+    op.drop_table('user_recommendations')
@@ -0,0 +1,48 @@
+"""completion outbox
+
+Revision ID: e7a3c1f5b820
+Revises: d2f8b6a4c913
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3c1f5b820'
+down_revision: Union[str, None] = 'd2f8b6a4c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('completion_outbox',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('progress_id', sa.Integer(), nullable=False, comment='阅读进度 ID'),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'PROCESSING', 'DONE', 'FAILED', name='outboxstatusenum'), nullable=False, comment='处理状态'),
+    sa.Column('attempts', sa.Integer(), nullable=False, comment='已尝试次数'),
+    sa.Column('available_at', sa.DateTime(), nullable=False, comment='最早可处理时间'),
+    sa.Column('locked_at', sa.DateTime(), nullable=True, comment='被 worker 领取的时间'),
+    sa.Column('result', sa.JSON(), nullable=True, comment='处理结果'),
+    sa.Column('last_error', sa.String(length=500), nullable=True, comment='最近一次失败原因'),
+    sa.Column('created_at', sa.DateTime(), nullable=True, comment='创建时间'),
+    sa.Column('processed_at', sa.DateTime(), nullable=True, comment='处理完成时间'),
+    sa.ForeignKeyConstraint(['progress_id'], ['user_progresses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('progress_id')
+    )
+    op.create_index(op.f('ix_completion_outbox_id'), 'completion_outbox', ['id'], unique=False)
+    op.create_index(op.f('ix_completion_outbox_user_id'), 'completion_outbox', ['user_id'], unique=False)
+    op.create_index('ix_completion_outbox_status_available', 'completion_outbox', ['status', 'available_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_completion_outbox_status_available', table_name='completion_outbox')
+    op.drop_index(op.f('ix_completion_outbox_user_id'), table_name='completion_outbox')
+    op.drop_index(op.f('ix_completion_outbox_id'), table_name='completion_outbox')
+    op.drop_table('completion_outbox')
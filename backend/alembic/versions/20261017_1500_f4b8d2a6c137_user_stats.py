@@ -0,0 +1,36 @@
+"""user stats counters
+
+Revision ID: f4b8d2a6c137
+Revises: e7a3c1f5b820
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8d2a6c137'
+down_revision: Union[str, None] = 'e7a3c1f5b820'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 不回填：缺少统计行的用户在首次读写时从明细重建，也可运行 scripts.reconcile_user_stats
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total_questions', sa.Integer(), nullable=False, comment='累计答题数'),
+    sa.Column('correct_count', sa.Integer(), nullable=False, comment='累计答对数'),
+    sa.Column('total_seconds', sa.Integer(), nullable=False, comment='累计阅读用时（秒）'),
+    sa.Column('badge_count', sa.Integer(), nullable=False, comment='已获得勋章数'),
+    sa.Column('updated_at', sa.DateTime(), nullable=True, comment='更新时间'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_stats')
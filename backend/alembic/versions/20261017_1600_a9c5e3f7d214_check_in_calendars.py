@@ -0,0 +1,35 @@
+"""check-in calendar bitmaps
+
+Revision ID: a9c5e3f7d214
+Revises: f4b8d2a6c137
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c5e3f7d214'
+down_revision: Union[str, None] = 'f4b8d2a6c137'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 数据由 scripts.migrate_checkin_calendars 从 check_ins 填充；未填充的年份读取时回退到 check_ins
+    op.create_table('check_in_calendars',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False, comment='年份'),
+    sa.Column('bits', sa.LargeBinary(length=46), nullable=False, comment='打卡位图'),
+    sa.Column('days_count', sa.Integer(), nullable=False, comment='当年打卡天数'),
+    sa.Column('updated_at', sa.DateTime(), nullable=True, comment='更新时间'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'year')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('check_in_calendars')
@@ -0,0 +1,46 @@
+"""daily rollups
+
+Revision ID: b6d1f8a3e925
+Revises: a9c5e3f7d214
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d1f8a3e925'
+down_revision: Union[str, None] = 'a9c5e3f7d214'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 历史数据由 scripts.backfill_daily_rollups 回填
+    op.create_table('daily_rollups',
+    sa.Column('day', sa.Date(), nullable=False, comment='日期'),
+    sa.Column('new_users', sa.Integer(), nullable=False, comment='新注册用户数'),
+    sa.Column('active_users', sa.Integer(), nullable=False, comment='开始过阅读的用户数'),
+    sa.Column('readings_completed', sa.Integer(), nullable=False, comment='完成阅读次数'),
+    sa.Column('answers', sa.Integer(), nullable=False, comment='答题数'),
+    sa.Column('correct_answers', sa.Integer(), nullable=False, comment='答对数'),
+    sa.Column('checkins', sa.Integer(), nullable=False, comment='打卡人数'),
+    sa.Column('updated_at', sa.DateTime(), nullable=True, comment='更新时间'),
+    sa.PrimaryKeyConstraint('day')
+    )
+    op.create_table('daily_ability_rollups',
+    sa.Column('day', sa.Date(), nullable=False, comment='日期'),
+    sa.Column('ability_id', sa.Integer(), nullable=False),
+    sa.Column('answers', sa.Integer(), nullable=False, comment='答题数'),
+    sa.Column('correct_answers', sa.Integer(), nullable=False, comment='答对数'),
+    sa.ForeignKeyConstraint(['ability_id'], ['ability_dimensions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('day', 'ability_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('daily_ability_rollups')
+    op.drop_table('daily_rollups')
@@ -0,0 +1,32 @@
+"""active user sketches
+
+Revision ID: c3e7a1d9f462
+Revises: b6d1f8a3e925
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e7a1d9f462'
+down_revision: Union[str, None] = 'b6d1f8a3e925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 没有草图的历史日期在首次查询时从 user_progresses 补建
+    op.create_table('active_user_sketches',
+    sa.Column('day', sa.Date(), nullable=False, comment='日期'),
+    sa.Column('registers', sa.LargeBinary(), nullable=False, comment='HyperLogLog 寄存器'),
+    sa.Column('updated_at', sa.DateTime(), nullable=True, comment='更新时间'),
+    sa.PrimaryKeyConstraint('day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('active_user_sketches')
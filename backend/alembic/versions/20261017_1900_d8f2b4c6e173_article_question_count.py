@@ -0,0 +1,30 @@
+"""article question count
+
+Revision ID: d8f2b4c6e173
+Revises: c3e7a1d9f462
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f2b4c6e173'
+down_revision: Union[str, None] = 'c3e7a1d9f462'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('articles', sa.Column('question_count', sa.Integer(), server_default='0', nullable=False, comment='题目数'))
+    op.execute(
+        "UPDATE articles SET question_count = "
+        "(SELECT count(*) FROM questions WHERE questions.article_id = articles.id)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('articles', 'question_count')
@@ -7,6 +7,7 @@ from app.database import get_db
 from app.utils.security import verify_token
 from app.utils.exceptions import AuthenticationError, NotFoundError
 from app.models.user import User
+from app.services.user_cache import user_cache
 
 
 async def get_current_user_optional(
@@ -31,9 +32,7 @@ async def get_current_user_optional(
         return None
     
     try:
-        result = await db.execute(select(User).where(User.id == int(user_id)))
-        user = result.scalar_one_or_none()
-        return user
+        return await user_cache.get_user(db, int(user_id))
     except SQLAlchemyError:
         return None
 
@@ -47,6 +46,62 @@ async def get_current_user(
     return user
 
 
+async def get_current_user_id(
+    authorization: Optional[str] = Header(None)
+) -> int:
+    """获取当前用户 ID（必须登录，不查询数据库）
+
+    直接信任已签名 Token 中的 sub，适用于只需要用户 ID 的接口。
+    """
+    if not authorization or not authorization.startswith("Bearer "):
+        raise AuthenticationError("请先登录")
+
+    payload = verify_token(authorization[7:])
+    if not payload:
+        raise AuthenticationError("请先登录")
+
+    try:
+        return int(payload.get("sub"))
+    except (TypeError, ValueError):
+        raise AuthenticationError("请先登录")
+
+
+async def get_idempotency_key(
+    idempotency_key: Optional[str] = Header(None, max_length=128)
+) -> Optional[str]:
+    """读取 Idempotency-Key 请求头（客户端为每次操作生成，重试时复用）"""
+    if not idempotency_key:
+        return None
+    return idempotency_key.strip() or None
+
+
+class CurrentUser:
+    """当前登录用户，完整用户信息在首次调用 load 时才加载"""
+
+    def __init__(self, user_id: int, db: AsyncSession):
+        self.id = user_id
+        self._db = db
+        self._user: Optional[User] = None
+
+    async def load(self) -> User:
+        if self._user is None:
+            try:
+                self._user = await user_cache.get_user(self._db, self.id)
+            except SQLAlchemyError:
+                self._user = None
+            if not self._user:
+                raise AuthenticationError("请先登录")
+        return self._user
+
+
+async def get_current_principal(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+) -> CurrentUser:
+    """获取当前登录用户（按需加载）"""
+    return CurrentUser(user_id, db)
+
+
 async def get_admin_user(
     authorization: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
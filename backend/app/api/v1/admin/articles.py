@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
@@ -11,7 +11,10 @@ from app.schemas.admin.article import (
     ArticleAdminResponse,
     ArticleListResponseAdmin
 )
+from app.schemas.admin.article_import import ImportResult
 from app.services.admin.article_service import admin_article_service
+from app.services.admin.import_service import admin_import_service, iter_lines, parse_csv, parse_jsonl
+from app.utils.pagination import next_cursor
 
 router = APIRouter()
 
@@ -22,18 +25,21 @@ async def get_article_list(
     page_size: int = Query(20, ge=1, le=100),
     status: Optional[str] = Query(None),
     keyword: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor，传入时忽略 page"),
+    with_total: bool = Query(True, description="是否返回总数"),
     db: AsyncSession = Depends(get_db),
     admin: dict = Depends(get_admin_user)
 ):
     items, total = await admin_article_service.get_article_list(
-        db, page, page_size, status, keyword
+        db, page, page_size, status, keyword, cursor, with_total
     )
     
     return ResponseModel(data=ArticleListResponseAdmin(
         items=items,
         total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        next_cursor=next_cursor(items, page_size, "created_at", "id")
     ))
 
 
@@ -47,6 +53,21 @@ async def create_article(
     return ResponseModel(data=result)
 
 
+@router.post("/import", response_model=ResponseModel[ImportResult])
+async def import_articles(
+    request: Request,
+    format: str = Query("jsonl", pattern="^(jsonl|csv)$", description="请求体格式：jsonl 或 csv"),
+    publish: bool = Query(False, description="导入后直接发布"),
+    db: AsyncSession = Depends(get_db),
+    admin: dict = Depends(get_admin_user)
+):
+    """批量导入文章及题目（请求体为 JSONL 或 CSV 文件内容，流式读取）"""
+    lines = iter_lines(request.stream())
+    records = parse_csv(lines) if format == "csv" else parse_jsonl(lines)
+    result = await admin_import_service.import_records(db, records, publish=publish)
+    return ResponseModel(data=result)
+
+
 @router.get("/{article_id}", response_model=ResponseModel[ArticleAdminResponse])
 async def get_article_detail(
     article_id: int,
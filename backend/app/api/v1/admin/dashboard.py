@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends
+from datetime import date, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, pool_metrics
 from app.api.deps import get_admin_user
 from app.schemas.common import ResponseModel
-from app.schemas.admin.user import DashboardStats
+from app.schemas.admin.user import DashboardStats, PoolStats, TimeseriesResponse, ActiveUsersEstimate
 from app.services.admin.dashboard_service import dashboard_service
+from app.utils.dates import business_today
 
 router = APIRouter()
 
@@ -17,3 +20,41 @@ async def get_dashboard(
 ):
     stats = await dashboard_service.get_stats(db)
     return ResponseModel(data=stats)
+
+
+@router.get("/timeseries", response_model=ResponseModel[TimeseriesResponse])
+async def get_timeseries(
+    metric: str = Query(..., description="new_users / active_users / readings_completed / answers / correct_answers / accuracy / checkins / ability_accuracy"),
+    start: Optional[date] = Query(None, alias="from", description="开始日期，默认结束日期前 89 天"),
+    end: Optional[date] = Query(None, alias="to", description="结束日期，默认今天"),
+    ability_id: Optional[int] = Query(None, description="metric=ability_accuracy 时必填"),
+    db: AsyncSession = Depends(get_db),
+    admin: dict = Depends(get_admin_user)
+):
+    """按天的指标趋势（读取每日汇总表）"""
+    end = end or business_today()
+    start = start or end - timedelta(days=89)
+    series = await dashboard_service.get_timeseries(db, metric, start, end, ability_id)
+    return ResponseModel(data=series)
+
+
+@router.get("/active-users", response_model=ResponseModel[ActiveUsersEstimate])
+async def get_active_users(
+    start: Optional[date] = Query(None, alias="from", description="开始日期，默认结束日期前 29 天"),
+    end: Optional[date] = Query(None, alias="to", description="结束日期，默认今天"),
+    db: AsyncSession = Depends(get_db),
+    admin: dict = Depends(get_admin_user)
+):
+    """区间内去重活跃用户数（HyperLogLog 估计值及相对标准误差）"""
+    end = end or business_today()
+    start = start or end - timedelta(days=29)
+    estimate = await dashboard_service.get_active_users(db, start, end)
+    return ResponseModel(data=estimate)
+
+
+@router.get("/pool", response_model=ResponseModel[PoolStats])
+async def get_pool_stats(
+    admin: dict = Depends(get_admin_user)
+):
+    """数据库连接池借出统计"""
+    return ResponseModel(data=PoolStats(**pool_metrics.snapshot()))
@@ -12,6 +12,7 @@ from app.schemas.admin.question import (
     QuestionListItemAdmin
 )
 from app.services.admin.question_service import admin_question_service
+from app.utils.pagination import next_cursor
 
 router = APIRouter()
 
@@ -22,18 +23,21 @@ async def get_question_list(
     page_size: int = Query(20, ge=1, le=100),
     article_id: Optional[int] = Query(None),
     question_type: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor，传入时忽略 page"),
+    with_total: bool = Query(True, description="是否返回总数"),
     db: AsyncSession = Depends(get_db),
     admin: dict = Depends(get_admin_user)
 ):
     items, total = await admin_question_service.get_question_list(
-        db, page, page_size, article_id, question_type
+        db, page, page_size, article_id, question_type, cursor, with_total
     )
     
     return ResponseModel(data={
         "items": items,
         "total": total,
         "page": page,
-        "page_size": page_size
+        "page_size": page_size,
+        "next_cursor": next_cursor(items, page_size, "article_id", "display_order", "id")
     })
 
 
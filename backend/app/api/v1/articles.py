@@ -10,6 +10,7 @@ from app.schemas.article import ArticleListResponse, ArticleDetail, ArticleListI
 from app.schemas.question import QuestionListResponse
 from app.services.article_service import article_service
 from app.services.question_service import question_service
+from app.utils.pagination import next_cursor
 
 router = APIRouter()
 
@@ -23,18 +24,20 @@ async def get_article_list(
     difficulty: Optional[int] = Query(None, ge=1, le=3, description="难度 1/2/3"),
     source: Optional[str] = Query(None, description="来源，如：伊索寓言"),
     keyword: Optional[str] = Query(None, description="关键词搜索"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor，传入时忽略 page"),
     db: AsyncSession = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     items, total = await article_service.get_article_list(
-        db, page, page_size, grade, genre, difficulty, source, keyword
+        db, page, page_size, grade, genre, difficulty, source, keyword, cursor
     )
     
     return ResponseModel(data=ArticleListResponse(
         items=items,
         total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        next_cursor=next_cursor(items, page_size, "id")
     ))
 
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.schemas.auth import (
@@ -38,10 +38,14 @@ async def wechat_login(
 @router.post("/admin-login", response_model=ResponseModel[TokenResponse])
 async def admin_login(
     request: AdminLoginRequest,
+    http_request: Request,
     db: AsyncSession = Depends(get_db)
 ):
+    client_ip = http_request.client.host if http_request.client else ""
     try:
-        access_token = await auth_service.admin_login(db, request.username, request.password)
+        access_token = await auth_service.admin_login(
+            db, request.username, request.password, client_ip
+        )
         
         return ResponseModel(
             data=TokenResponse(
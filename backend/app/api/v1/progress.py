@@ -1,21 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.api.deps import get_current_user
-from app.models.user import User
+from app.api.deps import get_current_user_id, get_idempotency_key
 from app.schemas.common import ResponseModel
 from app.schemas.progress import (
     StartReadingRequest,
     StartReadingResponse,
     SubmitAnswerRequest,
     SubmitAnswerResponse,
+    BatchSubmitAnswerRequest,
+    BatchSubmitAnswerResponse,
     CompleteReadingRequest,
     CompleteReadingResponse,
+    CompletionResultResponse,
     ProgressWithAnswers,
     HistoryItem,
-    HistoryListResponse
+    HistoryResponse
 )
 from app.services.progress_service import progress_service
+from app.services.idempotency import idempotency_store
+from app.utils.pagination import next_cursor
 
 router = APIRouter()
 
@@ -24,15 +29,22 @@ router = APIRouter()
 async def start_reading(
     request: StartReadingRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user_id),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key)
 ):
     try:
-        result = await progress_service.start_reading(
-            db=db,
-            user_id=current_user.id,
-            article_id=request.article_id
+        result = await idempotency_store.run(
+            current_user_id, idempotency_key, "progress.start", request,
+            lambda: progress_service.start_reading(
+                db=db,
+                user_id=current_user_id,
+                article_id=request.article_id
+            ),
+            StartReadingResponse
         )
         return ResponseModel(data=result)
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -51,17 +63,24 @@ async def submit_answer(
     progress_id: int,
     request: SubmitAnswerRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user_id),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key)
 ):
     try:
-        result = await progress_service.submit_answer(
-            db=db,
-            progress_id=progress_id,
-            user_id=current_user.id,
-            question_id=request.question_id,
-            user_answer=request.user_answer
+        result = await idempotency_store.run(
+            current_user_id, idempotency_key, f"progress.submit:{progress_id}", request,
+            lambda: progress_service.submit_answer(
+                db=db,
+                progress_id=progress_id,
+                user_id=current_user_id,
+                question_id=request.question_id,
+                user_answer=request.user_answer
+            ),
+            SubmitAnswerResponse
         )
         return ResponseModel(data=result)
+    except HTTPException:
+        raise
     except ValueError as e:
         await db.rollback()
         raise HTTPException(
@@ -76,21 +95,58 @@ async def submit_answer(
         )
 
 
+@router.post("/{progress_id}/submit-batch", response_model=ResponseModel[BatchSubmitAnswerResponse])
+async def submit_answers(
+    progress_id: int,
+    request: BatchSubmitAnswerRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key)
+):
+    try:
+        result = await idempotency_store.run(
+            current_user_id, idempotency_key, f"progress.submit-batch:{progress_id}", request,
+            lambda: progress_service.submit_answers(
+                db=db,
+                progress_id=progress_id,
+                user_id=current_user_id,
+                answers=request.answers
+            ),
+            BatchSubmitAnswerResponse
+        )
+        return ResponseModel(data=result)
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="服务器错误"
+        )
+
+
 @router.post("/{progress_id}/complete", response_model=ResponseModel[CompleteReadingResponse])
 async def complete_reading(
     progress_id: int,
     request: CompleteReadingRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user_id),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key)
 ):
     try:
-        result = await progress_service.complete_reading(
-            db=db,
-            progress_id=progress_id,
-            user_id=current_user.id,
-            time_spent=request.time_spent
+        result = await idempotency_store.run(
+            current_user_id, idempotency_key, f"progress.complete:{progress_id}", request,
+            lambda: progress_service.complete_reading(
+                db=db,
+                progress_id=progress_id,
+                user_id=current_user_id,
+                time_spent=request.time_spent
+            ),
+            CompleteReadingResponse
         )
         return ResponseModel(data=result)
+    except HTTPException:
+        raise
     except ValueError as e:
         await db.rollback()
         raise HTTPException(
@@ -105,23 +161,19 @@ async def complete_reading(
         )
 
 
-@router.get("/{progress_id}", response_model=ResponseModel[ProgressWithAnswers])
-async def get_progress_detail(
+@router.get("/{progress_id}/result", response_model=ResponseModel[CompletionResultResponse])
+async def get_completion_result(
     progress_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user_id)
 ):
+    """轮询阅读完成后的能力统计、打卡和新勋章（status 为 pending 时稍后重试）"""
     try:
-        result = await progress_service.get_progress_detail(
+        result = await progress_service.get_completion_result(
             db=db,
             progress_id=progress_id,
-            user_id=current_user.id
+            user_id=current_user_id
         )
-        if not result:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="进度记录不存在"
-            )
         return ResponseModel(data=result)
     except HTTPException:
         raise
@@ -133,27 +185,62 @@ async def get_progress_detail(
         )
 
 
-@router.get("/history", response_model=ResponseModel[HistoryListResponse])
+@router.get("/history", response_model=ResponseModel[HistoryResponse])
 async def get_history(
-    page: int = 1,
-    page_size: int = 20,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor，传入时忽略 page"),
+    with_total: bool = Query(True, description="是否返回总数"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user_id)
 ):
     try:
         items, total = await progress_service.get_history(
             db=db,
-            user_id=current_user.id,
+            user_id=current_user_id,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            cursor=cursor,
+            with_total=with_total
         )
-        return ResponseModel(data=HistoryListResponse(
+        return ResponseModel(data=HistoryResponse(
             items=items,
             total=total,
             page=page,
             page_size=page_size,
-            total_pages=(total + page_size - 1) // page_size
+            total_pages=(total + page_size - 1) // page_size if total is not None else None,
+            next_cursor=next_cursor(items, page_size, "completed_at", "id")
         ))
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="服务器错误"
+        )
+
+
+@router.get("/{progress_id}", response_model=ResponseModel[ProgressWithAnswers])
+async def get_progress_detail(
+    progress_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    try:
+        result = await progress_service.get_progress_detail(
+            db=db,
+            progress_id=progress_id,
+            user_id=current_user_id
+        )
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="进度记录不存在"
+            )
+        return ResponseModel(data=result)
+    except HTTPException:
+        raise
     except Exception as e:
         await db.rollback()
         raise HTTPException(
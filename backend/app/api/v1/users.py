@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import date
 from app.database import get_db
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_user_id
 from app.models.user import User
 from app.schemas.common import ResponseModel
 from app.schemas.user import (
@@ -11,9 +10,11 @@ from app.schemas.user import (
     UserStatsResponse,
     AbilityRadarResponse,
     CheckInResponse,
+    CheckInHistoryResponse,
     BadgeListResponse
 )
 from app.services.user_service import user_service
+from app.utils.dates import business_today
 
 router = APIRouter()
 
@@ -38,18 +39,18 @@ async def update_current_user(
 @router.get("/me/stats", response_model=ResponseModel[UserStatsResponse])
 async def get_user_stats(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    stats = await user_service.get_user_stats(db, current_user.id)
+    stats = await user_service.get_user_stats(db, current_user_id)
     return ResponseModel(data=stats)
 
 
 @router.get("/me/abilities", response_model=ResponseModel[AbilityRadarResponse])
 async def get_ability_radar(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    abilities = await user_service.get_ability_radar(db, current_user.id)
+    abilities = await user_service.get_ability_radar(db, current_user_id)
     return ResponseModel(data=AbilityRadarResponse(abilities=abilities))
 
 
@@ -58,15 +59,15 @@ async def get_checkins(
     year: int = Query(default=None, description="年份，默认当前年"),
     month: int = Query(default=None, ge=1, le=12, description="月份，默认当前月"),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    today = date.today()
+    today = business_today()
     if year is None:
         year = today.year
     if month is None:
         month = today.month
     
-    current_streak, records = await user_service.get_checkins(db, current_user.id, year, month)
+    current_streak, records = await user_service.get_checkins(db, current_user_id, year, month)
     
     return ResponseModel(data=CheckInResponse(
         current_streak=current_streak,
@@ -74,12 +75,21 @@ async def get_checkins(
     ))
 
 
+@router.get("/me/checkins/history", response_model=ResponseModel[CheckInHistoryResponse])
+async def get_checkin_history(
+    db: AsyncSession = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    history = await user_service.get_checkin_history(db, current_user_id, business_today())
+    return ResponseModel(data=history)
+
+
 @router.get("/me/badges", response_model=ResponseModel[BadgeListResponse])
 async def get_badges(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user_id)
 ):
-    earned_count, total_count, badges = await user_service.get_badges(db, current_user.id)
+    earned_count, total_count, badges = await user_service.get_badges(db, current_user_id)
     
     return ResponseModel(data=BadgeListResponse(
         earned_count=earned_count,
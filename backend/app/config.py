@@ -12,8 +12,29 @@ class Settings(BaseSettings):
 
     REDIS_URL: str = ""
 
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+    CATALOGUE_CACHE_TTL_SECONDS: int = 600
+    CATALOGUE_CACHE_MAX_SIZE: int = 5000
+    SEARCH_BACKEND: str = "auto"
+    RECOMMENDATION_READS_CACHE_SIZE: int = 10000
+    COMPLETION_PIPELINE: str = "outbox"
+    COMPLETION_WORKER_POLL_SECONDS: float = 5.0
+    COMPLETION_MAX_ATTEMPTS: int = 5
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_CACHE_MAX_SIZE: int = 10000
+    IMPORT_CHUNK_SIZE: int = 500
+    IMPORT_MAX_ERRORS: int = 1000
+    BUSINESS_TZ: str = ""
+
     WECHAT_APP_ID: str = ""
     WECHAT_APP_SECRET: str = ""
+    WECHAT_API_BASE_URL: str = "https://api.weixin.qq.com"
+    WECHAT_HTTP2: bool = True
+    WECHAT_HTTP_TIMEOUT: float = 5.0
+    WECHAT_HTTP_CONNECT_TIMEOUT: float = 3.0
+    WECHAT_HTTP_MAX_CONNECTIONS: int = 50
+    WECHAT_HTTP_MAX_KEEPALIVE: int = 20
 
     AI_API_URL: str = ""
     AI_API_KEY: str = ""
@@ -22,9 +43,15 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    TOKEN_CACHE_MAX_TTL_SECONDS: int = 300
 
     ADMIN_USERNAME: str = "admin"
     ADMIN_PASSWORD_HASH: str = ""
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 16
+    ADMIN_LOGIN_MAX_FAILURES: int = 5
+    ADMIN_LOGIN_WINDOW_SECONDS: int = 300
 
     ALLOWED_ORIGINS: List[str] = ["http://localhost:3000"]
 
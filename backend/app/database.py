@@ -1,3 +1,5 @@
+import time
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import settings
@@ -20,7 +22,65 @@ AsyncSessionLocal = sessionmaker(
 Base = declarative_base()
 
 
+class PoolMetrics:
+    """连接池借出统计
+
+    通过连接池事件记录借出次数、当前借出数、峰值以及连接持有时长，
+    用于观察高峰期连接池是否被长时间占用。
+    """
+
+    def __init__(self):
+        self.checked_out = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """清零累计指标（当前借出数是实时值，不清零）"""
+        self.checkouts = 0
+        self.peak_checked_out = self.checked_out
+        self.total_hold_seconds = 0.0
+        self.max_hold_seconds = 0.0
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        connection_record.info["checkout_at"] = time.monotonic()
+        self.checkouts += 1
+        self.checked_out += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def on_checkin(self, dbapi_connection, connection_record) -> None:
+        started = connection_record.info.pop("checkout_at", None)
+        if started is None:
+            return
+        held = time.monotonic() - started
+        self.checked_out -= 1
+        self.total_hold_seconds += held
+        self.max_hold_seconds = max(self.max_hold_seconds, held)
+
+    def snapshot(self) -> dict:
+        pool = engine.sync_engine.pool
+        avg_hold = self.total_hold_seconds / self.checkouts if self.checkouts else 0.0
+        return {
+            "pool_class": type(pool).__name__,
+            "pool_size": pool.size() if hasattr(pool, "size") else None,
+            "checkouts": self.checkouts,
+            "checked_out": self.checked_out,
+            "peak_checked_out": self.peak_checked_out,
+            "avg_hold_ms": round(avg_hold * 1000, 2),
+            "max_hold_ms": round(self.max_hold_seconds * 1000, 2),
+        }
+
+
+pool_metrics = PoolMetrics()
+event.listen(engine.sync_engine.pool, "checkout", pool_metrics.on_checkout)
+event.listen(engine.sync_engine.pool, "checkin", pool_metrics.on_checkin)
+
+
 async def get_db():
+    """获取数据库会话
+
+    会话是惰性的：只有第一次执行 SQL 时才从连接池借出连接，
+    commit/rollback 后连接即归还。未访问数据库的请求（如命中缓存）不占用连接。
+    依赖退出时显式 close，确保只读事务在响应发送前结束并归还连接。
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -1,8 +1,21 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
 from app.api.router import api_router
+from app.services.wechat_service import wechat_service
+from app.services.completion_worker import completion_worker
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.COMPLETION_PIPELINE != "inline":
+        completion_worker.start()
+    yield
+    await completion_worker.stop()
+    await wechat_service.aclose()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -10,6 +23,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -7,3 +7,8 @@ from .progress import UserProgress, QuestionAnswer
 from .checkin import CheckIn
 from .badge import Badge, UserBadge, BadgeCategoryEnum, BadgeConditionTypeEnum
 from .user_ability import UserAbility
+from .recommendation import UserRecommendation, RecommendationKindEnum
+from .outbox import CompletionOutbox, OutboxStatusEnum
+from .user_stats import UserStats
+from .checkin_calendar import CheckInCalendar
+from .rollup import DailyRollup, DailyAbilityRollup, ActiveUserSketch
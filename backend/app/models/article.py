@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum as SQLEnum, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum as SQLEnum, Boolean, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 import enum
@@ -36,6 +36,8 @@ class Article(Base):
     # 文章属性
     word_count = Column(Integer, nullable=False, comment="字数")
     reading_time = Column(Integer, nullable=False, comment="预计阅读时间(分钟)")
+    # 由 Question 的插入/删除事件维护（见 app.models.question），scripts.reconcile_question_counts 校对
+    question_count = Column(Integer, nullable=False, default=0, server_default="0", comment="题目数")
     article_difficulty = Column(SQLEnum(DifficultyEnum), default=DifficultyEnum.MEDIUM, comment="文章难度")
     
     # 状态
@@ -53,6 +55,11 @@ class Article(Base):
     tags = relationship("ArticleTag", back_populates="article", cascade="all, delete-orphan")
     progresses = relationship("UserProgress", back_populates="article")
     
+    # 管理端列表按 (created_at, id) 游标分页
+    __table_args__ = (
+        Index('ix_articles_created_at_id', 'created_at', 'id'),
+    )
+    
     def __repr__(self):
         return f"<Article(id={self.id}, title={self.title})>"
 
@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, LargeBinary, DateTime, ForeignKey
+from app.database import Base
+
+
+class CheckInCalendar(Base):
+    """用户某一年的打卡位图
+
+    bits 共 366 位（46 字节，小端序），第 n 位表示该年第 n+1 天是否打卡。
+    打卡明细仍写入 check_ins，本表由打卡流程同步维护，
+    可用 scripts.migrate_checkin_calendars 从 check_ins 重建。
+    """
+
+    __tablename__ = "check_in_calendars"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    year = Column(Integer, primary_key=True, comment="年份")
+    bits = Column(LargeBinary(46), nullable=False, comment="打卡位图")
+    days_count = Column(Integer, nullable=False, default=0, comment="当年打卡天数")
+
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        comment="更新时间",
+    )
+
+    def __repr__(self):
+        return f"<CheckInCalendar(user_id={self.user_id}, year={self.year}, days={self.days_count})>"
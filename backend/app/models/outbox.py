@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Enum as SQLEnum, Index
+from app.database import Base
+import enum
+
+
+class OutboxStatusEnum(enum.Enum):
+    """完成后处理任务状态枚举"""
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class CompletionOutbox(Base):
+    """阅读完成后的待处理任务（能力统计、打卡、勋章）
+
+    与完成记录在同一事务中写入，由后台 worker 消费，处理结果写回 result，
+    客户端轮询 /progress/{id}/result 获取。
+    """
+
+    __tablename__ = "completion_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    progress_id = Column(
+        Integer, ForeignKey("user_progresses.id", ondelete="CASCADE"),
+        nullable=False, unique=True, comment="阅读进度 ID"
+    )
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    status = Column(
+        SQLEnum(OutboxStatusEnum), nullable=False, default=OutboxStatusEnum.PENDING, comment="处理状态"
+    )
+    attempts = Column(Integer, nullable=False, default=0, comment="已尝试次数")
+    available_at = Column(
+        DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), comment="最早可处理时间"
+    )
+    locked_at = Column(DateTime, nullable=True, comment="被 worker 领取的时间")
+    result = Column(JSON, nullable=True, comment="处理结果")
+    last_error = Column(String(500), nullable=True, comment="最近一次失败原因")
+
+    created_at = Column(
+        DateTime, default=lambda: datetime.now(timezone.utc), comment="创建时间"
+    )
+    processed_at = Column(DateTime, nullable=True, comment="处理完成时间")
+
+    __table_args__ = (
+        Index("ix_completion_outbox_status_available", "status", "available_at"),
+    )
+
+    def __repr__(self):
+        return f"<CompletionOutbox(progress_id={self.progress_id}, status={self.status})>"
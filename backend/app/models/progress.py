@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -42,6 +42,12 @@ class UserProgress(Base):
         "QuestionAnswer", back_populates="progress", cascade="all, delete-orphan"
     )
 
+    # 阅读历史按 (completed_at, id) 游标分页；今日推荐按 created_at 范围查当天已读
+    __table_args__ = (
+        Index("ix_user_progresses_user_completed", "user_id", "completed_at", "id"),
+        Index("ix_user_progresses_user_created", "user_id", "created_at"),
+    )
+
     def __repr__(self):
         return f"<UserProgress(id={self.id}, user_id={self.user_id}, article_id={self.article_id})>"
 
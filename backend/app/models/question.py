@@ -10,10 +10,15 @@ from sqlalchemy import (
     JSON,
     Boolean,
     UniqueConstraint,
+    Index,
+    event,
+    update,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, attributes, object_session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 from app.database import Base
-from app.models.article import DifficultyEnum
+from app.models.article import Article, DifficultyEnum
 import enum
 
 
@@ -73,10 +78,48 @@ class Question(Base):
     )
     answers = relationship("QuestionAnswer", back_populates="question")
 
+    # 管理端列表按 (article_id, display_order, id) 游标分页
+    __table_args__ = (
+        Index("ix_questions_article_order", "article_id", "display_order", "id"),
+    )
+
     def __repr__(self):
         return f"<Question(id={self.id}, type={self.type})>"
 
 
+def _adjust_question_count(connection, target: Question, article_id: int, delta: int) -> None:
+    """在同一事务中增减 articles.question_count"""
+    articles = Article.__table__
+    connection.execute(
+        update(articles)
+        .where(articles.c.id == article_id)
+        .values(question_count=articles.c.question_count + delta)
+    )
+    # 会话已加载的文章同步计数（expire_on_commit=False，否则会一直读到旧值）
+    session = object_session(target)
+    article = session.identity_map.get(identity_key(Article, article_id)) if session else None
+    if article is not None and article.__dict__.get("question_count") is not None:
+        set_committed_value(article, "question_count", article.__dict__["question_count"] + delta)
+
+
+@event.listens_for(Question, "after_insert")
+def _question_inserted(mapper, connection, target):
+    _adjust_question_count(connection, target, target.article_id, 1)
+
+
+@event.listens_for(Question, "after_delete")
+def _question_deleted(mapper, connection, target):
+    _adjust_question_count(connection, target, target.article_id, -1)
+
+
+@event.listens_for(Question, "after_update")
+def _question_moved(mapper, connection, target):
+    history = attributes.get_history(target, "article_id")
+    if history.deleted and history.added:
+        _adjust_question_count(connection, target, history.deleted[0], -1)
+        _adjust_question_count(connection, target, history.added[0], 1)
+
+
 class QuestionAbility(Base):
     """题目-能力维度关联表"""
 
@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, JSON, Enum as SQLEnum, UniqueConstraint
+from app.database import Base
+import enum
+
+
+class RecommendationKindEnum(enum.Enum):
+    """推荐类型枚举"""
+
+    TODAY = "today"
+    WEAK_POINT = "weak_point"
+
+
+class UserRecommendation(Base):
+    """预计算的用户推荐队列（每晚由 scripts.precompute_recommendations 生成）"""
+
+    __tablename__ = "user_recommendations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    kind = Column(SQLEnum(RecommendationKindEnum), nullable=False, comment="推荐类型")
+    for_date = Column(Date, nullable=False, comment="适用日期")
+    article_ids = Column(JSON, nullable=False, comment="待推荐的文章 ID 队列")
+
+    created_at = Column(
+        DateTime, default=lambda: datetime.now(timezone.utc), comment="生成时间"
+    )
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "kind", name="uq_user_recommendation_kind"),
+    )
+
+    def __repr__(self):
+        return f"<UserRecommendation(user_id={self.user_id}, kind={self.kind}, date={self.for_date})>"
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey, LargeBinary
+from app.database import Base
+
+
+class DailyRollup(Base):
+    """按天汇总的运营指标（仪表盘趋势图用）
+
+    由注册、开始阅读和阅读完成后处理增量累加，
+    可用 scripts.backfill_daily_rollups 从明细重算。
+    答题相关指标按阅读完成当天计入。
+    """
+
+    __tablename__ = "daily_rollups"
+
+    day = Column(Date, primary_key=True, comment="日期")
+    new_users = Column(Integer, nullable=False, default=0, comment="新注册用户数")
+    active_users = Column(Integer, nullable=False, default=0, comment="开始过阅读的用户数")
+    readings_completed = Column(Integer, nullable=False, default=0, comment="完成阅读次数")
+    answers = Column(Integer, nullable=False, default=0, comment="答题数")
+    correct_answers = Column(Integer, nullable=False, default=0, comment="答对数")
+    checkins = Column(Integer, nullable=False, default=0, comment="打卡人数")
+
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        comment="更新时间",
+    )
+
+    def __repr__(self):
+        return f"<DailyRollup(day={self.day})>"
+
+
+class DailyAbilityRollup(Base):
+    """按天、按能力维度汇总的答题数和答对数"""
+
+    __tablename__ = "daily_ability_rollups"
+
+    day = Column(Date, primary_key=True, comment="日期")
+    ability_id = Column(
+        Integer, ForeignKey("ability_dimensions.id", ondelete="CASCADE"), primary_key=True
+    )
+    answers = Column(Integer, nullable=False, default=0, comment="答题数")
+    correct_answers = Column(Integer, nullable=False, default=0, comment="答对数")
+
+    def __repr__(self):
+        return f"<DailyAbilityRollup(day={self.day}, ability_id={self.ability_id})>"
+
+
+class ActiveUserSketch(Base):
+    """按天的活跃用户 HyperLogLog 草图（开始阅读的去重用户）
+
+    多天的草图合并后即可估算任意区间的去重活跃用户数。
+    """
+
+    __tablename__ = "active_user_sketches"
+
+    day = Column(Date, primary_key=True, comment="日期")
+    registers = Column(LargeBinary, nullable=False, default=b"", comment="HyperLogLog 寄存器")
+
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        comment="更新时间",
+    )
+
+    def __repr__(self):
+        return f"<ActiveUserSketch(day={self.day})>"
@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from app.database import Base
+
+
+class UserStats(Base):
+    """用户学习统计计数（个人主页用）
+
+    由答题、完成阅读和勋章发放增量维护，可用 scripts.reconcile_user_stats 从明细重建。
+    """
+
+    __tablename__ = "user_stats"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    total_questions = Column(Integer, nullable=False, default=0, comment="累计答题数")
+    correct_count = Column(Integer, nullable=False, default=0, comment="累计答对数")
+    total_seconds = Column(Integer, nullable=False, default=0, comment="累计阅读用时（秒）")
+    badge_count = Column(Integer, nullable=False, default=0, comment="已获得勋章数")
+
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        comment="更新时间",
+    )
+
+    def __repr__(self):
+        return f"<UserStats(user_id={self.user_id}, total_questions={self.total_questions})>"
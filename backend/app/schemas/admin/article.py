@@ -77,6 +77,7 @@ class ArticleListItemAdmin(BaseModel):
 
 class ArticleListResponseAdmin(BaseModel):
     items: List[ArticleListItemAdmin]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
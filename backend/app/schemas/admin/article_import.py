@@ -0,0 +1,60 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List
+
+from app.schemas.admin.article import DifficultyEnum
+from app.schemas.admin.question import QuestionTypeEnum
+
+
+class ImportAbilityRef(BaseModel):
+    """能力维度引用：code 或 name"""
+    ability: str = Field(..., min_length=1)
+    weight: int = Field(1, ge=1, le=10)
+
+
+class ImportQuestionRecord(BaseModel):
+    type: QuestionTypeEnum
+    content: str = Field(..., min_length=1)
+    options: Optional[List[str]] = None
+    answer: str = Field(..., min_length=1)
+    explanation: Optional[str] = None
+    hint: Optional[str] = None
+    difficulty: DifficultyEnum = DifficultyEnum.MEDIUM
+    display_order: Optional[int] = None
+    abilities: List[ImportAbilityRef] = []
+
+    @model_validator(mode="after")
+    def check_options(self):
+        if self.type == QuestionTypeEnum.CHOICE and not self.options:
+            raise ValueError("选择题必须提供选项")
+        return self
+
+
+class ImportArticleRecord(BaseModel):
+    """导入文件中的一篇文章
+
+    tags 为标签名称，名称在多个分类下重名时写成 "分类:名称"（如 "genre:寓言"）。
+    """
+    title: str = Field(..., min_length=1, max_length=200)
+    content: str = Field(..., min_length=10)
+    source_book: Optional[str] = Field(None, max_length=200)
+    source_chapter: Optional[str] = Field(None, max_length=200)
+    is_excerpt: bool = False
+    is_ai_generated: bool = False
+    article_difficulty: DifficultyEnum = DifficultyEnum.MEDIUM
+    tags: List[str] = []
+    questions: List[ImportQuestionRecord] = []
+
+
+class ImportRecordError(BaseModel):
+    line: int
+    title: Optional[str] = None
+    message: str
+
+
+class ImportResult(BaseModel):
+    total: int = 0
+    imported: int = 0
+    failed: int = 0
+    questions: int = 0
+    errors: List[ImportRecordError] = []
+    errors_truncated: bool = False
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 
 
 class UserAdminResponse(BaseModel):
@@ -48,3 +48,34 @@ class DashboardStats(BaseModel):
     total_questions: int
     total_readings: int
     checkins_today: int
+    # 活跃用户数为 HyperLogLog 估计值，此为相对标准误差（百分比）
+    active_users_error: float = 0.0
+
+
+class ActiveUsersEstimate(BaseModel):
+    start: date
+    end: date
+    active_users: int
+    relative_error: float
+
+
+class TimeseriesPoint(BaseModel):
+    date: date
+    value: float
+
+
+class TimeseriesResponse(BaseModel):
+    metric: str
+    start: date
+    end: date
+    points: List[TimeseriesPoint]
+
+
+class PoolStats(BaseModel):
+    pool_class: str
+    pool_size: Optional[int]
+    checkouts: int
+    checked_out: int
+    peak_checked_out: int
+    avg_hold_ms: float
+    max_hold_ms: float
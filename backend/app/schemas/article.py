@@ -59,6 +59,7 @@ class ArticleListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 class ArticleFilterParams(BaseModel):
@@ -27,6 +27,16 @@ class SubmitAnswerResponse(BaseModel):
     ability_names: List[str] = []
 
 
+class BatchSubmitAnswerRequest(BaseModel):
+    answers: List[SubmitAnswerRequest] = Field(..., min_length=1, max_length=50)
+
+
+class BatchSubmitAnswerResponse(BaseModel):
+    results: List[SubmitAnswerResponse]
+    correct_count: int
+    total_count: int
+
+
 class CompleteReadingRequest(BaseModel):
     time_spent: int = Field(..., ge=0, description="阅读用时（秒）")
 
@@ -52,9 +62,19 @@ class CompleteReadingResponse(BaseModel):
     correct_count: int
     total_count: int
     time_spent: int
-    ability_scores: List[AbilityScoreItem]
-    is_checked_in: bool
-    streak_days: int
+    ability_scores: List[AbilityScoreItem] = []
+    is_checked_in: bool = False
+    streak_days: int = 0
+    new_badges: List[BadgeUnlock] = []
+    processing: bool = Field(False, description="能力、打卡、勋章仍在后台处理，结果通过 /progress/{id}/result 获取")
+
+
+class CompletionResultResponse(BaseModel):
+    progress_id: int
+    status: str = Field(..., description="pending / done / failed")
+    ability_scores: List[AbilityScoreItem] = []
+    is_checked_in: bool = False
+    streak_days: int = 0
     new_badges: List[BadgeUnlock] = []
 
 
@@ -100,7 +120,8 @@ class HistoryItem(BaseModel):
 
 class HistoryResponse(BaseModel):
     items: List[HistoryItem]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
@@ -176,6 +176,18 @@ class CheckInResponse(BaseModel):
     records: List[CheckInRecord]
 
 
+class CheckInYearSummary(BaseModel):
+    year: int
+    days: int
+
+
+class CheckInHistoryResponse(BaseModel):
+    current_streak: int
+    max_streak: int
+    total_days: int
+    years: List[CheckInYearSummary]
+
+
 class BadgeInfo(BaseModel):
     id: int
     name: str
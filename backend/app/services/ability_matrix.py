@@ -0,0 +1,121 @@
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+
+from app.models.article import Article, ArticleStatusEnum
+from app.models.question import Question, QuestionAbility
+from app.services.catalogue_cache import catalogue_cache
+
+
+class AbilityMatrix:
+    """已发布文章 × 能力维度的训练权重矩阵（补弱项推荐用）
+
+    矩阵元素为文章所有题目在该能力上的权重之和（QuestionAbility.weight），
+    按行归一化，表示文章的训练重心。用户能力缺口向量与矩阵相乘即得
+    每篇文章对弱项的训练程度，已读文章用布尔掩码排除。
+
+    与目录版本号绑定，文章或题目变更后下次使用时整体重建（一次聚合查询）。
+    """
+
+    def __init__(self):
+        self._article_ids = np.empty(0, dtype=np.int64)
+        self._ability_index: Dict[int, int] = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._generation: Optional[int] = None
+
+    def clear(self) -> None:
+        self._article_ids = np.empty(0, dtype=np.int64)
+        self._ability_index = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._generation = None
+
+    async def ensure_current(self, db: AsyncSession) -> None:
+        generation = await catalogue_cache.generation()
+        if self._generation != generation:
+            await self.rebuild(db, generation)
+
+    async def rebuild(self, db: AsyncSession, generation: int) -> None:
+        """从数据库全量重建矩阵"""
+        result = await db.execute(
+            select(
+                Question.article_id,
+                QuestionAbility.ability_id,
+                func.sum(func.coalesce(QuestionAbility.weight, 1))
+            )
+            .join(QuestionAbility, QuestionAbility.question_id == Question.id)
+            .join(Article, Article.id == Question.article_id)
+            .where(Article.status == ArticleStatusEnum.PUBLISHED)
+            .group_by(Question.article_id, QuestionAbility.ability_id)
+        )
+        rows = result.all()
+
+        article_ids = sorted({article_id for article_id, _, _ in rows})
+        ability_ids = sorted({ability_id for _, ability_id, _ in rows})
+        row_index = {article_id: i for i, article_id in enumerate(article_ids)}
+        ability_index = {ability_id: i for i, ability_id in enumerate(ability_ids)}
+
+        matrix = np.zeros((len(article_ids), len(ability_ids)), dtype=np.float32)
+        for article_id, ability_id, weight in rows:
+            matrix[row_index[article_id], ability_index[ability_id]] = weight or 0
+        totals = matrix.sum(axis=1, keepdims=True)
+        matrix /= np.where(totals > 0, totals, 1)
+
+        self._article_ids = np.array(article_ids, dtype=np.int64)
+        self._ability_index = ability_index
+        self._matrix = matrix
+        self._generation = generation
+
+    def deficit_vector(self, ability_scores: Dict[int, float]) -> np.ndarray:
+        """能力得分（0-100）转为缺口向量，得分越低缺口越大；未测过的能力记 0"""
+        deficit = np.zeros(len(self._ability_index), dtype=np.float32)
+        for ability_id, score in ability_scores.items():
+            col = self._ability_index.get(ability_id)
+            if col is not None:
+                deficit[col] = max(0.0, 100.0 - (score or 0)) / 100.0
+        return deficit
+
+    def rank(self, ability_scores: Dict[int, float]) -> np.ndarray:
+        """每篇文章对用户弱项的训练得分，与 article_ids 对齐"""
+        if not len(self._article_ids):
+            return np.zeros(0, dtype=np.float32)
+        return self._matrix @ self.deficit_vector(ability_scores)
+
+    @property
+    def article_ids(self) -> np.ndarray:
+        return self._article_ids
+
+    def top_articles(
+        self, ability_scores: Dict[int, float], read_ids: Iterable[int], limit: int
+    ) -> List[int]:
+        """按训练得分降序返回最多 limit 篇未读且相关的文章"""
+        scores = self.rank(ability_scores)
+        if not len(scores):
+            return []
+
+        read = np.fromiter(read_ids, dtype=np.int64)
+        scores = np.where(np.isin(self._article_ids, read), -1.0, scores)
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return [int(self._article_ids[i]) for i in order if scores[i] > 0]
+
+    def best_article(
+        self, ability_scores: Dict[int, float], read_ids: Iterable[int]
+    ) -> Optional[int]:
+        """得分最高的未读文章；相关文章都已读过时允许重读，没有相关文章返回 None"""
+        scores = self.rank(ability_scores)
+        if not len(scores):
+            return None
+
+        read = np.fromiter(read_ids, dtype=np.int64)
+        unread_scores = np.where(np.isin(self._article_ids, read), -1.0, scores)
+        best = int(np.argmax(unread_scores))
+        if unread_scores[best] > 0:
+            return int(self._article_ids[best])
+
+        best = int(np.argmax(scores))
+        if scores[best] > 0:
+            return int(self._article_ids[best])
+        return None
+
+
+ability_matrix = AbilityMatrix()
@@ -0,0 +1,137 @@
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models.progress import UserProgress
+from app.models.rollup import ActiveUserSketch
+from app.utils.dates import day_bounds, day_column
+from app.utils.hyperloglog import HyperLogLog
+
+# 写路径在内存中保留的最近天数
+RECENT_DAYS = 2
+
+
+class ActiveUserCounter:
+    """按天的活跃用户 HyperLogLog 草图
+
+    开始阅读时把用户加入当天的草图：进程内保留最近几天的草图副本，
+    寄存器没有变化（绝大多数请求）时什么都不写；有变化时锁住当天的行，
+    与库中的寄存器取最大值后写回，多进程并发写入也不会丢失。
+    新寄存器先写在副本上，写回库中后才替换进程内的草图；事务随后回滚时丢弃当天的草图，
+    下次从库中重新加载，避免进程内副本认为已写入而漏记。
+    查询任意区间时合并区间内每天的草图估算去重人数，不再扫描 user_progresses。
+    没有草图的日期（上线前的历史数据）从 user_progresses 补建，过去的日期补建后写入表中。
+    """
+
+    def __init__(self):
+        self._recent: Dict[date, HyperLogLog] = {}
+
+    def clear(self) -> None:
+        self._recent.clear()
+
+    @staticmethod
+    def _upsert(db: AsyncSession):
+        dialect = db.bind.dialect.name
+        if dialect == "postgresql":
+            return pg_insert
+        if dialect == "sqlite":
+            return sqlite_insert
+        return None
+
+    async def add(self, db: AsyncSession, user_id: int, day: date) -> None:
+        sketch = self._recent.get(day)
+        if sketch is None:
+            row = await db.get(ActiveUserSketch, day)
+            sketch = HyperLogLog.from_bytes(row.registers if row else None)
+            self._recent[day] = sketch
+            for stale in [d for d in self._recent if d <= day - timedelta(days=RECENT_DAYS)]:
+                del self._recent[stale]
+
+        updated = sketch.copy()
+        if not updated.add(user_id):
+            return
+        await self._merge_into_row(db, day, updated)
+        self._recent[day] = updated
+        event.listen(db.sync_session, "after_rollback", lambda _: self._recent.pop(day, None), once=True)
+
+    async def _merge_into_row(self, db: AsyncSession, day: date, sketch: HyperLogLog) -> None:
+        upsert = self._upsert(db)
+        if upsert is not None:
+            await db.execute(
+                upsert(ActiveUserSketch).values(day=day, registers=b"").on_conflict_do_nothing()
+            )
+        result = await db.execute(
+            select(ActiveUserSketch)
+            .where(ActiveUserSketch.day == day)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        row = result.scalar_one_or_none()
+        if row is None:
+            db.add(ActiveUserSketch(day=day, registers=sketch.to_bytes()))
+            return
+        # 顺带把其他进程写入的寄存器合并进本进程的副本
+        sketch.merge(HyperLogLog.from_bytes(row.registers))
+        row.registers = sketch.to_bytes()
+
+    async def sketches(
+        self, db: AsyncSession, start: date, end: date, today: date
+    ) -> Dict[date, HyperLogLog]:
+        """[start, end] 内每天的草图；补建的过去日期随当前事务写入，由调用方提交"""
+        result = await db.execute(
+            select(ActiveUserSketch.day, ActiveUserSketch.registers)
+            .where(ActiveUserSketch.day >= start, ActiveUserSketch.day <= end)
+        )
+        sketches = {day: HyperLogLog.from_bytes(registers) for day, registers in result.all()}
+
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        missing = [day for day in days if day not in sketches and day <= today]
+        if missing:
+            built = await self._from_progress(db, missing)
+            # 今天还在变化，只保存过去的日期
+            await self._store(db, {day: sketch for day, sketch in built.items() if day < today})
+            sketches.update(built)
+        return sketches
+
+    async def _store(self, db: AsyncSession, built: Dict[date, HyperLogLog]) -> None:
+        if not built:
+            return
+        rows = [{"day": day, "registers": sketch.to_bytes()} for day, sketch in built.items()]
+        upsert = self._upsert(db)
+        if upsert is not None:
+            # 并发补建同一天时保留先写入的行
+            await db.execute(upsert(ActiveUserSketch).values(rows).on_conflict_do_nothing())
+            return
+        db.add_all([ActiveUserSketch(**row) for row in rows])
+
+    @staticmethod
+    async def _from_progress(db: AsyncSession, days: List[date]) -> Dict[date, HyperLogLog]:
+        days = sorted(days)
+        span = [days[0] + timedelta(days=i) for i in range((days[-1] - days[0]).days + 1)]
+        started = (
+            select(day_column(UserProgress.created_at, span).label("day"), UserProgress.user_id)
+            .where(
+                UserProgress.created_at >= day_bounds(days[0])[0],
+                UserProgress.created_at < day_bounds(days[-1])[1]
+            )
+            .subquery()
+        )
+        result = await db.execute(select(started.c.day, started.c.user_id).distinct())
+        built = {day: HyperLogLog() for day in days}
+        for day, user_id in result.all():
+            if day in built:
+                built[day].add(user_id)
+        return built
+
+    async def estimate(
+        self, db: AsyncSession, start: date, end: date, today: date
+    ) -> Tuple[int, float]:
+        """[start, end] 内去重活跃用户数的估计值和相对标准误差"""
+        merged = HyperLogLog.union((await self.sketches(db, start, end, today)).values())
+        return merged.count(), merged.relative_error
+
+
+active_user_counter = ActiveUserCounter()
@@ -1,11 +1,14 @@
+from datetime import datetime
 from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, func, delete, update
 from sqlalchemy.orm import selectinload
 
 from app.models.article import Article, ArticleTag, ArticleStatusEnum, DifficultyEnum
 from app.models.tag import Tag
 from app.models.question import Question
+from app.services.catalogue_cache import catalogue_cache
+from app.utils.pagination import decode_cursor, keyset_after
 from app.schemas.admin.article import (
     ArticleCreateRequest,
     ArticleUpdateRequest,
@@ -25,8 +28,14 @@ class AdminArticleService:
         page: int = 1,
         page_size: int = 20,
         status: Optional[str] = None,
-        keyword: Optional[str] = None
-    ) -> Tuple[List[ArticleListItemAdmin], int]:
+        keyword: Optional[str] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = True
+    ) -> Tuple[List[ArticleListItemAdmin], Optional[int]]:
+        """文章列表，按 (created_at, id) 倒序
+
+        传入 cursor 时从游标之后取一页（忽略 page）；with_total=False 时不做 count。
+        """
         query = select(Article)
 
         if status:
@@ -35,21 +44,24 @@ class AdminArticleService:
         if keyword:
             query = query.where(Article.title.ilike(f"%{keyword}%"))
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar() or 0
+        total = None
+        if with_total:
+            count_query = select(func.count()).select_from(query.subquery())
+            total = (await db.execute(count_query)).scalar() or 0
 
-        query = query.order_by(Article.created_at.desc())
-        query = query.offset((page - 1) * page_size).limit(page_size)
+        if cursor:
+            query = query.where(keyset_after(
+                (Article.created_at, Article.id), decode_cursor(cursor, datetime, int), descending=True
+            ))
+        else:
+            query = query.offset((page - 1) * page_size)
+        query = query.order_by(Article.created_at.desc(), Article.id.desc()).limit(page_size)
 
         result = await db.execute(query)
         articles = result.scalars().all()
 
         items = []
         for article in articles:
-            q_count = (await db.execute(
-                select(func.count(Question.id)).where(Question.article_id == article.id)
-            )).scalar() or 0
-
             items.append(ArticleListItemAdmin(
                 id=article.id,
                 title=article.title,
@@ -58,7 +70,7 @@ class AdminArticleService:
                 article_difficulty=article.article_difficulty,
                 status=article.status,
                 is_ai_generated=article.is_ai_generated,
-                question_count=q_count,
+                question_count=article.question_count,
                 created_at=article.created_at
             ))
 
@@ -113,10 +125,6 @@ class AdminArticleService:
         if not article:
             return None
 
-        q_count = (await db.execute(
-            select(func.count(Question.id)).where(Question.article_id == article_id)
-        )).scalar() or 0
-
         tags = [
             {"id": at.tag.id, "name": at.tag.name, "category": at.tag.category.value}
             for at in article.tags
@@ -138,7 +146,7 @@ class AdminArticleService:
             updated_at=article.updated_at,
             created_by=article.created_by,
             tags=tags,
-            question_count=q_count
+            question_count=article.question_count
         )
 
     @staticmethod
@@ -169,6 +177,7 @@ class AdminArticleService:
                 db.add(article_tag)
 
         await db.commit()
+        await catalogue_cache.bump(db, article_id)
 
         return await AdminArticleService.get_article_detail(db, article_id)
 
@@ -180,6 +189,7 @@ class AdminArticleService:
 
         await db.delete(article)
         await db.commit()
+        await catalogue_cache.bump(db, article_id)
         return True
 
     @staticmethod
@@ -190,6 +200,7 @@ class AdminArticleService:
 
         article.status = ArticleStatusEnum.PUBLISHED
         await db.commit()
+        await catalogue_cache.bump(db, article_id)
         return True
 
     @staticmethod
@@ -200,7 +211,32 @@ class AdminArticleService:
 
         article.status = ArticleStatusEnum.ARCHIVED
         await db.commit()
+        await catalogue_cache.bump(db, article_id)
         return True
 
+    @staticmethod
+    async def reconcile_question_counts(db: AsyncSession, article_ids: List[int]) -> List[int]:
+        """用一条分组计数校对一批文章的 question_count，修正不一致的行（不提交），返回被修正的文章 ID"""
+        if not article_ids:
+            return []
+        counts = dict((await db.execute(
+            select(Question.article_id, func.count(Question.id))
+            .where(Question.article_id.in_(article_ids))
+            .group_by(Question.article_id)
+        )).all())
+        stored = (await db.execute(
+            select(Article.id, Article.question_count).where(Article.id.in_(article_ids))
+        )).all()
+
+        fixed = []
+        for article_id, question_count in stored:
+            actual = counts.get(article_id, 0)
+            if question_count != actual:
+                await db.execute(
+                    update(Article).where(Article.id == article_id).values(question_count=actual)
+                )
+                fixed.append(article_id)
+        return fixed
+
 
 admin_article_service = AdminArticleService()
@@ -1,4 +1,6 @@
+import asyncio
 from datetime import date, timedelta
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
@@ -7,61 +9,125 @@ from app.models.article import Article, ArticleStatusEnum
 from app.models.question import Question
 from app.models.progress import UserProgress
 from app.models.checkin import CheckIn
-from app.schemas.admin.user import DashboardStats
+from app.schemas.admin.user import (
+    DashboardStats, TimeseriesPoint, TimeseriesResponse, ActiveUsersEstimate
+)
+from app.services.active_users import active_user_counter
+from app.services.daily_rollup import daily_rollup, METRICS
+from app.utils.exceptions import ValidationError
+from app.utils.hyperloglog import HyperLogLog
+from app.utils.dates import business_today
+
+# 趋势和活跃用户接口单次查询的最大天数
+MAX_TIMESERIES_DAYS = 366
 
 
 class DashboardService:
+    """后台仪表盘统计
+
+    每张表只查一次：多个指标用 count(...) FILTER (WHERE ...) 合并到同一条聚合查询，
+    时间条件写成 created_at 的区间比较（不再用 date(created_at)），可以走索引。
+    各表的查询互不依赖，分别在独立的会话（连接池中的不同连接）上并发执行。
+    去重活跃用户数由按天的 HyperLogLog 草图合并估算，不再对 user_progresses 做 count(DISTINCT)。
+    """
+
+    @staticmethod
+    async def _one(db: AsyncSession, stmt):
+        # 每个查询单独开会话，才能在多个连接上并发
+        async with AsyncSession(db.bind, expire_on_commit=False) as session:
+            return (await session.execute(stmt)).one()
+
+    @staticmethod
+    async def _active_users(db: AsyncSession, today: date) -> tuple:
+        """今天和最近 7 天的去重活跃用户估计值及相对标准误差"""
+        async with AsyncSession(db.bind, expire_on_commit=False) as session:
+            sketches = await active_user_counter.sketches(
+                session, today - timedelta(days=7), today, today
+            )
+            await session.commit()
+        week = HyperLogLog.union(sketches.values())
+        return sketches[today].count(), week.count(), week.relative_error
+
     @staticmethod
     async def get_stats(db: AsyncSession) -> DashboardStats:
-        today = date.today()
-        week_ago = today - timedelta(days=7)
-
-        total_users = (await db.execute(
-            select(func.count(User.id))
-        )).scalar() or 0
-
-        active_today = (await db.execute(
-            select(func.count(func.distinct(UserProgress.user_id)))
-            .where(func.date(UserProgress.created_at) == today)
-        )).scalar() or 0
-
-        active_week = (await db.execute(
-            select(func.count(func.distinct(UserProgress.user_id)))
-            .where(func.date(UserProgress.created_at) >= week_ago)
-        )).scalar() or 0
-
-        total_articles = (await db.execute(
-            select(func.count(Article.id))
-        )).scalar() or 0
-
-        published_articles = (await db.execute(
-            select(func.count(Article.id))
-            .where(Article.status == ArticleStatusEnum.PUBLISHED)
-        )).scalar() or 0
-
-        total_questions = (await db.execute(
-            select(func.count(Question.id))
-        )).scalar() or 0
-
-        total_readings = (await db.execute(
-            select(func.count(UserProgress.id))
-            .where(UserProgress.completed_at.isnot(None))
-        )).scalar() or 0
-
-        checkins_today = (await db.execute(
-            select(func.count(CheckIn.id))
-            .where(CheckIn.check_date == today)
-        )).scalar() or 0
+        today = business_today()
+
+        users_stmt = select(func.count(User.id))
+        progress_stmt = select(
+            func.count(UserProgress.id).filter(UserProgress.completed_at.isnot(None))
+        )
+        articles_stmt = select(
+            func.count(Article.id),
+            func.count(Article.id).filter(Article.status == ArticleStatusEnum.PUBLISHED)
+        )
+        questions_stmt = select(func.count(Question.id))
+        checkins_stmt = select(func.count(CheckIn.id)).where(CheckIn.check_date == today)
+
+        (
+            (total_users,),
+            (total_readings,),
+            (total_articles, published_articles),
+            (total_questions,),
+            (checkins_today,),
+            (active_today, active_week, active_error)
+        ) = await asyncio.gather(
+            *[
+                DashboardService._one(db, stmt)
+                for stmt in (users_stmt, progress_stmt, articles_stmt, questions_stmt, checkins_stmt)
+            ],
+            DashboardService._active_users(db, today)
+        )
 
         return DashboardStats(
-            total_users=total_users,
-            active_users_today=active_today,
-            active_users_week=active_week,
-            total_articles=total_articles,
-            published_articles=published_articles,
-            total_questions=total_questions,
-            total_readings=total_readings,
-            checkins_today=checkins_today
+            total_users=total_users or 0,
+            active_users_today=active_today or 0,
+            active_users_week=active_week or 0,
+            total_articles=total_articles or 0,
+            published_articles=published_articles or 0,
+            total_questions=total_questions or 0,
+            total_readings=total_readings or 0,
+            checkins_today=checkins_today or 0,
+            active_users_error=round(active_error * 100, 2)
+        )
+
+    @staticmethod
+    async def get_timeseries(
+        db: AsyncSession,
+        metric: str,
+        start: date,
+        end: date,
+        ability_id: Optional[int] = None
+    ) -> TimeseriesResponse:
+        """按天的指标趋势，只读取汇总表"""
+        if metric not in METRICS:
+            raise ValidationError(f"不支持的指标: {metric}")
+        if metric == "ability_accuracy" and ability_id is None:
+            raise ValidationError("ability_accuracy 需要指定 ability_id")
+        if start > end:
+            raise ValidationError("开始日期不能晚于结束日期")
+        if (end - start).days >= MAX_TIMESERIES_DAYS:
+            raise ValidationError(f"查询范围不能超过 {MAX_TIMESERIES_DAYS} 天")
+
+        points = await daily_rollup.series(db, metric, start, end, ability_id)
+        return TimeseriesResponse(
+            metric=metric,
+            start=start,
+            end=end,
+            points=[TimeseriesPoint(date=day, value=value) for day, value in points]
+        )
+
+    @staticmethod
+    async def get_active_users(db: AsyncSession, start: date, end: date) -> ActiveUsersEstimate:
+        """任意区间的去重活跃用户估计值"""
+        if start > end:
+            raise ValidationError("开始日期不能晚于结束日期")
+        if (end - start).days >= MAX_TIMESERIES_DAYS:
+            raise ValidationError(f"查询范围不能超过 {MAX_TIMESERIES_DAYS} 天")
+
+        count, error = await active_user_counter.estimate(db, start, end, business_today())
+        await db.commit()
+        return ActiveUsersEstimate(
+            start=start, end=end, active_users=count, relative_error=round(error * 100, 2)
         )
 
 
@@ -0,0 +1,341 @@
+import codecs
+import csv
+import json
+import logging
+from datetime import datetime, timezone
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple, Union
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.models.article import Article, ArticleTag, ArticleStatusEnum, DifficultyEnum
+from app.models.question import Question, QuestionAbility, QuestionTypeEnum
+from app.models.tag import Tag
+from app.models.ability import AbilityDimension
+from app.services.admin.article_service import AdminArticleService
+from app.services.catalogue_cache import catalogue_cache
+from app.schemas.admin.article_import import ImportArticleRecord, ImportRecordError, ImportResult
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("jsonl", "csv")
+# CSV 中 tags 列的分隔符
+CSV_TAG_SEPARATOR = "|"
+# 错误报告中数据库错误信息的最大长度
+DB_ERROR_MAX_LENGTH = 200
+
+# 解析结果：(起始行号, 原始记录或解析错误信息)
+RawRecord = Tuple[int, Union[dict, str]]
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """把字节流按行切分（UTF-8，允许 BOM），不整体读入内存"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def parse_jsonl(lines: AsyncIterable[str]) -> AsyncIterator[RawRecord]:
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, f"JSON 解析失败: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_no, "每行必须是一个 JSON 对象"
+            continue
+        yield line_no, record
+
+
+def _csv_record(row: Dict[str, str]) -> Union[dict, str]:
+    """CSV 行转为与 JSONL 相同结构的记录：tags 用 | 分隔，questions 为 JSON 数组"""
+    record: dict = {key: value for key, value in row.items() if value not in ("", None)}
+    if "tags" in record:
+        record["tags"] = [tag.strip() for tag in record["tags"].split(CSV_TAG_SEPARATOR) if tag.strip()]
+    if "questions" in record:
+        try:
+            record["questions"] = json.loads(record["questions"])
+        except json.JSONDecodeError as e:
+            return f"questions 列 JSON 解析失败: {e.msg}"
+    return record
+
+
+async def parse_csv(lines: AsyncIterable[str]) -> AsyncIterator[RawRecord]:
+    """首行为表头；引号内的换行会跨多行拼成一条记录"""
+    header: Optional[List[str]] = None
+    pending: List[str] = []
+    start = line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not pending:
+            if not line.strip():
+                continue
+            start = line_no
+        pending.append(line)
+        text = "\n".join(pending)
+        if text.count('"') % 2:
+            continue
+        pending = []
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start, f"列数不匹配：表头 {len(header)} 列，本行 {len(values)} 列"
+            continue
+        yield start, _csv_record(dict(zip(header, values)))
+
+    if pending:
+        yield start, "引号未闭合"
+
+
+class AdminImportService:
+    """批量导入文章（含题目、能力维度和标签）
+
+    逐条读取、按块处理：每块先逐条校验，标签和能力维度从导入开始时预取的映射中解析，
+    通过校验的记录用多行 INSERT（executemany）一次写入文章、题目和关联表，每块一个事务。
+    校验失败的记录按行号报告，不影响同一块中的其他记录；整块写入失败时回滚，
+    再逐条在 SAVEPOINT 中重新写入，找出出错的记录并附上数据库的错误信息，其余记录照常导入。
+    写入用 Core 的多行 INSERT（PostgreSQL 上 RETURNING 也按批返回），不触发 Question 的 ORM 事件，
+    question_count 在插入文章时直接写入。
+    """
+
+    @staticmethod
+    async def _load_refs(db: AsyncSession) -> Tuple[Dict[str, List[int]], Dict[str, int]]:
+        """标签映射（名称 -> ID 列表，"分类:名称" -> ID）和能力维度映射（code / name -> ID）"""
+        tags: Dict[str, List[int]] = {}
+        result = await db.execute(select(Tag.id, Tag.name, Tag.category))
+        for tag_id, name, category in result.all():
+            tags.setdefault(name, []).append(tag_id)
+            tags[f"{category.value}:{name}"] = [tag_id]
+
+        abilities: Dict[str, int] = {}
+        result = await db.execute(select(AbilityDimension.id, AbilityDimension.code, AbilityDimension.name))
+        for ability_id, code, name in result.all():
+            abilities[code] = ability_id
+            abilities[name] = ability_id
+        return tags, abilities
+
+    @staticmethod
+    def _resolve_tags(tags: Dict[str, List[int]], names: List[str]) -> List[int]:
+        tag_ids = []
+        for name in names:
+            key = name.strip()
+            if ":" in key:
+                category, _, tag_name = key.partition(":")
+                key = f"{category.strip()}:{tag_name.strip()}"
+            ids = tags.get(key)
+            if not ids:
+                raise ValueError(f"标签不存在: {name}")
+            if len(ids) > 1:
+                raise ValueError(f"标签 {name} 在多个分类下重名，请写成 分类:名称")
+            if ids[0] not in tag_ids:
+                tag_ids.append(ids[0])
+        return tag_ids
+
+    @staticmethod
+    def _resolve_abilities(abilities: Dict[str, int], record: ImportArticleRecord) -> List[Dict[int, int]]:
+        """每道题的 {ability_id: weight}"""
+        resolved = []
+        for question in record.questions:
+            weights: Dict[int, int] = {}
+            for ref in question.abilities:
+                ability_id = abilities.get(ref.ability.strip())
+                if ability_id is None:
+                    raise ValueError(f"能力维度不存在: {ref.ability}")
+                weights[ability_id] = ref.weight
+            resolved.append(weights)
+        return resolved
+
+    @staticmethod
+    def _fail(result: ImportResult, line: int, title: Optional[str], message: str) -> None:
+        result.failed += 1
+        if len(result.errors) < settings.IMPORT_MAX_ERRORS:
+            result.errors.append(ImportRecordError(line=line, title=title, message=message))
+        else:
+            result.errors_truncated = True
+
+    @staticmethod
+    def _format_errors(error: PydanticValidationError) -> str:
+        return "; ".join(
+            f"{'.'.join(map(str, item['loc'])) or 'record'}: {item['msg']}"
+            for item in error.errors()
+        )
+
+    async def import_records(
+        self,
+        db: AsyncSession,
+        records: AsyncIterable[RawRecord],
+        publish: bool = False,
+        chunk_size: Optional[int] = None
+    ) -> ImportResult:
+        chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        tags, abilities = await self._load_refs(db)
+        result = ImportResult()
+
+        chunk: List[RawRecord] = []
+        async for record in records:
+            result.total += 1
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                await self._import_chunk(db, chunk, tags, abilities, publish, result)
+                chunk = []
+        if chunk:
+            await self._import_chunk(db, chunk, tags, abilities, publish, result)
+
+        if result.imported:
+            await catalogue_cache.bump(db)
+        return result
+
+    async def _import_chunk(
+        self,
+        db: AsyncSession,
+        chunk: List[RawRecord],
+        tags: Dict[str, List[int]],
+        abilities: Dict[str, int],
+        publish: bool,
+        result: ImportResult
+    ) -> None:
+        prepared = []
+        for line, raw in chunk:
+            if isinstance(raw, str):
+                self._fail(result, line, None, raw)
+                continue
+            title = raw.get("title") if isinstance(raw.get("title"), str) else None
+            try:
+                record = ImportArticleRecord.model_validate(raw)
+            except PydanticValidationError as e:
+                self._fail(result, line, title, self._format_errors(e))
+                continue
+            try:
+                tag_ids = self._resolve_tags(tags, record.tags)
+                question_abilities = self._resolve_abilities(abilities, record)
+            except ValueError as e:
+                self._fail(result, line, title, str(e))
+                continue
+            prepared.append((line, record, tag_ids, question_abilities))
+
+        if not prepared:
+            return
+        try:
+            await self._insert(db, prepared, publish)
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.warning("批量导入写入失败，逐条重试: %s", e)
+            prepared = await self._insert_one_by_one(db, prepared, publish, result)
+        result.imported += len(prepared)
+        result.questions += sum(len(record.questions) for _, record, _, _ in prepared)
+
+    async def _insert_one_by_one(
+        self, db: AsyncSession, prepared: list, publish: bool, result: ImportResult
+    ) -> list:
+        """整块写入失败后逐条写入，每条一个 SAVEPOINT；返回写入成功的记录"""
+        inserted = []
+        for item in prepared:
+            line, record, _, _ = item
+            try:
+                async with db.begin_nested():
+                    await self._insert(db, [item], publish)
+            except SQLAlchemyError as e:
+                self._fail(result, line, record.title, f"写入失败: {self._db_error(e)}")
+                continue
+            inserted.append(item)
+        try:
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            logger.warning("批量导入提交失败: %s", e)
+            for line, record, _, _ in inserted:
+                self._fail(result, line, record.title, f"写入失败: {self._db_error(e)}")
+            return []
+        return inserted
+
+    @staticmethod
+    def _db_error(error: SQLAlchemyError) -> str:
+        """数据库错误的首行信息（截断），不带 SQL 和参数"""
+        message = str(getattr(error, "orig", None) or error).strip().splitlines()
+        text = message[0] if message else type(error).__name__
+        if len(text) > DB_ERROR_MAX_LENGTH:
+            text = text[:DB_ERROR_MAX_LENGTH] + "..."
+        return f"{type(error).__name__}: {text}"
+
+    @staticmethod
+    async def _insert(db: AsyncSession, prepared: list, publish: bool) -> None:
+        now = datetime.now(timezone.utc)
+        status = ArticleStatusEnum.PUBLISHED if publish else ArticleStatusEnum.DRAFT
+        article_rows = [
+            {
+                "title": record.title,
+                "content": record.content,
+                "source_book": record.source_book,
+                "source_chapter": record.source_chapter,
+                "is_excerpt": record.is_excerpt,
+                "is_ai_generated": record.is_ai_generated,
+                "word_count": len(record.content),
+                "reading_time": AdminArticleService._calculate_reading_time(len(record.content)),
+                "article_difficulty": DifficultyEnum(record.article_difficulty.value),
+                "status": status,
+                "question_count": len(record.questions),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for _, record, _, _ in prepared
+        ]
+        article_ids = (await db.execute(
+            insert(Article.__table__).returning(Article.id, sort_by_parameter_order=True), article_rows
+        )).scalars().all()
+
+        tag_rows = []
+        question_rows = []
+        question_weights = []
+        for article_id, (_, record, tag_ids, abilities) in zip(article_ids, prepared):
+            tag_rows.extend({"article_id": article_id, "tag_id": tag_id} for tag_id in tag_ids)
+            for index, (question, weights) in enumerate(zip(record.questions, abilities)):
+                question_rows.append({
+                    "article_id": article_id,
+                    "type": QuestionTypeEnum(question.type.value),
+                    "content": question.content,
+                    "options": question.options,
+                    "answer": question.answer,
+                    "explanation": question.explanation,
+                    "hint": question.hint,
+                    "difficulty": DifficultyEnum(question.difficulty.value),
+                    "display_order": question.display_order if question.display_order is not None else index,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+                question_weights.append(weights)
+
+        if tag_rows:
+            await db.execute(insert(ArticleTag.__table__), tag_rows)
+        if not question_rows:
+            return
+        question_ids = (await db.execute(
+            insert(Question.__table__).returning(Question.id, sort_by_parameter_order=True), question_rows
+        )).scalars().all()
+        ability_rows = [
+            {"question_id": question_id, "ability_id": ability_id, "weight": weight}
+            for question_id, weights in zip(question_ids, question_weights)
+            for ability_id, weight in weights.items()
+        ]
+        if ability_rows:
+            await db.execute(insert(QuestionAbility.__table__), ability_rows)
+
+
+admin_import_service = AdminImportService()
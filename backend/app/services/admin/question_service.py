@@ -6,6 +6,8 @@ from sqlalchemy.orm import selectinload
 from app.models.question import Question, QuestionAbility, QuestionTypeEnum, DifficultyEnum
 from app.models.article import Article
 from app.models.ability import AbilityDimension
+from app.services.catalogue_cache import catalogue_cache
+from app.utils.pagination import decode_cursor, keyset_after
 from app.schemas.admin.question import (
     QuestionCreateRequest,
     QuestionUpdateRequest,
@@ -21,8 +23,14 @@ class AdminQuestionService:
         page: int = 1,
         page_size: int = 20,
         article_id: Optional[int] = None,
-        question_type: Optional[str] = None
-    ) -> Tuple[List[QuestionListItemAdmin], int]:
+        question_type: Optional[str] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = True
+    ) -> Tuple[List[QuestionListItemAdmin], Optional[int]]:
+        """题目列表，按 (article_id, display_order, id) 升序
+
+        传入 cursor 时从游标之后取一页（忽略 page）；with_total=False 时不做 count。
+        """
         query = select(Question).options(selectinload(Question.article))
 
         if article_id:
@@ -31,11 +39,20 @@ class AdminQuestionService:
         if question_type:
             query = query.where(Question.type == QuestionTypeEnum(question_type))
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total = (await db.execute(count_query)).scalar() or 0
+        total = None
+        if with_total:
+            count_query = select(func.count()).select_from(query.subquery())
+            total = (await db.execute(count_query)).scalar() or 0
 
-        query = query.order_by(Question.article_id, Question.display_order)
-        query = query.offset((page - 1) * page_size).limit(page_size)
+        if cursor:
+            query = query.where(keyset_after(
+                (Question.article_id, Question.display_order, Question.id),
+                decode_cursor(cursor, int, int, int)
+            ))
+        else:
+            query = query.offset((page - 1) * page_size)
+        query = query.order_by(Question.article_id, Question.display_order, Question.id)
+        query = query.limit(page_size)
 
         result = await db.execute(query)
         questions = result.scalars().all()
@@ -91,6 +108,7 @@ class AdminQuestionService:
             db.add(qa)
 
         await db.commit()
+        await catalogue_cache.bump(db, data.article_id)
         await db.refresh(question)
 
         return await AdminQuestionService.get_question_detail(db, question.id)
@@ -169,6 +187,8 @@ class AdminQuestionService:
                 db.add(qa)
 
         await db.commit()
+        if data.abilities is not None:
+            await catalogue_cache.bump(db, question.article_id)
 
         return await AdminQuestionService.get_question_detail(db, question_id)
 
@@ -178,8 +198,10 @@ class AdminQuestionService:
         if not question:
             return False
 
+        article_id = question.article_id
         await db.delete(question)
         await db.commit()
+        await catalogue_cache.bump(db, article_id)
         return True
 
 
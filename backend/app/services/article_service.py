@@ -1,18 +1,25 @@
 from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, and_
 from sqlalchemy.orm import selectinload
-import random
-from datetime import date
+from bisect import bisect_right
 
 from app.models.article import Article, ArticleTag, ArticleStatusEnum, DifficultyEnum
-from app.models.tag import Tag, TagCategoryEnum
-from app.models.question import Question
+from app.models.tag import TagCategoryEnum
 from app.models.user import User
 from app.models.progress import UserProgress
+from app.models.recommendation import RecommendationKindEnum
 from app.models.user_ability import UserAbility
 from app.models.ability import AbilityDimension
 from app.schemas.article import ArticleListItem, ArticleDetail, TagInfo
+from app.services.catalogue_cache import catalogue_cache
+from app.services.tag_index import tag_index
+from app.services.search_index import article_search
+from app.services.recommendation_pool import recommendation_pool
+from app.services.ability_matrix import ability_matrix
+from app.services.recommendation_queue import recommendation_queue
+from app.utils.exceptions import ValidationError
+from app.utils.pagination import decode_cursor
 
 
 class ArticleService:
@@ -26,50 +33,65 @@ class ArticleService:
         genre: Optional[str] = None,
         difficulty: Optional[int] = None,
         source: Optional[str] = None,
-        keyword: Optional[str] = None
+        keyword: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> Tuple[List[ArticleListItem], int]:
-        query = select(Article).where(Article.status == ArticleStatusEnum.PUBLISHED)
-        
-        if keyword:
-            query = query.where(
-                or_(
-                    Article.title.ilike(f"%{keyword}%"),
-                    Article.source_book.ilike(f"%{keyword}%")
-                )
-            )
-        
-        if difficulty:
-            query = query.where(Article.article_difficulty == DifficultyEnum(difficulty))
-        
+        """已发布文章列表，无关键词时按 ID 升序，有关键词时按相关度排序
+
+        cursor 为上一页最后一篇文章的游标，传入时忽略 page。
+        """
+        filters = dict(
+            page=page, page_size=page_size, grade=grade, genre=genre,
+            difficulty=difficulty, source=source, keyword=keyword, cursor=cursor
+        )
+        generation = await catalogue_cache.generation()
+        cached = await catalogue_cache.get_list(generation, **filters)
+        if cached is not None:
+            return cached
+
+        keyword = keyword.strip() if keyword else None
         tag_filters = []
         if grade:
-            tag_filters.append(("grade", grade))
+            tag_filters.append((TagCategoryEnum.GRADE, grade))
         if genre:
-            tag_filters.append(("genre", genre))
+            tag_filters.append((TagCategoryEnum.GENRE, genre))
         if source:
-            tag_filters.append(("source", source))
-        
-        if tag_filters:
-            for category, tag_name in tag_filters:
-                subquery = (
-                    select(ArticleTag.article_id)
-                    .join(Tag)
-                    .where(
-                        Tag.category == TagCategoryEnum(category),
-                        Tag.name == tag_name
-                    )
-                )
-                query = query.where(Article.id.in_(subquery))
-        
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
-        
-        query = query.offset((page - 1) * page_size).limit(page_size)
-        query = query.options(selectinload(Article.tags).selectinload(ArticleTag.tag))
+            tag_filters.append((TagCategoryEnum.SOURCE, source))
+        
+        # 标签和难度筛选走内存倒排索引，数据库只加载当页文章
+        candidate_ids = None
+        if not keyword or tag_filters or difficulty:
+            await tag_index.ensure_current(db)
+            candidate_ids = tag_index.lookup(
+                tag_filters, DifficultyEnum(difficulty) if difficulty else None
+            )
         
-        result = await db.execute(query)
-        articles = result.scalars().all()
+        # 关键词走全文搜索，结果按相关度排序
+        if keyword:
+            candidate_ids = await article_search.search(db, keyword, candidate_ids)
+        
+        total = len(candidate_ids)
+        start = (page - 1) * page_size
+        if cursor:
+            (last_id,) = decode_cursor(cursor, int)
+            if not keyword:
+                start = bisect_right(candidate_ids, last_id)
+            elif last_id in candidate_ids:
+                start = candidate_ids.index(last_id) + 1
+            else:
+                raise ValidationError("分页游标已失效，请重新搜索")
+        page_ids = candidate_ids[start:start + page_size]
+        
+        articles = []
+        if page_ids:
+            query = (
+                select(Article)
+                .where(Article.status == ArticleStatusEnum.PUBLISHED, Article.id.in_(page_ids))
+                .options(selectinload(Article.tags).selectinload(ArticleTag.tag))
+            )
+            result = await db.execute(query)
+            position = {article_id: i for i, article_id in enumerate(page_ids)}
+            articles = sorted(result.scalars().all(), key=lambda a: position[a.id])
         
         items = []
         for article in articles:
@@ -87,10 +109,16 @@ class ArticleService:
                 tags=tags
             ))
         
+        await catalogue_cache.set_list(generation, items, total, **filters)
         return items, total
     
     @staticmethod
     async def get_article_detail(db: AsyncSession, article_id: int) -> Optional[ArticleDetail]:
+        generation = await catalogue_cache.generation()
+        cached = await catalogue_cache.get_detail(generation, article_id)
+        if cached is not None:
+            return cached
+
         query = (
             select(Article)
             .where(Article.id == article_id, Article.status == ArticleStatusEnum.PUBLISHED)
@@ -102,17 +130,12 @@ class ArticleService:
         if not article:
             return None
         
-        question_count_result = await db.execute(
-            select(func.count(Question.id)).where(Question.article_id == article_id)
-        )
-        question_count = question_count_result.scalar() or 0
-        
         tags = [
             TagInfo(id=at.tag.id, name=at.tag.name, category=at.tag.category.value)
             for at in article.tags
         ]
         
-        return ArticleDetail(
+        detail = ArticleDetail(
             id=article.id,
             title=article.title,
             content=article.content,
@@ -123,117 +146,75 @@ class ArticleService:
             reading_time=article.reading_time,
             article_difficulty=article.article_difficulty,
             tags=tags,
-            question_count=question_count
+            question_count=article.question_count
         )
+        await catalogue_cache.set_detail(generation, detail)
+        return detail
+    
+    @staticmethod
+    async def _pop_precomputed(
+        db: AsyncSession,
+        user: User,
+        kind: RecommendationKindEnum
+    ) -> Optional[ArticleDetail]:
+        """从预计算队列取推荐，跳过今天已读和已下架的文章"""
+        reads_today = await recommendation_pool.get_reads_today(db, user.id)
+        while True:
+            article_id = await recommendation_queue.pop(db, user.id, kind, reads_today)
+            if article_id is None:
+                return None
+            detail = await ArticleService.get_article_detail(db, article_id)
+            if detail is not None:
+                return detail
     
     @staticmethod
     async def get_today_recommendation(
         db: AsyncSession, 
         user: User
     ) -> Optional[ArticleDetail]:
-        if not user.grade:
-            query = (
-                select(Article)
-                .where(
-                    Article.status == ArticleStatusEnum.PUBLISHED,
-                    Article.article_difficulty == DifficultyEnum.EASY
-                )
-            )
-        else:
-            grade_name = f"{user.grade.value}年级"
-            
-            query = (
-                select(Article)
-                .where(Article.status == ArticleStatusEnum.PUBLISHED)
-                .join(ArticleTag)
-                .join(Tag)
-                .where(
-                    Tag.category == TagCategoryEnum.GRADE,
-                    Tag.name == grade_name
-                )
-            )
-        
-        today = date.today()
-        read_today_subquery = (
-            select(UserProgress.article_id)
-            .where(
-                UserProgress.user_id == user.id,
-                func.date(UserProgress.created_at) == today
-            )
+        precomputed = await ArticleService._pop_precomputed(
+            db, user, RecommendationKindEnum.TODAY
         )
-        query = query.where(Article.id.notin_(read_today_subquery))
+        if precomputed is not None:
+            return precomputed
         
-        result = await db.execute(query)
-        candidates = result.scalars().all()
-        
-        if not candidates:
-            all_query = (
-                select(Article)
-                .where(Article.status == ArticleStatusEnum.PUBLISHED)
-                .limit(50)
-            )
-            result = await db.execute(all_query)
-            candidates = result.scalars().all()
-        
-        if not candidates:
+        grade_name = f"{user.grade.value}年级" if user.grade else None
+        article_id = await recommendation_pool.pick_today(db, user.id, grade_name)
+        if article_id is None:
             return None
-        
-        selected = random.choice(candidates)
-        return await ArticleService.get_article_detail(db, selected.id)
+        return await ArticleService.get_article_detail(db, article_id)
     
     @staticmethod
     async def get_weak_point_recommendation(
         db: AsyncSession,
         user: User
     ) -> Optional[ArticleDetail]:
+        precomputed = await ArticleService._pop_precomputed(
+            db, user, RecommendationKindEnum.WEAK_POINT
+        )
+        if precomputed is not None:
+            return precomputed
+        
         ability_result = await db.execute(
-            select(UserAbility)
+            select(UserAbility.ability_id, UserAbility.score)
             .where(UserAbility.user_id == user.id)
-            .order_by(UserAbility.score)
-            .limit(3)
         )
-        weak_abilities = ability_result.scalars().all()
+        ability_scores = {ability_id: score for ability_id, score in ability_result.all()}
         
-        if not weak_abilities:
+        if not ability_scores:
             return await ArticleService.get_today_recommendation(db, user)
         
-        weak_ability_ids = [wa.ability_id for wa in weak_abilities]
-        
-        from app.models.question import QuestionAbility
-        
-        query = (
-            select(Article)
-            .where(Article.status == ArticleStatusEnum.PUBLISHED)
-            .join(Question)
-            .join(QuestionAbility)
-            .where(QuestionAbility.ability_id.in_(weak_ability_ids))
+        await ability_matrix.ensure_current(db)
+        read_result = await db.execute(
+            select(UserProgress.article_id)
+            .where(UserProgress.user_id == user.id)
             .distinct()
         )
+        article_id = ability_matrix.best_article(ability_scores, read_result.scalars().all())
         
-        read_subquery = select(UserProgress.article_id).where(UserProgress.user_id == user.id)
-        query = query.where(Article.id.notin_(read_subquery))
-        
-        result = await db.execute(query)
-        candidates = result.scalars().all()
-        
-        if not candidates:
-            query_with_read = (
-                select(Article)
-                .where(Article.status == ArticleStatusEnum.PUBLISHED)
-                .join(Question)
-                .join(QuestionAbility)
-                .where(QuestionAbility.ability_id.in_(weak_ability_ids))
-                .distinct()
-                .limit(20)
-            )
-            result = await db.execute(query_with_read)
-            candidates = result.scalars().all()
-        
-        if not candidates:
+        if article_id is None:
             return await ArticleService.get_today_recommendation(db, user)
         
-        selected = random.choice(candidates)
-        return await ArticleService.get_article_detail(db, selected.id)
-
+        return await ArticleService.get_article_detail(db, article_id)
 
 article_service = ArticleService()
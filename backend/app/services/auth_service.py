@@ -4,9 +4,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.user import User
 from app.services.wechat_service import wechat_service
-from app.utils.security import create_access_token, verify_password
+from app.services.daily_rollup import daily_rollup
+from app.utils.security import create_access_token, verify_password_async, LoginThrottle
+from app.utils.dates import business_today
 from app.config import settings
 
+admin_login_throttle = LoginThrottle(
+    max_failures=settings.ADMIN_LOGIN_MAX_FAILURES,
+    window=settings.ADMIN_LOGIN_WINDOW_SECONDS,
+)
+
 
 class AuthService:
     @staticmethod
@@ -25,6 +32,7 @@ class AuthService:
             if not user:
                 user = User(openid=openid)
                 db.add(user)
+                await daily_rollup.increment(db, business_today(), new_users=1)
                 await db.commit()
                 await db.refresh(user)
                 is_new_user = True
@@ -40,21 +48,31 @@ class AuthService:
             raise
     
     @staticmethod
-    async def admin_login(db: AsyncSession, username: str, password: str) -> str:
+    async def admin_login(db: AsyncSession, username: str, password: str, client_ip: str = "") -> str:
+        """管理员登录
+
+        失败次数按 客户端 IP + 用户名 计数，且只记录管理员用户名的失败：
+        其他来源无法把真正的管理员锁在门外，随意编造的用户名也不会挤占限流缓存。
+        """
+        throttle_key = f"{client_ip}:{username}"
         try:
+            admin_login_throttle.check(throttle_key)
+
             if username != settings.ADMIN_USERNAME:
                 raise ValueError("用户名或密码错误")
             
             if not settings.ADMIN_PASSWORD_HASH:
                 raise ValueError("管理员密码未配置")
             
-            if verify_password(password, settings.ADMIN_PASSWORD_HASH):
+            if await verify_password_async(password, settings.ADMIN_PASSWORD_HASH):
+                admin_login_throttle.reset(throttle_key)
                 access_token = create_access_token(
                     data={"sub": "admin", "role": "admin", "username": username},
                     expires_delta=timedelta(hours=24)
                 )
                 return access_token
             
+            admin_login_throttle.record_failure(throttle_key)
             raise ValueError("用户名或密码错误")
         except Exception as e:
             raise
@@ -0,0 +1,178 @@
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, literal, union_all
+
+from app.models.ability import AbilityDimension
+from app.models.badge import Badge, UserBadge, BadgeConditionTypeEnum
+from app.models.user import User
+from app.models.user_ability import UserAbility
+
+# 能力正确率勋章要求的最少答题数
+ABILITY_ACCURACY_MIN_TOTAL = 10
+
+# 按用户计数字段判断的勋章类型
+USER_COUNTER_TYPES = (
+    BadgeConditionTypeEnum.FIRST_READING,
+    BadgeConditionTypeEnum.STREAK_DAYS,
+    BadgeConditionTypeEnum.TOTAL_READINGS,
+)
+ABILITY_TYPES = (
+    BadgeConditionTypeEnum.ABILITY_ACCURACY,
+    BadgeConditionTypeEnum.ABILITY_COUNT,
+)
+
+
+class BadgeRule(NamedTuple):
+    threshold: int
+    badge_id: int
+    name: str
+    description: Optional[str]
+    icon_url: Optional[str]
+
+
+class AbilityCounters(NamedTuple):
+    score: float
+    correct_count: int
+    total_count: int
+
+
+class BadgeRules:
+    """编译后的勋章规则集
+
+    勋章表只在变化时加载一次：按条件类型分组、按阈值排序，
+    能力类勋章的 condition_extra（能力编码）预先解析为能力 ID。
+    判断时只需一次查询取出用户的能力计数和已有勋章，其余在内存中完成。
+
+    每次判断前用 (勋章数, 最大 ID) 做一次廉价的变更检查；
+    原地修改勋章阈值后需调用 clear。
+    """
+
+    def __init__(self):
+        self._fingerprint: Optional[Tuple[int, int]] = None
+        self._by_type: Dict[BadgeConditionTypeEnum, List[BadgeRule]] = {}
+        self._by_ability: Dict[int, Dict[BadgeConditionTypeEnum, List[BadgeRule]]] = {}
+
+    def clear(self) -> None:
+        self._fingerprint = None
+        self._by_type = {}
+        self._by_ability = {}
+
+    async def ensure_current(self, db: AsyncSession) -> None:
+        result = await db.execute(select(func.count(Badge.id), func.max(Badge.id)))
+        count, max_id = result.one()
+        fingerprint = (count or 0, max_id or 0)
+        if fingerprint != self._fingerprint:
+            await self.compile(db)
+            self._fingerprint = fingerprint
+
+    async def compile(self, db: AsyncSession) -> None:
+        result = await db.execute(
+            select(Badge, AbilityDimension.id)
+            .outerjoin(AbilityDimension, AbilityDimension.code == Badge.condition_extra)
+        )
+        by_type: Dict[BadgeConditionTypeEnum, List[BadgeRule]] = {}
+        by_ability: Dict[int, Dict[BadgeConditionTypeEnum, List[BadgeRule]]] = {}
+        for badge, ability_id in result.all():
+            rule = BadgeRule(
+                threshold=badge.condition_value or 0,
+                badge_id=badge.id,
+                name=badge.name,
+                description=badge.description,
+                icon_url=badge.icon_url
+            )
+            if badge.condition_type in USER_COUNTER_TYPES:
+                by_type.setdefault(badge.condition_type, []).append(rule)
+            elif badge.condition_type in ABILITY_TYPES and ability_id is not None:
+                by_ability.setdefault(ability_id, {}).setdefault(badge.condition_type, []).append(rule)
+
+        for rules in by_type.values():
+            rules.sort()
+        for ability_rules in by_ability.values():
+            for rules in ability_rules.values():
+                rules.sort()
+        self._by_type = by_type
+        self._by_ability = by_ability
+
+    @property
+    def ability_ids(self) -> List[int]:
+        return list(self._by_ability)
+
+    async def load_snapshot(
+        self, db: AsyncSession, user_id: int
+    ) -> Tuple[Dict[int, AbilityCounters], Set[int]]:
+        """一次查询取出用户在规则涉及能力上的计数，以及已获得的勋章 ID"""
+        owned = select(
+            literal("badge").label("kind"),
+            UserBadge.badge_id.label("ref_id"),
+            literal(None).label("score"),
+            literal(None).label("correct_count"),
+            literal(None).label("total_count")
+        ).where(UserBadge.user_id == user_id)
+        queries = [owned]
+        if self._by_ability:
+            queries.append(
+                select(
+                    literal("ability"),
+                    UserAbility.ability_id,
+                    UserAbility.score,
+                    UserAbility.correct_count,
+                    UserAbility.total_count
+                ).where(
+                    UserAbility.user_id == user_id,
+                    UserAbility.ability_id.in_(self.ability_ids)
+                )
+            )
+        result = await db.execute(union_all(*queries) if len(queries) > 1 else owned)
+
+        abilities: Dict[int, AbilityCounters] = {}
+        owned_ids: Set[int] = set()
+        for kind, ref_id, score, correct_count, total_count in result.all():
+            if kind == "badge":
+                owned_ids.add(ref_id)
+            else:
+                abilities[ref_id] = AbilityCounters(score or 0, correct_count or 0, total_count or 0)
+        return abilities, owned_ids
+
+    @staticmethod
+    def _reached(rules: List[BadgeRule], value: float) -> List[BadgeRule]:
+        """阈值不超过 value 的规则（rules 按阈值升序）"""
+        return rules[:bisect_right([rule.threshold for rule in rules], value)]
+
+    def evaluate(
+        self,
+        user: User,
+        abilities: Dict[int, AbilityCounters],
+        owned: Set[int]
+    ) -> List[BadgeRule]:
+        """返回用户新满足条件的勋章"""
+        earned: List[BadgeRule] = []
+        total_readings = user.total_readings or 0
+        if total_readings >= 1:
+            earned += self._by_type.get(BadgeConditionTypeEnum.FIRST_READING, [])
+        earned += self._reached(
+            self._by_type.get(BadgeConditionTypeEnum.STREAK_DAYS, []), user.streak_days or 0
+        )
+        earned += self._reached(
+            self._by_type.get(BadgeConditionTypeEnum.TOTAL_READINGS, []), total_readings
+        )
+
+        for ability_id, ability_rules in self._by_ability.items():
+            counters = abilities.get(ability_id)
+            if counters is None:
+                continue
+            if counters.total_count >= ABILITY_ACCURACY_MIN_TOTAL:
+                earned += self._reached(
+                    ability_rules.get(BadgeConditionTypeEnum.ABILITY_ACCURACY, []), counters.score
+                )
+            earned += self._reached(
+                ability_rules.get(BadgeConditionTypeEnum.ABILITY_COUNT, []), counters.correct_count
+            )
+
+        return sorted(
+            (rule for rule in earned if rule.badge_id not in owned),
+            key=lambda rule: rule.badge_id
+        )
+
+
+badge_rules = BadgeRules()
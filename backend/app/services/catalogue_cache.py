@@ -0,0 +1,132 @@
+import logging
+from typing import Awaitable, Callable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.schemas.article import ArticleListItem, ArticleDetail
+from app.utils.cache import TieredCache, get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogueCache:
+    """文章目录缓存（列表页 + 详情）
+
+    缓存 key 带有目录版本号，管理端发布、归档、修改文章后调用 bump
+    递增版本号，旧版本的条目不再被读取，随 LRU/TTL 自然淘汰。
+    配置了 Redis 时版本号存放在 Redis，多个 worker 共享失效；未配置时版本号只在本进程内有效，
+    其他 worker 的变更只能等缓存页按 TTL 过期后可见，版本号本身不随时间变化，
+    避免基于版本号的内存索引无谓地整体重建。
+    调用方应在查库之前取得版本号，并用同一版本号读写缓存，
+    避免查询期间发生的变更被写进新版本。
+
+    其他基于目录的内存索引通过 add_listener 注册，在 bump 时增量更新。
+    """
+
+    GENERATION_KEY = f"{settings.APP_NAME}:catalogue:generation"
+
+    def __init__(self):
+        self._cache = TieredCache(
+            namespace="catalogue",
+            max_size=settings.CATALOGUE_CACHE_MAX_SIZE,
+            ttl=settings.CATALOGUE_CACHE_TTL_SECONDS,
+        )
+        self._local_generation = 0
+        self._listeners: List[Callable[[AsyncSession, Optional[int], int], Awaitable[None]]] = []
+
+    def add_listener(
+        self, listener: Callable[[AsyncSession, Optional[int], int], Awaitable[None]]
+    ) -> None:
+        """注册目录变更回调，参数为 (db, article_id, 新版本号)"""
+        self._listeners.append(listener)
+
+    async def generation(self) -> int:
+        redis = get_redis()
+        if redis is None:
+            return self._local_generation
+        try:
+            value = await redis.get(self.GENERATION_KEY)
+        except Exception as e:
+            logger.warning("Redis 读取目录版本失败: %s", e)
+            return self._local_generation
+        return int(value or 0)
+
+    async def bump(self, db: Optional[AsyncSession] = None, article_id: Optional[int] = None) -> int:
+        """目录数据变更（提交事务后）调用，使所有已缓存的列表和详情失效
+
+        传入 db 和 article_id 时通知已注册的索引增量更新该文章。
+        返回新的版本号。
+        """
+        self._local_generation += 1
+        self._cache.clear_local()
+        generation = self._local_generation
+        redis = get_redis()
+        if redis is not None:
+            try:
+                generation = int(await redis.incr(self.GENERATION_KEY))
+            except Exception as e:
+                logger.warning("Redis 递增目录版本失败: %s", e)
+
+        if db is not None:
+            for listener in self._listeners:
+                try:
+                    await listener(db, article_id, generation)
+                except Exception as e:
+                    logger.warning("目录索引更新失败: %s", e)
+        return generation
+
+    @staticmethod
+    def _list_key(
+        generation: int,
+        page: int,
+        page_size: int,
+        grade: Optional[str],
+        genre: Optional[str],
+        difficulty: Optional[int],
+        source: Optional[str],
+        keyword: Optional[str],
+        cursor: Optional[str] = None,
+    ) -> str:
+        parts = [
+            (grade or "").strip(),
+            (genre or "").strip(),
+            str(difficulty or ""),
+            (source or "").strip(),
+            (keyword or "").strip(),
+            str(page),
+            str(page_size),
+            cursor or "",
+        ]
+        return f"list:{generation}:" + "|".join(parts)
+
+    async def get_list(self, generation: int, **filters) -> Optional[Tuple[List[ArticleListItem], int]]:
+        key = self._list_key(generation, **filters)
+        cached = await self._cache.get(key)
+        if cached is None:
+            return None
+        return [ArticleListItem.model_validate(item) for item in cached["items"]], cached["total"]
+
+    async def set_list(
+        self, generation: int, items: List[ArticleListItem], total: int, **filters
+    ) -> None:
+        key = self._list_key(generation, **filters)
+        await self._cache.set(key, {
+            "items": [item.model_dump(mode="json") for item in items],
+            "total": total,
+        })
+
+    async def get_detail(self, generation: int, article_id: int) -> Optional[ArticleDetail]:
+        cached = await self._cache.get(f"detail:{generation}:{article_id}")
+        if cached is None:
+            return None
+        return ArticleDetail.model_validate(cached)
+
+    async def set_detail(self, generation: int, article: ArticleDetail) -> None:
+        key = f"detail:{generation}:{article.id}"
+        await self._cache.set(key, article.model_dump(mode="json"))
+
+    def clear(self) -> None:
+        self._cache.clear_local()
+
+
+catalogue_cache = CatalogueCache()
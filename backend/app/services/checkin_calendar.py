@@ -0,0 +1,192 @@
+import calendar
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, not_, or_
+
+from app.models.checkin import CheckIn
+from app.models.checkin_calendar import CheckInCalendar
+
+YEAR_BITS = 366
+YEAR_BYTES = 46
+
+
+def day_bit(day: date) -> int:
+    """日期在当年位图中的位置（1 月 1 日为第 0 位）"""
+    return day.timetuple().tm_yday - 1
+
+
+def days_in_year(year: int) -> int:
+    return 366 if calendar.isleap(year) else 365
+
+
+def encode(bits: int) -> bytes:
+    return bits.to_bytes(YEAR_BYTES, "little")
+
+
+def decode(raw: Optional[bytes]) -> int:
+    return int.from_bytes(raw or b"", "little")
+
+
+def longest_run(bits: int) -> int:
+    """最长连续 1 的长度：每轮 x &= x >> 1 会把每段连续 1 缩短一位"""
+    run = 0
+    while bits:
+        bits &= bits >> 1
+        run += 1
+    return run
+
+
+def run_ending_at(bits: int, position: int) -> int:
+    """以 position 位结尾的连续 1 的长度"""
+    zeros = ~bits & ((1 << (position + 1)) - 1)
+    if not zeros:
+        return position + 1
+    return position - (zeros.bit_length() - 1)
+
+
+class CheckInCalendarService:
+    """按用户、按年的打卡位图
+
+    月历、连续打卡、最长连续打卡和多年统计都用位运算在一两行数据上完成，
+    不再扫描 check_ins。尚未迁移（没有位图行）的年份回退到 check_ins 现算；
+    打卡写入路径会顺带把缺失的位图行补上。
+    """
+
+    async def load(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        years: Optional[Iterable[int]] = None,
+        for_update: bool = False,
+        create: bool = False
+    ) -> Dict[int, CheckInCalendar]:
+        """加载指定年份（None 为全部年份）的位图行
+
+        create=True 时回退算出的行会加入会话，随当前事务写入。
+        """
+        stmt = select(CheckInCalendar).where(CheckInCalendar.user_id == user_id)
+        if years is not None:
+            years = sorted(set(years))
+            stmt = stmt.where(CheckInCalendar.year.in_(years))
+        if for_update:
+            stmt = stmt.with_for_update()
+        result = await db.execute(stmt)
+        rows = {row.year: row for row in result.scalars().all()}
+
+        missing = None if years is None else [year for year in years if year not in rows]
+        if missing != []:
+            built = await self._from_checkins(db, user_id, missing, exclude=list(rows))
+            for row in built.values():
+                if create:
+                    db.add(row)
+            rows.update(built)
+        return rows
+
+    @staticmethod
+    async def _from_checkins(
+        db: AsyncSession,
+        user_id: int,
+        years: Optional[List[int]],
+        exclude: List[int]
+    ) -> Dict[int, CheckInCalendar]:
+        """从 check_ins 计算位图行；years 为 None 时计算 exclude 以外有打卡的全部年份"""
+        stmt = select(CheckIn.check_date).where(CheckIn.user_id == user_id)
+        if years is not None:
+            stmt = stmt.where(or_(*[
+                and_(CheckIn.check_date >= date(year, 1, 1), CheckIn.check_date <= date(year, 12, 31))
+                for year in years
+            ]))
+        elif exclude:
+            stmt = stmt.where(not_(or_(*[
+                and_(CheckIn.check_date >= date(year, 1, 1), CheckIn.check_date <= date(year, 12, 31))
+                for year in exclude
+            ])))
+        result = await db.execute(stmt)
+
+        bitmaps: Dict[int, int] = dict.fromkeys(years or [], 0)
+        for check_date in result.scalars().all():
+            bitmaps[check_date.year] = bitmaps.get(check_date.year, 0) | (1 << day_bit(check_date))
+        return {
+            year: CheckInCalendar(
+                user_id=user_id, year=year, bits=encode(bits), days_count=bin(bits).count("1")
+            )
+            for year, bits in bitmaps.items()
+        }
+
+    @staticmethod
+    def has(rows: Dict[int, CheckInCalendar], day: date) -> bool:
+        row = rows.get(day.year)
+        return row is not None and bool(decode(row.bits) >> day_bit(day) & 1)
+
+    @staticmethod
+    def mark(rows: Dict[int, CheckInCalendar], user_id: int, day: date, db: AsyncSession) -> None:
+        """在位图中记下一天（调用方已确认当天未打卡）"""
+        row = rows.get(day.year)
+        if row is None:
+            row = CheckInCalendar(user_id=user_id, year=day.year, bits=encode(0), days_count=0)
+            db.add(row)
+            rows[day.year] = row
+        row.bits = encode(decode(row.bits) | (1 << day_bit(day)))
+        row.days_count = (row.days_count or 0) + 1
+
+    @staticmethod
+    def month_days(rows: Dict[int, CheckInCalendar], year: int, month: int) -> List[date]:
+        """某月的打卡日期（升序）"""
+        row = rows.get(year)
+        if row is None:
+            return []
+        start = day_bit(date(year, month, 1))
+        length = calendar.monthrange(year, month)[1]
+        bits = (decode(row.bits) >> start) & ((1 << length) - 1)
+        days = []
+        while bits:
+            low = bits & -bits
+            days.append(date(year, month, low.bit_length()))
+            bits ^= low
+        return days
+
+    @staticmethod
+    def _timeline(rows: Dict[int, CheckInCalendar]) -> Tuple[int, int]:
+        """把各年位图按时间顺序拼成一个整数，返回 (位图, 起始年份)"""
+        if not rows:
+            return 0, 0
+        first_year = min(rows)
+        timeline = 0
+        offset = 0
+        for year in range(first_year, max(rows) + 1):
+            row = rows.get(year)
+            if row is not None:
+                timeline |= decode(row.bits) << offset
+            offset += days_in_year(year)
+        return timeline, first_year
+
+    @staticmethod
+    def _position(first_year: int, day: date) -> int:
+        return sum(days_in_year(year) for year in range(first_year, day.year)) + day_bit(day)
+
+    def current_streak(self, rows: Dict[int, CheckInCalendar], today: date) -> int:
+        """截至今天的连续打卡天数（今天还没打卡时从昨天往前数）"""
+        timeline, first_year = self._timeline(rows)
+        if not timeline or today.year < first_year:
+            return 0
+        position = self._position(first_year, today)
+        if not timeline >> position & 1:
+            position -= 1
+            if position < 0 or not timeline >> position & 1:
+                return 0
+        return run_ending_at(timeline, position)
+
+    def max_streak(self, rows: Dict[int, CheckInCalendar]) -> int:
+        timeline, _ = self._timeline(rows)
+        return longest_run(timeline)
+
+    @staticmethod
+    def yearly_counts(rows: Dict[int, CheckInCalendar]) -> List[Tuple[int, int]]:
+        return [
+            (year, bin(decode(rows[year].bits)).count("1"))
+            for year in sorted(rows)
+        ]
+
+
+checkin_calendar = CheckInCalendarService()
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, and_, or_
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.outbox import CompletionOutbox, OutboxStatusEnum
+from app.models.progress import UserProgress
+from app.services.user_cache import user_cache
+
+logger = logging.getLogger(__name__)
+
+# 被领取后超过该时长仍未完成的任务视为 worker 已崩溃，允许重新领取
+LEASE_SECONDS = 300
+# 失败重试的基础退避时长，第 n 次失败后等待 RETRY_BASE_SECONDS * 2^(n-1)
+RETRY_BASE_SECONDS = 5
+
+CompletionHandler = Callable[[AsyncSession, CompletionOutbox], Awaitable[dict]]
+
+
+class LocalQueue:
+    """进程内任务队列（单进程部署和测试用）
+
+    队列只传递任务 ID 用于及时唤醒 worker，任务本身持久化在 completion_outbox 表中，
+    进程重启丢失的通知由定时扫表补上。
+    """
+
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def put(self, event_id: int) -> None:
+        self._queue.put_nowait(event_id)
+
+    async def get(self, timeout: float) -> Optional[int]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+
+class CompletionWorker:
+    """阅读完成后处理（能力统计、打卡、勋章）的 outbox 消费者
+
+    complete_reading 在完成记录的同一事务中写入一条 outbox 任务后立即返回，
+    本 worker 在后台领取任务、调用处理函数并把结果写回任务行。
+    领取通过条件 UPDATE 完成，多进程同时运行也不会重复处理；
+    失败按指数退避重试，超过 COMPLETION_MAX_ATTEMPTS 次后标记为失败。
+    """
+
+    def __init__(self):
+        self.queue = LocalQueue()
+        self._handler: Optional[CompletionHandler] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def set_handler(self, handler: CompletionHandler) -> None:
+        """注册处理函数：在传入的会话中完成处理并返回可 JSON 序列化的结果，不要提交事务"""
+        self._handler = handler
+
+    def clear(self) -> None:
+        self.queue = LocalQueue()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @staticmethod
+    def enqueue(db: AsyncSession, progress: UserProgress) -> CompletionOutbox:
+        """在当前事务中登记一条待处理任务（由调用方提交）"""
+        event = CompletionOutbox(
+            progress_id=progress.id,
+            user_id=progress.user_id,
+            status=OutboxStatusEnum.PENDING,
+            attempts=0,
+            available_at=datetime.utcnow()
+        )
+        db.add(event)
+        return event
+
+    def notify(self, event_id: int) -> None:
+        """事务提交后通知 worker 尽快处理；worker 未运行时由下次扫表处理"""
+        if self.running:
+            self.queue.put(event_id)
+
+    @staticmethod
+    def _claimable(now: datetime):
+        return or_(
+            and_(
+                CompletionOutbox.status == OutboxStatusEnum.PENDING,
+                CompletionOutbox.available_at <= now
+            ),
+            and_(
+                CompletionOutbox.status == OutboxStatusEnum.PROCESSING,
+                CompletionOutbox.locked_at < now - timedelta(seconds=LEASE_SECONDS)
+            )
+        )
+
+    async def claim(self, db: AsyncSession, event_id: int) -> bool:
+        """领取任务，返回是否领取成功"""
+        now = datetime.utcnow()
+        result = await db.execute(
+            update(CompletionOutbox)
+            .where(CompletionOutbox.id == event_id, self._claimable(now))
+            .values(
+                status=OutboxStatusEnum.PROCESSING,
+                locked_at=now,
+                attempts=CompletionOutbox.attempts + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount == 1
+
+    async def process(self, db: AsyncSession, event_id: int) -> Optional[dict]:
+        """领取并处理一条任务，返回处理结果；任务已被处理或正被他人处理时返回 None"""
+        if self._handler is None:
+            raise RuntimeError("未注册阅读完成处理函数")
+        if not await self.claim(db, event_id):
+            return None
+
+        try:
+            event = await db.get(CompletionOutbox, event_id, populate_existing=True)
+            result = await self._handler(db, event)
+            event.status = OutboxStatusEnum.DONE
+            event.result = result
+            event.locked_at = None
+            event.last_error = None
+            event.processed_at = datetime.utcnow()
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            await self._record_failure(db, event_id, e)
+            raise
+
+        await user_cache.invalidate(event.user_id)
+        return result
+
+    async def _record_failure(self, db: AsyncSession, event_id: int, error: Exception) -> None:
+        event = await db.get(CompletionOutbox, event_id, populate_existing=True)
+        if event is None:
+            return
+        if event.attempts >= settings.COMPLETION_MAX_ATTEMPTS:
+            event.status = OutboxStatusEnum.FAILED
+        else:
+            event.status = OutboxStatusEnum.PENDING
+            delay = RETRY_BASE_SECONDS * 2 ** (event.attempts - 1)
+            event.available_at = datetime.utcnow() + timedelta(seconds=delay)
+        event.locked_at = None
+        event.last_error = f"{type(error).__name__}: {error}"[:500]
+        await db.commit()
+
+    async def process_pending(self, limit: int = 100) -> int:
+        """扫表处理到期的任务（含超时未完成的），返回成功处理的条数"""
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(CompletionOutbox.id)
+                .where(self._claimable(datetime.utcnow()))
+                .order_by(CompletionOutbox.id)
+                .limit(limit)
+            )
+            event_ids: List[int] = list(result.scalars().all())
+
+        processed = 0
+        for event_id in event_ids:
+            if await self._process_logged(event_id) is not None:
+                processed += 1
+        return processed
+
+    async def _process_logged(self, event_id: int) -> Optional[dict]:
+        async with AsyncSessionLocal() as session:
+            try:
+                return await self.process(session, event_id)
+            except Exception as e:
+                logger.warning("阅读完成后处理失败 (outbox=%s): %s", event_id, e)
+                return None
+
+    async def run(self) -> None:
+        """后台循环：有通知立即处理，空闲时按间隔扫表"""
+        await self.process_pending()
+        while True:
+            event_id = await self.queue.get(settings.COMPLETION_WORKER_POLL_SECONDS)
+            try:
+                if event_id is None:
+                    await self.process_pending()
+                else:
+                    await self._process_logged(event_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("阅读完成后处理 worker 异常: %s", e)
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @staticmethod
+    async def get_event(db: AsyncSession, progress_id: int) -> Optional[CompletionOutbox]:
+        result = await db.execute(
+            select(CompletionOutbox).where(CompletionOutbox.progress_id == progress_id)
+        )
+        return result.scalar_one_or_none()
+
+
+completion_worker = CompletionWorker()
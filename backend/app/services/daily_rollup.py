@@ -0,0 +1,263 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func, Integer, cast
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models.checkin import CheckIn
+from app.models.progress import UserProgress, QuestionAnswer
+from app.models.question import QuestionAbility
+from app.models.rollup import DailyRollup, DailyAbilityRollup
+from app.models.user import User
+from app.utils.dates import day_bounds, day_column
+
+ROLLUP_FIELDS = (
+    "new_users", "active_users", "readings_completed", "answers", "correct_answers", "checkins"
+)
+# 由计数字段计算出的比率指标
+RATIO_METRICS = {"accuracy": ("correct_answers", "answers")}
+METRICS = (*ROLLUP_FIELDS, *RATIO_METRICS, "ability_accuracy")
+
+
+class DailyRollupService:
+    """按天汇总的运营指标
+
+    写路径在业务事务中用 INSERT ... ON CONFLICT DO UPDATE 对当天的汇总行做加法：
+    注册时 new_users，用户当天第一次开始阅读时 active_users，
+    阅读完成后处理时 readings_completed、答题数和各能力的答题数、打卡。
+    趋势接口只读汇总表；rebuild 从明细表按天重算，用于回填和纠偏。
+    日期都按业务时区（BUSINESS_TZ）划分，与打卡日期一致。
+    """
+
+    @staticmethod
+    def _upsert(db: AsyncSession):
+        dialect = db.bind.dialect.name
+        if dialect == "postgresql":
+            return pg_insert
+        if dialect == "sqlite":
+            return sqlite_insert
+        return None
+
+    async def increment(self, db: AsyncSession, day: date, **deltas: int) -> None:
+        deltas = {field: value for field, value in deltas.items() if value}
+        if not deltas:
+            return
+        row = {**dict.fromkeys(ROLLUP_FIELDS, 0), **deltas}
+        now = datetime.now(timezone.utc)
+
+        upsert = self._upsert(db)
+        if upsert is not None:
+            stmt = upsert(DailyRollup).values(day=day, updated_at=now, **row)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[DailyRollup.day],
+                set_={
+                    **{
+                        field: getattr(DailyRollup, field) + getattr(stmt.excluded, field)
+                        for field in deltas
+                    },
+                    "updated_at": stmt.excluded.updated_at
+                }
+            )
+            await db.execute(stmt)
+            return
+
+        # 其他数据库：读取后累加
+        rollup = await db.get(DailyRollup, day, with_for_update=True)
+        if rollup is None:
+            db.add(DailyRollup(day=day, **row))
+            return
+        for field, value in deltas.items():
+            setattr(rollup, field, (getattr(rollup, field) or 0) + value)
+
+    async def increment_abilities(
+        self, db: AsyncSession, day: date, stats: Iterable[Tuple[int, int, int]]
+    ) -> None:
+        """累加各能力的 (ability_id, 答对数, 答题数)"""
+        rows = [
+            {"day": day, "ability_id": ability_id, "answers": total, "correct_answers": correct}
+            for ability_id, correct, total in stats if total
+        ]
+        if not rows:
+            return
+
+        upsert = self._upsert(db)
+        if upsert is not None:
+            stmt = upsert(DailyAbilityRollup).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[DailyAbilityRollup.day, DailyAbilityRollup.ability_id],
+                set_={
+                    "answers": DailyAbilityRollup.answers + stmt.excluded.answers,
+                    "correct_answers": DailyAbilityRollup.correct_answers + stmt.excluded.correct_answers
+                }
+            )
+            await db.execute(stmt)
+            return
+
+        for row in rows:
+            rollup = await db.get(DailyAbilityRollup, (day, row["ability_id"]), with_for_update=True)
+            if rollup is None:
+                db.add(DailyAbilityRollup(**row))
+                continue
+            rollup.answers += row["answers"]
+            rollup.correct_answers += row["correct_answers"]
+
+    async def mark_active(self, db: AsyncSession, user_id: int, day: date) -> None:
+        """用户开始阅读时调用（在插入本次进度之前）：当天第一次阅读才计入活跃用户"""
+        start, end = day_bounds(day)
+        seen = await db.scalar(
+            select(UserProgress.id)
+            .where(
+                UserProgress.user_id == user_id,
+                UserProgress.created_at >= start,
+                UserProgress.created_at < end
+            )
+            .limit(1)
+        )
+        if seen is None:
+            await self.increment(db, day, active_users=1)
+
+    async def rebuild(self, db: AsyncSession, start: date, end: date) -> int:
+        """从明细表重算 [start, end] 内每一天的汇总（覆盖写入，不提交），返回天数
+
+        时间戳按业务时区归日：子查询先算出每行的业务日期，外层再按日期分组。
+        """
+        start_at, end_at = day_bounds(start)[0], day_bounds(end)[1]
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        rows: Dict[date, dict] = {day: dict.fromkeys(ROLLUP_FIELDS, 0) for day in days}
+
+        def collect(field: str, result) -> None:
+            for day, value in result.all():
+                if day in rows:
+                    rows[day][field] = value or 0
+
+        new_users = (
+            select(day_column(User.created_at, days).label("day"), User.id)
+            .where(User.created_at >= start_at, User.created_at < end_at)
+            .subquery()
+        )
+        collect("new_users", await db.execute(
+            select(new_users.c.day, func.count(new_users.c.id)).group_by(new_users.c.day)
+        ))
+
+        started = (
+            select(day_column(UserProgress.created_at, days).label("day"), UserProgress.user_id)
+            .where(UserProgress.created_at >= start_at, UserProgress.created_at < end_at)
+            .subquery()
+        )
+        collect("active_users", await db.execute(
+            select(started.c.day, func.count(func.distinct(started.c.user_id))).group_by(started.c.day)
+        ))
+
+        completed_day = day_column(UserProgress.completed_at, days).label("day")
+        in_range = (UserProgress.completed_at >= start_at, UserProgress.completed_at < end_at)
+        completed = select(completed_day, UserProgress.id).where(*in_range).subquery()
+        collect("readings_completed", await db.execute(
+            select(completed.c.day, func.count(completed.c.id)).group_by(completed.c.day)
+        ))
+
+        answered = (
+            select(completed_day, QuestionAnswer.id, QuestionAnswer.is_correct)
+            .join(UserProgress, UserProgress.id == QuestionAnswer.progress_id)
+            .where(*in_range)
+            .subquery()
+        )
+        answers = await db.execute(
+            select(
+                answered.c.day,
+                func.count(answered.c.id),
+                func.sum(cast(answered.c.is_correct, Integer))
+            )
+            .group_by(answered.c.day)
+        )
+        for day, total, correct in answers.all():
+            if day in rows:
+                rows[day]["answers"] = total or 0
+                rows[day]["correct_answers"] = correct or 0
+
+        collect("checkins", await db.execute(
+            select(CheckIn.check_date, func.count(CheckIn.id))
+            .where(CheckIn.check_date >= start, CheckIn.check_date <= end)
+            .group_by(CheckIn.check_date)
+        ))
+
+        ability_answers = (
+            select(completed_day, QuestionAbility.ability_id, QuestionAnswer.id, QuestionAnswer.is_correct)
+            .join(UserProgress, UserProgress.id == QuestionAnswer.progress_id)
+            .join(QuestionAbility, QuestionAbility.question_id == QuestionAnswer.question_id)
+            .where(*in_range)
+            .subquery()
+        )
+        ability_rows = await db.execute(
+            select(
+                ability_answers.c.day,
+                ability_answers.c.ability_id,
+                func.count(ability_answers.c.id),
+                func.sum(cast(ability_answers.c.is_correct, Integer))
+            )
+            .group_by(ability_answers.c.day, ability_answers.c.ability_id)
+        )
+
+        await db.execute(delete(DailyRollup).where(DailyRollup.day >= start, DailyRollup.day <= end))
+        await db.execute(
+            delete(DailyAbilityRollup)
+            .where(DailyAbilityRollup.day >= start, DailyAbilityRollup.day <= end)
+        )
+        now = datetime.now(timezone.utc)
+        db.add_all([DailyRollup(day=day, updated_at=now, **values) for day, values in rows.items()])
+        db.add_all([
+            DailyAbilityRollup(day=day, ability_id=ability_id, answers=total, correct_answers=correct or 0)
+            for day, ability_id, total, correct in ability_rows.all()
+        ])
+        await db.flush()
+        return len(days)
+
+    async def series(
+        self,
+        db: AsyncSession,
+        metric: str,
+        start: date,
+        end: date,
+        ability_id: Optional[int] = None
+    ) -> List[Tuple[date, float]]:
+        """[start, end] 内每天的指标值，没有汇总行的日期补 0"""
+        if metric == "ability_accuracy":
+            result = await db.execute(
+                select(DailyAbilityRollup.day, DailyAbilityRollup.correct_answers, DailyAbilityRollup.answers)
+                .where(
+                    DailyAbilityRollup.ability_id == ability_id,
+                    DailyAbilityRollup.day >= start,
+                    DailyAbilityRollup.day <= end
+                )
+            )
+            values = {day: (correct, total) for day, correct, total in result.all()}
+            ratio = True
+        elif metric in RATIO_METRICS:
+            numerator, denominator = RATIO_METRICS[metric]
+            result = await db.execute(
+                select(DailyRollup.day, getattr(DailyRollup, numerator), getattr(DailyRollup, denominator))
+                .where(DailyRollup.day >= start, DailyRollup.day <= end)
+            )
+            values = {day: (num, den) for day, num, den in result.all()}
+            ratio = True
+        else:
+            result = await db.execute(
+                select(DailyRollup.day, getattr(DailyRollup, metric))
+                .where(DailyRollup.day >= start, DailyRollup.day <= end)
+            )
+            values = dict(result.all())
+            ratio = False
+
+        points = []
+        for i in range((end - start).days + 1):
+            day = start + timedelta(days=i)
+            value = values.get(day)
+            if ratio:
+                num, den = value or (0, 0)
+                points.append((day, round(num / den * 100, 1) if den else 0.0))
+            else:
+                points.append((day, float(value or 0)))
+        return points
+
+
+daily_rollup = DailyRollupService()
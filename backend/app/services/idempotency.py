@@ -0,0 +1,149 @@
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from app.config import settings
+from app.utils.cache import TieredCache, get_redis
+from app.utils.exceptions import TooManyRequestsError, ValidationError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+# 其他进程正在处理同一 key 时，等待其结果的最长时间和轮询间隔
+INFLIGHT_WAIT_SECONDS = 5.0
+INFLIGHT_POLL_SECONDS = 0.1
+
+
+def _fingerprint(scope: str, payload: Any) -> str:
+    raw = json.dumps([scope, jsonable_encoder(payload)], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class IdempotencyStore:
+    """基于 Idempotency-Key 请求头的写接口幂等
+
+    首次请求执行后把响应缓存 IDEMPOTENCY_TTL_SECONDS（进程内 LRU + 可选 Redis），
+    带相同 key 的重试直接回放缓存的响应；同一 key 的并发请求用占位互斥（进程内记在 _owners，
+    跨进程用 Redis SET NX），后到的请求轮询缓存等待先到者的结果，而不是等待先到者的任务：
+    先到者在自己请求的数据库会话中执行，客户端断开、请求被取消时释放占位，
+    后到者随后用自己的会话重新执行，不会复用已关闭的会话。
+    执行失败（包括业务异常）不缓存，客户端可以用同一个 key 重试。
+
+    key 按用户隔离，同一 key 用于不同接口或不同请求体时返回 422：
+    已完成的请求比对缓存中的指纹；仍在处理中的请求比对占位时记录的指纹
+    （进程内记在 _owners，跨进程写在 Redis 占位的值里），不同请求体不会共享同一次执行的结果。
+    """
+
+    def __init__(self):
+        self._cache = TieredCache(
+            namespace="idempotency",
+            max_size=settings.IDEMPOTENCY_CACHE_MAX_SIZE,
+            ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+        )
+        # 本进程正在处理的 key -> 请求指纹
+        self._owners: Dict[str, str] = {}
+
+    def clear(self) -> None:
+        self._cache.clear_local()
+        self._owners.clear()
+
+    async def run(
+        self,
+        user_id: int,
+        key: Optional[str],
+        scope: str,
+        payload: Any,
+        func: Callable[[], Awaitable[T]],
+        response_type: Type[T]
+    ) -> T:
+        """执行 func 并按 key 缓存结果；key 为空时直接执行"""
+        if not key:
+            return await func()
+
+        cache_key = f"{user_id}:{key}"
+        fingerprint = _fingerprint(scope, payload)
+        cached = await self._lookup(cache_key, fingerprint)
+        if cached is not None:
+            return response_type.model_validate(cached)
+
+        response = await self._execute(cache_key, fingerprint, func)
+        return response_type.model_validate(response)
+
+    async def _lookup(self, cache_key: str, fingerprint: str) -> Optional[dict]:
+        entry = await self._cache.get(cache_key)
+        if entry is None:
+            return None
+        if entry["fingerprint"] != fingerprint:
+            raise ValidationError("Idempotency-Key 已用于其他请求")
+        return entry["response"]
+
+    async def _execute(
+        self, cache_key: str, fingerprint: str, func: Callable[[], Awaitable[BaseModel]]
+    ) -> dict:
+        waited = 0.0
+        while True:
+            # 先到的请求（本进程或其他进程）可能已经写入缓存
+            cached = await self._lookup(cache_key, fingerprint)
+            if cached is not None:
+                return cached
+            owner = self._owners.get(cache_key)
+            if owner is None:
+                self._owners[cache_key] = fingerprint
+                locked, owner = await self._acquire(cache_key, fingerprint)
+                if locked:
+                    break
+                del self._owners[cache_key]
+            if owner is not None and owner != fingerprint:
+                raise ValidationError("Idempotency-Key 已用于其他请求")
+            if waited >= INFLIGHT_WAIT_SECONDS:
+                raise TooManyRequestsError("请求正在处理中，请稍后重试")
+            await asyncio.sleep(INFLIGHT_POLL_SECONDS)
+            waited += INFLIGHT_POLL_SECONDS
+
+        try:
+            response = jsonable_encoder(await func())
+            await self._cache.set(cache_key, {"fingerprint": fingerprint, "response": response})
+            return response
+        finally:
+            self._owners.pop(cache_key, None)
+            await self._release(cache_key)
+
+    def _lock_key(self, cache_key: str) -> str:
+        return f"{settings.APP_NAME}:idempotency-lock:{cache_key}"
+
+    async def _acquire(self, cache_key: str, fingerprint: str) -> Tuple[bool, Optional[str]]:
+        """跨进程占位，占位值为请求指纹
+
+        返回 (是否占位成功, 占位者的指纹)；未配置 Redis 或 Redis 故障时视为占位成功。
+        """
+        redis = get_redis()
+        if redis is None:
+            return True, fingerprint
+        lock_key = self._lock_key(cache_key)
+        try:
+            if await redis.set(lock_key, fingerprint, nx=True, ex=int(INFLIGHT_WAIT_SECONDS * 6)):
+                return True, fingerprint
+            owner = await redis.get(lock_key)
+        except Exception as e:
+            logger.warning("Redis 幂等占位失败: %s", e)
+            return True, fingerprint
+        if isinstance(owner, bytes):
+            owner = owner.decode()
+        return False, owner
+
+    async def _release(self, cache_key: str) -> None:
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(self._lock_key(cache_key))
+        except Exception as e:
+            logger.warning("Redis 幂等占位释放失败: %s", e)
+
+
+idempotency_store = IdempotencyStore()
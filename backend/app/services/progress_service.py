@@ -1,21 +1,37 @@
+import logging
 from typing import List, Optional, Tuple
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, case, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
+from app.config import settings
 from app.models.user import User
 from app.models.article import Article
 from app.models.question import Question, QuestionAbility
 from app.models.progress import UserProgress, QuestionAnswer
 from app.models.checkin import CheckIn
 from app.models.user_ability import UserAbility
-from app.models.badge import Badge, UserBadge, BadgeConditionTypeEnum
+from app.models.badge import UserBadge
 from app.models.ability import AbilityDimension
+from app.models.outbox import CompletionOutbox, OutboxStatusEnum
+from app.services.recommendation_pool import recommendation_pool
+from app.services.badge_rules import badge_rules
+from app.services.completion_worker import completion_worker
+from app.services.user_stats import user_stats_counter
+from app.services.checkin_calendar import checkin_calendar
+from app.services.daily_rollup import daily_rollup
+from app.services.active_users import active_user_counter
 from app.schemas.progress import (
     StartReadingResponse,
+    SubmitAnswerRequest,
     SubmitAnswerResponse,
+    BatchSubmitAnswerResponse,
     CompleteReadingResponse,
+    CompletionResultResponse,
     AbilityScoreItem,
     BadgeUnlock,
     ProgressWithAnswers,
@@ -23,6 +39,10 @@ from app.schemas.progress import (
     HistoryItem
 )
 from app.utils.exceptions import NotFoundError, ValidationError
+from app.utils.pagination import decode_cursor, keyset_after
+from app.utils.dates import business_date, business_today
+
+logger = logging.getLogger(__name__)
 
 
 class ProgressService:
@@ -38,10 +58,11 @@ class ProgressService:
             if not article:
                 raise NotFoundError("文章不存在")
 
-            question_count_result = await db.execute(
-                select(func.count(Question.id)).where(Question.article_id == article_id)
-            )
-            question_count = question_count_result.scalar() or 0
+            question_count = article.question_count
+
+            today = business_today()
+            await daily_rollup.mark_active(db, user_id, today)
+            await active_user_counter.add(db, user_id, today)
 
             progress = UserProgress(
                 user_id=user_id,
@@ -51,6 +72,7 @@ class ProgressService:
             db.add(progress)
             await db.commit()
             await db.refresh(progress)
+            await recommendation_pool.mark_read(user_id, article_id)
 
             return StartReadingResponse(
                 progress_id=progress.id,
@@ -108,6 +130,9 @@ class ProgressService:
             if is_correct:
                 progress.correct_count += 1
 
+            await user_stats_counter.increment(
+                db, user_id, total_questions=1, correct_count=int(is_correct)
+            )
             await db.commit()
 
             ability_result = await db.execute(
@@ -131,6 +156,105 @@ class ProgressService:
             await db.rollback()
             raise
 
+    @staticmethod
+    async def submit_answers(
+        db: AsyncSession,
+        progress_id: int,
+        user_id: int,
+        answers: List[SubmitAnswerRequest]
+    ) -> BatchSubmitAnswerResponse:
+        """一次提交多道题的答案，全部校验通过才写入
+
+        题目、能力名称和已提交情况用一次联表查询取出，答案用一条多行 INSERT 写入。
+        """
+        try:
+            progress_result = await db.execute(
+                select(UserProgress).where(UserProgress.id == progress_id).with_for_update()
+            )
+            progress = progress_result.scalar_one_or_none()
+            if not progress or progress.user_id != user_id:
+                raise ValidationError("进度记录不存在")
+
+            if progress.completed_at:
+                raise ValidationError("该阅读已完成，无法继续答题")
+
+            question_ids = [answer.question_id for answer in answers]
+            if len(set(question_ids)) != len(question_ids):
+                raise ValidationError("同一题目不能重复提交")
+
+            rows = await db.execute(
+                select(Question, AbilityDimension.name, QuestionAnswer.id)
+                .outerjoin(QuestionAbility, QuestionAbility.question_id == Question.id)
+                .outerjoin(AbilityDimension, AbilityDimension.id == QuestionAbility.ability_id)
+                .outerjoin(
+                    QuestionAnswer,
+                    and_(
+                        QuestionAnswer.question_id == Question.id,
+                        QuestionAnswer.progress_id == progress_id
+                    )
+                )
+                .where(
+                    Question.article_id == progress.article_id,
+                    Question.id.in_(question_ids)
+                )
+            )
+            questions = {}
+            ability_names = {}
+            answered = set()
+            for question, ability_name, answer_id in rows.all():
+                questions[question.id] = question
+                names = ability_names.setdefault(question.id, [])
+                if ability_name and ability_name not in names:
+                    names.append(ability_name)
+                if answer_id is not None:
+                    answered.add(question.id)
+
+            missing = [qid for qid in question_ids if qid not in questions]
+            if missing:
+                raise ValidationError(f"题目不存在或不属于该文章: {missing}")
+            if answered:
+                raise ValidationError(f"题目已提交答案: {sorted(answered)}")
+
+            records = []
+            results = []
+            for answer in answers:
+                question = questions[answer.question_id]
+                is_correct = ProgressService._check_answer(
+                    question.type.value,
+                    answer.user_answer,
+                    question.answer
+                )
+                records.append({
+                    "progress_id": progress_id,
+                    "question_id": question.id,
+                    "user_answer": answer.user_answer,
+                    "is_correct": is_correct
+                })
+                results.append(SubmitAnswerResponse(
+                    question_id=question.id,
+                    is_correct=is_correct,
+                    correct_answer=question.answer,
+                    explanation=question.explanation,
+                    ability_names=ability_names[question.id]
+                ))
+
+            await db.execute(insert(QuestionAnswer), records)
+            correct_count = sum(1 for result in results if result.is_correct)
+            progress.correct_count += correct_count
+            await user_stats_counter.increment(
+                db, user_id, total_questions=len(records), correct_count=correct_count
+            )
+            await db.commit()
+
+            return BatchSubmitAnswerResponse(
+                results=results,
+                correct_count=correct_count,
+                total_count=len(results)
+            )
+        except Exception:
+            await db.rollback()
+            raise
+
     @staticmethod
     def _check_answer(question_type: str, user_answer: str, correct_answer: str) -> bool:
         user_answer = user_answer.strip().upper()
@@ -157,8 +281,21 @@ class ProgressService:
         user_id: int,
         time_spent: int
     ) -> CompleteReadingResponse:
+        """记录阅读完成并立即返回得分
+
+        能力统计、打卡和勋章写入 outbox 由后台 worker 处理（COMPLETION_PIPELINE=outbox），
+        客户端随后轮询 /progress/{id}/result；inline 模式下提交后在本请求内立即处理。
+        两种模式下完成记录都单独提交，不再与 users 行锁放在同一个事务里。
+        """
         try:
-            progress = await db.get(UserProgress, progress_id)
+            # 锁住进度行，并发的重复完成请求会在这里排队，随后看到 completed_at
+            result = await db.execute(
+                select(UserProgress)
+                .where(UserProgress.id == progress_id)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            )
+            progress = result.scalar_one_or_none()
             if not progress or progress.user_id != user_id:
                 raise ValidationError("进度记录不存在")
 
@@ -173,28 +310,12 @@ class ProgressService:
             progress.time_spent = time_spent
             progress.completed_at = datetime.utcnow()
 
-            user = await db.get(User, user_id)
-            user.total_readings += 1
-
-            ability_scores = await ProgressService._update_user_abilities(db, progress)
-
-            is_checked_in, streak_days = await ProgressService._handle_checkin(db, user, progress)
-
-            new_badges = await ProgressService._check_badges(db, user)
-
+            event = completion_worker.enqueue(db, progress)
             await db.commit()
-
-            return CompleteReadingResponse(
-                progress_id=progress_id,
-                score=score,
-                correct_count=progress.correct_count,
-                total_count=progress.total_count,
-                time_spent=time_spent,
-                ability_scores=ability_scores,
-                is_checked_in=is_checked_in,
-                streak_days=streak_days,
-                new_badges=new_badges
-            )
+        except IntegrityError:
+            # 不支持行锁的数据库上，并发的重复完成由 completion_outbox.progress_id 唯一约束拦下
+            await db.rollback()
+            raise ValidationError("该阅读已完成")
         except (ValidationError, NotFoundError):
             await db.rollback()
             raise
@@ -202,98 +323,226 @@ class ProgressService:
             await db.rollback()
             raise
 
+        response = CompleteReadingResponse(
+            progress_id=progress_id,
+            score=score,
+            correct_count=progress.correct_count,
+            total_count=progress.total_count,
+            time_spent=time_spent,
+            processing=True
+        )
+
+        if settings.COMPLETION_PIPELINE != "inline":
+            completion_worker.notify(event.id)
+            return response
+
+        try:
+            result = await completion_worker.process(db, event.id)
+        except Exception as e:
+            logger.warning("阅读完成后处理失败，留待后台重试 (progress=%s): %s", progress_id, e)
+            return response
+        if result is None:
+            return response
+
+        completed = CompletionResultResponse(**result)
+        response.ability_scores = completed.ability_scores
+        response.is_checked_in = completed.is_checked_in
+        response.streak_days = completed.streak_days
+        response.new_badges = completed.new_badges
+        response.processing = False
+        return response
+
+    @staticmethod
+    async def process_completion(db: AsyncSession, event: CompletionOutbox) -> dict:
+        """outbox 任务处理函数：累计阅读数、更新能力统计、打卡、发放勋章
+
+        在 worker 的事务中执行，先锁定用户行，保证同一用户的并发任务依次累加。
+        """
+        progress = await db.get(UserProgress, event.progress_id)
+        user = await db.get(User, event.user_id, with_for_update=True, populate_existing=True)
+        user.total_readings += 1
+
+        # 打卡、答题指标都按阅读完成时间所在的业务日期归日，worker 延迟或重试跨过零点也不会记到第二天
+        completed_day = business_date(progress.completed_at)
+        ability_scores = await ProgressService._update_user_abilities(db, progress)
+        is_checked_in, streak_days = await ProgressService._handle_checkin(db, user, progress, completed_day)
+        new_badges = await ProgressService._check_badges(db, user)
+        await user_stats_counter.increment(
+            db, user.id, total_seconds=progress.time_spent or 0, badge_count=len(new_badges)
+        )
+
+        answered = await db.scalar(
+            select(func.count(QuestionAnswer.id)).where(QuestionAnswer.progress_id == progress.id)
+        )
+        await daily_rollup.increment(
+            db,
+            completed_day,
+            readings_completed=1,
+            answers=answered or 0,
+            correct_answers=progress.correct_count or 0,
+            checkins=int(is_checked_in)
+        )
+        await daily_rollup.increment_abilities(
+            db, completed_day, [(s.ability_id, s.correct_count, s.total_count) for s in ability_scores]
+        )
+
+        return CompletionResultResponse(
+            progress_id=progress.id,
+            status=OutboxStatusEnum.DONE.value,
+            ability_scores=ability_scores,
+            is_checked_in=is_checked_in,
+            streak_days=streak_days,
+            new_badges=new_badges
+        ).model_dump(mode="json")
+
+    @staticmethod
+    async def get_completion_result(
+        db: AsyncSession,
+        progress_id: int,
+        user_id: int
+    ) -> CompletionResultResponse:
+        """查询阅读完成后处理的结果（客户端在完成接口返回 processing 时轮询）"""
+        progress = await db.get(UserProgress, progress_id)
+        if not progress or progress.user_id != user_id:
+            raise NotFoundError("进度记录不存在")
+        if not progress.completed_at:
+            raise ValidationError("该阅读尚未完成")
+
+        event = await completion_worker.get_event(db, progress_id)
+        if event is None or event.status == OutboxStatusEnum.DONE and event.result is None:
+            # 上线 outbox 之前完成的阅读没有任务记录
+            return CompletionResultResponse(progress_id=progress_id, status=OutboxStatusEnum.DONE.value)
+        if event.status == OutboxStatusEnum.DONE:
+            return CompletionResultResponse(**event.result)
+        if event.status == OutboxStatusEnum.FAILED:
+            return CompletionResultResponse(progress_id=progress_id, status=OutboxStatusEnum.FAILED.value)
+        return CompletionResultResponse(progress_id=progress_id, status=OutboxStatusEnum.PENDING.value)
+
     @staticmethod
     async def _update_user_abilities(
         db: AsyncSession,
         progress: UserProgress
     ) -> List[AbilityScoreItem]:
+        """按本次答题结果累加用户能力统计
+
+        各能力的答对数、答题数用一条聚合查询算出，再用一条
+        INSERT ... ON CONFLICT (user_id, ability_id) DO UPDATE 批量写入。
+        """
         try:
-            answers_result = await db.execute(
-                select(QuestionAnswer)
-                .where(QuestionAnswer.progress_id == progress.id)
-                .options(
-                    selectinload(QuestionAnswer.question)
-                    .selectinload(Question.abilities)
-                    .selectinload(QuestionAbility.ability)
+            stats_result = await db.execute(
+                select(
+                    QuestionAbility.ability_id,
+                    AbilityDimension.name,
+                    func.sum(case((QuestionAnswer.is_correct.is_(True), 1), else_=0)),
+                    func.count(QuestionAnswer.id)
                 )
+                .select_from(QuestionAnswer)
+                .join(QuestionAbility, QuestionAbility.question_id == QuestionAnswer.question_id)
+                .join(AbilityDimension, AbilityDimension.id == QuestionAbility.ability_id)
+                .where(QuestionAnswer.progress_id == progress.id)
+                .group_by(QuestionAbility.ability_id, AbilityDimension.name)
+                .order_by(QuestionAbility.ability_id)
             )
-            answers = answers_result.scalars().all()
-
-            ability_stats = {}
-
-            for answer in answers:
-                for qa in answer.question.abilities:
-                    ability_id = qa.ability_id
-                    if ability_id not in ability_stats:
-                        ability_stats[ability_id] = {
-                            "correct": 0,
-                            "total": 0,
-                            "name": qa.ability.name
-                        }
-                    ability_stats[ability_id]["total"] += 1
-                    if answer.is_correct:
-                        ability_stats[ability_id]["correct"] += 1
-
-            result_scores = []
-            for ability_id, stats in ability_stats.items():
-                user_ability_result = await db.execute(
-                    select(UserAbility).where(
-                        UserAbility.user_id == progress.user_id,
-                        UserAbility.ability_id == ability_id
-                    )
-                )
-                user_ability = user_ability_result.scalar_one_or_none()
-
-                if not user_ability:
-                    user_ability = UserAbility(
-                        user_id=progress.user_id,
-                        ability_id=ability_id
-                    )
-                    db.add(user_ability)
-
-                if user_ability.correct_count is None:
-                    user_ability.correct_count = 0
-                if user_ability.total_count is None:
-                    user_ability.total_count = 0
-                user_ability.correct_count += stats["correct"]
-                user_ability.total_count += stats["total"]
-
-                if user_ability.total_count > 0:
-                    user_ability.score = user_ability.correct_count / user_ability.total_count * 100
+            stats = [
+                (ability_id, name, int(correct or 0), int(total))
+                for ability_id, name, correct, total in stats_result.all()
+            ]
+            if not stats:
+                return []
 
-                this_score = 0
-                if stats["total"] > 0:
-                    this_score = stats["correct"] / stats["total"] * 100
+            await ProgressService._upsert_user_abilities(db, progress.user_id, stats)
 
-                result_scores.append(AbilityScoreItem(
+            return [
+                AbilityScoreItem(
                     ability_id=ability_id,
-                    ability_name=stats["name"],
-                    correct_count=stats["correct"],
-                    total_count=stats["total"],
-                    score=round(this_score, 1)
-                ))
-
-            return result_scores
+                    ability_name=name,
+                    correct_count=correct,
+                    total_count=total,
+                    score=round(correct / total * 100, 1) if total > 0 else 0
+                )
+                for ability_id, name, correct, total in stats
+            ]
         except Exception as e:
             await db.rollback()
             raise
 
+    @staticmethod
+    async def _upsert_user_abilities(
+        db: AsyncSession,
+        user_id: int,
+        stats: List[Tuple[int, str, int, int]]
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "user_id": user_id,
+                "ability_id": ability_id,
+                "correct_count": correct,
+                "total_count": total,
+                "score": correct / total * 100 if total > 0 else 0,
+                "updated_at": now
+            }
+            for ability_id, _, correct, total in stats
+        ]
+
+        dialect = db.bind.dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            upsert = pg_insert if dialect == "postgresql" else sqlite_insert
+            stmt = upsert(UserAbility).values(rows)
+            correct_count = func.coalesce(UserAbility.correct_count, 0) + stmt.excluded.correct_count
+            total_count = func.coalesce(UserAbility.total_count, 0) + stmt.excluded.total_count
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[UserAbility.user_id, UserAbility.ability_id],
+                set_={
+                    "correct_count": correct_count,
+                    "total_count": total_count,
+                    "score": case(
+                        (total_count > 0, correct_count * 100.0 / total_count),
+                        else_=UserAbility.score
+                    ),
+                    "updated_at": stmt.excluded.updated_at
+                }
+            )
+            # RETURNING + populate_existing 让会话中已加载的 UserAbility 同步为新值
+            await db.execute(
+                stmt.returning(UserAbility),
+                execution_options={"populate_existing": True}
+            )
+            return
+
+        # 其他数据库：逐行读取后累加
+        for row in rows:
+            result = await db.execute(
+                select(UserAbility).where(
+                    UserAbility.user_id == user_id,
+                    UserAbility.ability_id == row["ability_id"]
+                )
+            )
+            user_ability = result.scalar_one_or_none()
+            if not user_ability:
+                user_ability = UserAbility(user_id=user_id, ability_id=row["ability_id"])
+                db.add(user_ability)
+            user_ability.correct_count = (user_ability.correct_count or 0) + row["correct_count"]
+            user_ability.total_count = (user_ability.total_count or 0) + row["total_count"]
+            if user_ability.total_count > 0:
+                user_ability.score = user_ability.correct_count / user_ability.total_count * 100
+
     @staticmethod
     async def _handle_checkin(
         db: AsyncSession,
         user: User,
-        progress: UserProgress
+        progress: UserProgress,
+        today: date
     ) -> Tuple[bool, int]:
+        """在 today（阅读完成的业务日期）打卡并更新连续天数，当天已打卡时不重复记录"""
         try:
-            today = date.today()
+            yesterday = today - timedelta(days=1)
 
-            existing = await db.execute(
-                select(CheckIn).where(
-                    CheckIn.user_id == user.id,
-                    CheckIn.check_date == today
-                )
+            # 今天和昨天的位图行一次取出（跨年时为两行）
+            calendars = await checkin_calendar.load(
+                db, user.id, {today.year, yesterday.year}, for_update=True, create=True
             )
-            if existing.scalar_one_or_none():
+            if checkin_calendar.has(calendars, today):
                 return False, user.streak_days
 
             checkin = CheckIn(
@@ -302,17 +551,9 @@ class ProgressService:
                 progress_id=progress.id
             )
             db.add(checkin)
+            checkin_calendar.mark(calendars, user.id, today, db)
 
-            yesterday = today - timedelta(days=1)
-
-            yesterday_result = await db.execute(
-                select(CheckIn).where(
-                    CheckIn.user_id == user.id,
-                    CheckIn.check_date == yesterday
-                )
-            )
-
-            if yesterday_result.scalar_one_or_none():
+            if checkin_calendar.has(calendars, yesterday):
                 user.streak_days += 1
             else:
                 user.streak_days = 1
@@ -331,84 +572,18 @@ class ProgressService:
         user: User
     ) -> List[BadgeUnlock]:
         try:
-            new_badges = []
-
-            badges_result = await db.execute(select(Badge))
-            all_badges = badges_result.scalars().all()
-
-            user_badges_result = await db.execute(
-                select(UserBadge.badge_id).where(UserBadge.user_id == user.id)
-            )
-            owned_badge_ids = set(user_badges_result.scalars().all())
-
-            for badge in all_badges:
-                if badge.id in owned_badge_ids:
-                    continue
-
-                earned = False
-
-                if badge.condition_type == BadgeConditionTypeEnum.FIRST_READING:
-                    earned = user.total_readings >= 1
-
-                elif badge.condition_type == BadgeConditionTypeEnum.STREAK_DAYS:
-                    earned = user.streak_days >= badge.condition_value
-
-                elif badge.condition_type == BadgeConditionTypeEnum.TOTAL_READINGS:
-                    earned = user.total_readings >= badge.condition_value
-
-                elif badge.condition_type == BadgeConditionTypeEnum.ABILITY_ACCURACY:
-                    ability_code = badge.condition_extra
-
-                    ability_result = await db.execute(
-                        select(AbilityDimension).where(AbilityDimension.code == ability_code)
-                    )
-                    ability = ability_result.scalar_one_or_none()
-
-                    if ability:
-                        user_ability_result = await db.execute(
-                            select(UserAbility).where(
-                                UserAbility.user_id == user.id,
-                                UserAbility.ability_id == ability.id
-                            )
-                        )
-                        user_ability = user_ability_result.scalar_one_or_none()
-
-                        if user_ability and user_ability.total_count >= 10:
-                            earned = user_ability.score >= badge.condition_value
+            await badge_rules.ensure_current(db)
+            abilities, owned_badge_ids = await badge_rules.load_snapshot(db, user.id)
 
-                elif badge.condition_type == BadgeConditionTypeEnum.ABILITY_COUNT:
-                    ability_code = badge.condition_extra
-
-                    ability_result = await db.execute(
-                        select(AbilityDimension).where(AbilityDimension.code == ability_code)
-                    )
-                    ability = ability_result.scalar_one_or_none()
-
-                    if ability:
-                        user_ability_result = await db.execute(
-                            select(UserAbility).where(
-                                UserAbility.user_id == user.id,
-                                UserAbility.ability_id == ability.id
-                            )
-                        )
-                        user_ability = user_ability_result.scalar_one_or_none()
-
-                        if user_ability:
-                            earned = user_ability.correct_count >= badge.condition_value
-
-                if earned:
-                    user_badge = UserBadge(
-                        user_id=user.id,
-                        badge_id=badge.id
-                    )
-                    db.add(user_badge)
-
-                    new_badges.append(BadgeUnlock(
-                        id=badge.id,
-                        name=badge.name,
-                        description=badge.description,
-                        icon_url=badge.icon_url
-                    ))
+            new_badges = []
+            for rule in badge_rules.evaluate(user, abilities, owned_badge_ids):
+                db.add(UserBadge(user_id=user.id, badge_id=rule.badge_id))
+                new_badges.append(BadgeUnlock(
+                    id=rule.badge_id,
+                    name=rule.name,
+                    description=rule.description,
+                    icon_url=rule.icon_url
+                ))
 
             return new_badges
         except Exception as e:
@@ -469,29 +644,45 @@ class ProgressService:
         db: AsyncSession,
         user_id: int,
         page: int = 1,
-        page_size: int = 20
-    ) -> Tuple[List[HistoryItem], int]:
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        with_total: bool = True
+    ) -> Tuple[List[HistoryItem], Optional[int]]:
+        """阅读历史，按 (completed_at, id) 倒序
+
+        传入 cursor 时从游标之后取一页（忽略 page），不再使用 OFFSET；
+        with_total=False 时跳过 count 查询，total 返回 None。
+        """
         try:
-            count_result = await db.execute(
-                select(func.count(UserProgress.id))
-                .where(
-                    UserProgress.user_id == user_id,
-                    UserProgress.completed_at.isnot(None)
+            conditions = [
+                UserProgress.user_id == user_id,
+                UserProgress.completed_at.isnot(None)
+            ]
+
+            total = None
+            if with_total:
+                count_result = await db.execute(
+                    select(func.count(UserProgress.id)).where(*conditions)
                 )
-            )
-            total = count_result.scalar() or 0
+                total = count_result.scalar() or 0
 
-            result = await db.execute(
+            query = (
                 select(UserProgress)
-                .where(
-                    UserProgress.user_id == user_id,
-                    UserProgress.completed_at.isnot(None)
-                )
+                .where(*conditions)
                 .options(selectinload(UserProgress.article))
-                .order_by(UserProgress.completed_at.desc())
-                .offset((page - 1) * page_size)
+                .order_by(UserProgress.completed_at.desc(), UserProgress.id.desc())
                 .limit(page_size)
             )
+            if cursor:
+                query = query.where(keyset_after(
+                    (UserProgress.completed_at, UserProgress.id),
+                    decode_cursor(cursor, datetime, int),
+                    descending=True
+                ))
+            else:
+                query = query.offset((page - 1) * page_size)
+
+            result = await db.execute(query)
             progresses = result.scalars().all()
 
             items = [
@@ -512,3 +703,4 @@ class ProgressService:
 
 
 progress_service = ProgressService()
+completion_worker.set_handler(progress_service.process_completion)
@@ -0,0 +1,162 @@
+import logging
+import random
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.article import DifficultyEnum
+from app.models.progress import UserProgress
+from app.models.tag import TagCategoryEnum
+from app.services.tag_index import tag_index
+from app.utils.cache import LRUCache, get_redis
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[Optional[str], Optional[DifficultyEnum]]
+
+
+class RecommendationPool:
+    """今日推荐的候选池
+
+    候选池是按 (年级标签, 难度) 划分的文章 ID 数组，由标签索引按需生成，
+    目录版本号变化（发布、归档、修改文章）后整体丢弃、下次使用时重建。
+    抽样时随机取下标，命中今日已读再重试，整体为 O(1)，不再把候选文章逐篇加载到内存。
+
+    用户今日已读的文章 ID 集合：配置了 Redis 时存 Redis 集合（多 worker 共享），
+    否则缓存在进程内；首次使用时按当天的时间范围从数据库加载。
+    """
+
+    SAMPLE_ATTEMPTS = 8
+    READS_KEY_PREFIX = f"{settings.APP_NAME}:reads"
+    # Redis 集合中标记"已从数据库加载"的占位成员
+    LOADED_MARKER = "-"
+
+    def __init__(self):
+        self._pools: Dict[PoolKey, List[int]] = {}
+        self._generation: Optional[int] = None
+        self._reads = LRUCache(max_size=settings.RECOMMENDATION_READS_CACHE_SIZE, ttl=86400)
+
+    def clear(self) -> None:
+        self._pools.clear()
+        self._generation = None
+        self._reads.clear()
+
+    async def get_pool(
+        self,
+        db: AsyncSession,
+        grade: Optional[str] = None,
+        difficulty: Optional[DifficultyEnum] = None
+    ) -> List[int]:
+        """返回满足条件的已发布文章 ID 数组（调用方不应修改）"""
+        await tag_index.ensure_current(db)
+        if self._generation != tag_index.generation:
+            self._pools.clear()
+            self._generation = tag_index.generation
+
+        key = (grade, difficulty)
+        pool = self._pools.get(key)
+        if pool is None:
+            tags = [(TagCategoryEnum.GRADE, grade)] if grade else []
+            pool = tag_index.lookup(tags, difficulty)
+            self._pools[key] = pool
+        return pool
+
+    @staticmethod
+    def _today_range(day: date) -> Tuple[datetime, datetime]:
+        start = datetime.combine(day, time.min)
+        return start, start + timedelta(days=1)
+
+    def _reads_key(self, user_id: int, day: date) -> str:
+        return f"{self.READS_KEY_PREFIX}:{user_id}:{day.isoformat()}"
+
+    async def _load_reads(self, db: AsyncSession, user_id: int, day: date) -> Set[int]:
+        start, end = self._today_range(day)
+        result = await db.execute(
+            select(UserProgress.article_id)
+            .where(
+                UserProgress.user_id == user_id,
+                UserProgress.created_at >= start,
+                UserProgress.created_at < end
+            )
+        )
+        return set(result.scalars().all())
+
+    async def get_reads_today(self, db: AsyncSession, user_id: int) -> Set[int]:
+        """用户今天已开始阅读的文章 ID"""
+        day = date.today()
+        key = self._reads_key(user_id, day)
+
+        redis = get_redis()
+        if redis is not None:
+            try:
+                members = await redis.smembers(key)
+                if self.LOADED_MARKER in members:
+                    return {int(m) for m in members if m != self.LOADED_MARKER}
+            except Exception as e:
+                logger.warning("Redis 读取今日已读失败: %s", e)
+                redis = None
+
+        reads = self._reads.get(key) if redis is None else None
+        if reads is not None:
+            return reads
+
+        reads = await self._load_reads(db, user_id, day)
+        if redis is not None:
+            try:
+                await redis.sadd(key, self.LOADED_MARKER, *reads)
+                await redis.expire(key, 2 * 86400)
+            except Exception as e:
+                logger.warning("Redis 写入今日已读失败: %s", e)
+        else:
+            self._reads.set(key, reads)
+        return reads
+
+    async def mark_read(self, user_id: int, article_id: int) -> None:
+        """开始阅读后调用；集合尚未加载时不处理，下次使用时从数据库加载"""
+        key = self._reads_key(user_id, date.today())
+        redis = get_redis()
+        if redis is not None:
+            try:
+                if await redis.sismember(key, self.LOADED_MARKER):
+                    await redis.sadd(key, article_id)
+                return
+            except Exception as e:
+                logger.warning("Redis 写入今日已读失败: %s", e)
+        reads = self._reads.get(key)
+        if reads is not None:
+            reads.add(article_id)
+
+    def sample(self, pool: List[int], exclude: Set[int]) -> Optional[int]:
+        """从候选池中随机取一个不在 exclude 中的 ID"""
+        if not pool:
+            return None
+        for _ in range(self.SAMPLE_ATTEMPTS):
+            article_id = pool[random.randrange(len(pool))]
+            if article_id not in exclude:
+                return article_id
+        # 候选池大部分已读时才退化为线性扫描
+        remaining = [article_id for article_id in pool if article_id not in exclude]
+        return random.choice(remaining) if remaining else None
+
+    async def pick_today(
+        self, db: AsyncSession, user_id: int, grade: Optional[str]
+    ) -> Optional[int]:
+        """今日推荐：有年级的用户从年级池中选，否则从简单难度池中选，排除今日已读
+
+        候选全部读过时从全部已发布文章中随机选一篇。
+        """
+        if grade:
+            pool = await self.get_pool(db, grade=grade)
+        else:
+            pool = await self.get_pool(db, difficulty=DifficultyEnum.EASY)
+
+        exclude = await self.get_reads_today(db, user_id) if pool else set()
+        article_id = self.sample(pool, exclude)
+        if article_id is None:
+            article_id = self.sample(await self.get_pool(db), set())
+        return article_id
+
+
+recommendation_pool = RecommendationPool()
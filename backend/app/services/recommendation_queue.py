@@ -0,0 +1,151 @@
+import random
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Set
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete
+
+from app.models.article import DifficultyEnum
+from app.models.progress import UserProgress
+from app.models.recommendation import UserRecommendation, RecommendationKindEnum
+from app.models.user import User
+from app.models.user_ability import UserAbility
+from app.services.ability_matrix import ability_matrix
+from app.services.recommendation_pool import recommendation_pool
+
+
+class RecommendationQueue:
+    """预计算的推荐队列
+
+    每晚的批处理任务为活跃用户生成接下来若干篇今日推荐和补弱项推荐，
+    接口先从队列头部取，队列为空或已过期时再实时计算。
+    """
+
+    @staticmethod
+    async def pop(
+        db: AsyncSession,
+        user_id: int,
+        kind: RecommendationKindEnum,
+        exclude: Set[int] = frozenset()
+    ) -> Optional[int]:
+        """取出队列头部第一篇不在 exclude 中的文章 ID，跳过的条目一并丢弃
+
+        读改写期间锁住队列行，并发请求依次出队，不会拿到同一篇或丢失出队。
+        """
+        result = await db.execute(
+            select(UserRecommendation)
+            .where(
+                UserRecommendation.user_id == user_id,
+                UserRecommendation.kind == kind,
+                UserRecommendation.for_date == date.today()
+            )
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        queue = result.scalar_one_or_none()
+        if queue is None or not queue.article_ids:
+            await db.commit()
+            return None
+
+        remaining = list(queue.article_ids)
+        article_id = None
+        while remaining:
+            candidate = remaining.pop(0)
+            if candidate not in exclude:
+                article_id = candidate
+                break
+        queue.article_ids = remaining
+        await db.commit()
+        return article_id
+
+    @staticmethod
+    async def precompute(
+        db: AsyncSession,
+        user_ids: Sequence[int],
+        for_date: date,
+        size: int = 10
+    ) -> int:
+        """为一批用户生成推荐队列并覆盖旧队列，返回写入的队列数
+
+        每批只做三次批量查询（用户、能力得分、已读文章），其余在内存中计算。
+        """
+        if not user_ids:
+            return 0
+
+        users_result = await db.execute(select(User.id, User.grade).where(User.id.in_(user_ids)))
+        grades = {
+            user_id: f"{grade.value}年级" if grade else None
+            for user_id, grade in users_result.all()
+        }
+
+        abilities_result = await db.execute(
+            select(UserAbility.user_id, UserAbility.ability_id, UserAbility.score)
+            .where(UserAbility.user_id.in_(user_ids))
+        )
+        ability_scores: Dict[int, Dict[int, float]] = {}
+        for user_id, ability_id, score in abilities_result.all():
+            ability_scores.setdefault(user_id, {})[ability_id] = score
+
+        reads_result = await db.execute(
+            select(UserProgress.user_id, UserProgress.article_id)
+            .where(UserProgress.user_id.in_(user_ids))
+            .distinct()
+        )
+        reads: Dict[int, Set[int]] = {}
+        for user_id, article_id in reads_result.all():
+            reads.setdefault(user_id, set()).add(article_id)
+
+        await ability_matrix.ensure_current(db)
+
+        queues = []
+        for user_id, grade in grades.items():
+            user_reads = reads.get(user_id, set())
+            if grade:
+                pool = await recommendation_pool.get_pool(db, grade=grade)
+            else:
+                pool = await recommendation_pool.get_pool(db, difficulty=DifficultyEnum.EASY)
+            today_ids = RecommendationQueue._sample(pool, user_reads, size)
+            if today_ids:
+                queues.append(UserRecommendation(
+                    user_id=user_id,
+                    kind=RecommendationKindEnum.TODAY,
+                    for_date=for_date,
+                    article_ids=today_ids
+                ))
+
+            scores = ability_scores.get(user_id)
+            weak_ids = ability_matrix.top_articles(scores, user_reads, size) if scores else []
+            if weak_ids:
+                queues.append(UserRecommendation(
+                    user_id=user_id,
+                    kind=RecommendationKindEnum.WEAK_POINT,
+                    for_date=for_date,
+                    article_ids=weak_ids
+                ))
+
+        await db.execute(
+            delete(UserRecommendation).where(UserRecommendation.user_id.in_(list(grades)))
+        )
+        db.add_all(queues)
+        await db.commit()
+        return len(queues)
+
+    @staticmethod
+    def _sample(pool: List[int], reads: Set[int], size: int) -> List[int]:
+        """不放回抽样，未读过的文章排在前面"""
+        unread = [article_id for article_id in pool if article_id not in reads]
+        picked = random.sample(unread, min(size, len(unread)))
+        if len(picked) < size:
+            read = [article_id for article_id in pool if article_id in reads]
+            picked += random.sample(read, min(size - len(picked), len(read)))
+        return picked
+
+    @staticmethod
+    async def purge_before(db: AsyncSession, for_date: date) -> None:
+        """删除早于 for_date 的过期队列（不再活跃的用户）"""
+        await db.execute(
+            delete(UserRecommendation).where(UserRecommendation.for_date < for_date)
+        )
+        await db.commit()
+
+
+recommendation_queue = RecommendationQueue()
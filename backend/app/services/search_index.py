@@ -0,0 +1,262 @@
+import logging
+import math
+import re
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, or_, text
+
+from app.config import settings
+from app.models.article import Article, ArticleStatusEnum
+from app.services.catalogue_cache import catalogue_cache
+
+logger = logging.getLogger(__name__)
+
+# 中文（含扩展 A 区）按字切分，字母数字按词切分
+_TOKEN_PATTERN = re.compile(r"[㐀-䶿一-鿿]+|[a-z0-9]+")
+_CJK_PATTERN = re.compile(r"[㐀-䶿一-鿿]")
+
+# 字段权重：标题 > 来源书籍 > 正文
+FIELD_WEIGHTS = {"title": 3.0, "source_book": 2.0, "content": 1.0}
+
+
+def _runs(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return _TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", value).lower())
+
+
+def index_terms(value: Optional[str]) -> List[str]:
+    """建索引用的词项：中文单字 + 相邻二字，英文数字整词"""
+    terms = []
+    for run in _runs(value):
+        if _CJK_PATTERN.match(run):
+            terms.extend(run)
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            terms.append(run)
+    return terms
+
+
+def query_terms(keyword: Optional[str]) -> List[str]:
+    """查询用的词项：中文取相邻二字（单字查询退化为单字），去重保序"""
+    terms = []
+    for run in _runs(keyword):
+        if _CJK_PATTERN.match(run) and len(run) > 1:
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            terms.append(run)
+    return list(dict.fromkeys(terms))
+
+
+class SearchIndex:
+    """已发布文章的二字倒排索引（进程内），BM25 打分
+
+    标题、来源书籍、正文三个字段按权重合并词频（BM25F 的简化形式）。
+    查询的所有二字词项都命中才算匹配，近似于短语包含，
+    结果按相关度降序、同分按 ID 升序。
+
+    与 TagIndex 一样绑定目录版本号：本进程内的变更增量更新，
+    其他进程改变版本号后整体重建。
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._doc_len: Dict[int, float] = {}
+        self._doc_terms: Dict[int, Set[str]] = {}
+        self._total_len = 0.0
+        self._generation: Optional[int] = None
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._doc_len.clear()
+        self._doc_terms.clear()
+        self._total_len = 0.0
+        self._generation = None
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    async def ensure_current(self, db: AsyncSession) -> None:
+        generation = await catalogue_cache.generation()
+        if self._generation != generation:
+            await self.rebuild(db, generation)
+
+    async def rebuild(self, db: AsyncSession, generation: int) -> None:
+        """从数据库全量重建索引"""
+        result = await db.execute(
+            select(Article.id, Article.title, Article.source_book, Article.content)
+            .where(Article.status == ArticleStatusEnum.PUBLISHED)
+        )
+        self.clear()
+        for row in result.all():
+            self._add_article(row.id, row.title, row.source_book, row.content)
+        self._generation = generation
+
+    async def on_catalogue_change(
+        self, db: AsyncSession, article_id: Optional[int], generation: int
+    ) -> None:
+        """目录变更回调：增量更新单篇文章
+
+        只有索引正好停留在上一个版本时才增量更新，否则留待下次读取时重建。
+        """
+        expected = self._generation
+        self._generation = None
+        if expected is None or expected != generation - 1 or article_id is None:
+            return
+
+        result = await db.execute(
+            select(Article.status, Article.title, Article.source_book, Article.content)
+            .where(Article.id == article_id)
+        )
+        row = result.first()
+
+        self._remove_article(article_id)
+        if row is not None and row.status == ArticleStatusEnum.PUBLISHED:
+            self._add_article(article_id, row.title, row.source_book, row.content)
+        self._generation = generation
+
+    def _add_article(
+        self, article_id: int, title: str, source_book: Optional[str], content: str
+    ) -> None:
+        weighted: Dict[str, float] = {}
+        length = 0.0
+        for field, value in (("title", title), ("source_book", source_book), ("content", content)):
+            weight = FIELD_WEIGHTS[field]
+            terms = index_terms(value)
+            length += weight * len(terms)
+            for term in terms:
+                weighted[term] = weighted.get(term, 0.0) + weight
+
+        for term, tf in weighted.items():
+            self._postings.setdefault(term, {})[article_id] = tf
+        self._doc_terms[article_id] = set(weighted)
+        self._doc_len[article_id] = length
+        self._total_len += length
+
+    def _remove_article(self, article_id: int) -> None:
+        length = self._doc_len.pop(article_id, None)
+        if length is None:
+            return
+        self._total_len -= length
+        for term in self._doc_terms.pop(article_id, set()):
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(article_id, None)
+                if not posting:
+                    del self._postings[term]
+
+    def search(
+        self, keyword: str, candidate_ids: Optional[Sequence[int]] = None
+    ) -> List[int]:
+        """返回匹配的文章 ID，按 BM25 相关度降序
+
+        candidate_ids 不为 None 时只在其中查找（与标签筛选结果取交集）。
+        """
+        terms = query_terms(keyword)
+        if not terms or not self._doc_len:
+            return []
+
+        postings = [self._postings.get(term) for term in terms]
+        if any(not posting for posting in postings):
+            return []
+
+        postings.sort(key=len)
+        matched = set(postings[0])
+        if candidate_ids is not None:
+            matched &= set(candidate_ids)
+        for posting in postings[1:]:
+            if not matched:
+                return []
+            matched &= posting.keys()
+
+        total_docs = len(self._doc_len)
+        avg_len = self._total_len / total_docs or 1.0
+        scores: List[Tuple[float, int]] = []
+        for article_id in matched:
+            norm = self.K1 * (1 - self.B + self.B * self._doc_len[article_id] / avg_len)
+            score = 0.0
+            for posting in postings:
+                idf = math.log(1 + (total_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                tf = posting[article_id]
+                score += idf * tf * (self.K1 + 1) / (tf + norm)
+            scores.append((-score, article_id))
+
+        scores.sort()
+        return [article_id for _, article_id in scores]
+
+
+class ArticleSearch:
+    """文章关键词搜索入口，按配置和数据库选择后端
+
+    SEARCH_BACKEND=auto 时，PostgreSQL 且已安装 pg_trgm 扩展则在数据库中
+    用 GIN 三字索引匹配并按 word_similarity 排序，否则使用进程内的 SearchIndex。
+    """
+
+    def __init__(self, index: SearchIndex):
+        self._index = index
+        self._pg_trgm: Optional[bool] = None
+
+    async def _use_postgres(self, db: AsyncSession) -> bool:
+        backend = settings.SEARCH_BACKEND
+        if backend == "memory" or db.bind.dialect.name != "postgresql":
+            return False
+        if self._pg_trgm is None:
+            result = await db.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            )
+            self._pg_trgm = result.first() is not None
+            if not self._pg_trgm and backend == "postgres":
+                logger.warning("未安装 pg_trgm 扩展，文章搜索回退到内存索引")
+        return self._pg_trgm
+
+    async def search(
+        self,
+        db: AsyncSession,
+        keyword: str,
+        candidate_ids: Optional[Sequence[int]] = None
+    ) -> List[int]:
+        """返回匹配关键词的已发布文章 ID，按相关度降序"""
+        if await self._use_postgres(db):
+            return await self._search_postgres(db, keyword, candidate_ids)
+        await self._index.ensure_current(db)
+        return self._index.search(keyword, candidate_ids)
+
+    @staticmethod
+    async def _search_postgres(
+        db: AsyncSession,
+        keyword: str,
+        candidate_ids: Optional[Sequence[int]] = None
+    ) -> List[int]:
+        keyword = keyword.strip()
+        if not keyword:
+            return []
+        pattern = f"%{keyword}%"
+        score = sum(
+            weight * func.word_similarity(keyword, func.coalesce(getattr(Article, field), ""))
+            for field, weight in FIELD_WEIGHTS.items()
+        )
+        query = (
+            select(Article.id)
+            .where(
+                Article.status == ArticleStatusEnum.PUBLISHED,
+                or_(
+                    Article.title.ilike(pattern),
+                    Article.source_book.ilike(pattern),
+                    Article.content.ilike(pattern)
+                )
+            )
+            .order_by(score.desc(), Article.id)
+        )
+        if candidate_ids is not None:
+            query = query.where(Article.id.in_(candidate_ids))
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
+
+search_index = SearchIndex()
+catalogue_cache.add_listener(search_index.on_catalogue_change)
+article_search = ArticleSearch(search_index)
@@ -0,0 +1,141 @@
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.models.article import Article, ArticleTag, ArticleStatusEnum, DifficultyEnum
+from app.models.tag import Tag, TagCategoryEnum
+from app.services.catalogue_cache import catalogue_cache
+
+TagKey = Tuple[TagCategoryEnum, str]
+
+
+class TagIndex:
+    """已发布文章的标签倒排索引（进程内）
+
+    (标签分类, 标签名) -> 已发布文章 ID 集合，另按难度建索引。
+    多个筛选条件取交集即可得到结果 ID，数据库只需加载当页文章。
+
+    索引与目录版本号绑定：本进程内的管理端变更通过目录变更回调增量更新；
+    发现版本号被其他进程改变时整体重建。
+    """
+
+    def __init__(self):
+        self._postings: Dict[TagKey, Set[int]] = {}
+        self._difficulty: Dict[DifficultyEnum, Set[int]] = {}
+        self._published: Set[int] = set()
+        self._article_keys: Dict[int, Set[TagKey]] = {}
+        self._article_difficulty: Dict[int, DifficultyEnum] = {}
+        self._generation: Optional[int] = None
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._difficulty.clear()
+        self._published.clear()
+        self._article_keys.clear()
+        self._article_difficulty.clear()
+        self._generation = None
+
+    @property
+    def generation(self) -> Optional[int]:
+        """索引当前对应的目录版本号（未建立时为 None）"""
+        return self._generation
+
+    async def ensure_current(self, db: AsyncSession) -> None:
+        generation = await catalogue_cache.generation()
+        if self._generation != generation:
+            await self.rebuild(db, generation)
+
+    async def rebuild(self, db: AsyncSession, generation: int) -> None:
+        """从数据库全量重建索引"""
+        articles_result = await db.execute(
+            select(Article.id, Article.article_difficulty)
+            .where(Article.status == ArticleStatusEnum.PUBLISHED)
+        )
+        tags_result = await db.execute(
+            select(ArticleTag.article_id, Tag.category, Tag.name)
+            .join(Tag, Tag.id == ArticleTag.tag_id)
+            .join(Article, Article.id == ArticleTag.article_id)
+            .where(Article.status == ArticleStatusEnum.PUBLISHED)
+        )
+
+        self.clear()
+        for article_id, difficulty in articles_result.all():
+            self._add_article(article_id, difficulty, set())
+        for article_id, category, name in tags_result.all():
+            key = (category, name)
+            self._article_keys[article_id].add(key)
+            self._postings.setdefault(key, set()).add(article_id)
+        self._generation = generation
+
+    async def on_catalogue_change(
+        self, db: AsyncSession, article_id: Optional[int], generation: int
+    ) -> None:
+        """目录变更回调：增量更新单篇文章
+
+        只有索引正好停留在上一个版本时才增量更新，否则留待下次读取时重建。
+        """
+        expected = self._generation
+        self._generation = None
+        if expected is None or expected != generation - 1 or article_id is None:
+            return
+
+        article_result = await db.execute(
+            select(Article.status, Article.article_difficulty).where(Article.id == article_id)
+        )
+        row = article_result.first()
+
+        self._remove_article(article_id)
+        if row is not None and row.status == ArticleStatusEnum.PUBLISHED:
+            tags_result = await db.execute(
+                select(Tag.category, Tag.name)
+                .join(ArticleTag, ArticleTag.tag_id == Tag.id)
+                .where(ArticleTag.article_id == article_id)
+            )
+            keys = {(category, name) for category, name in tags_result.all()}
+            self._add_article(article_id, row.article_difficulty, keys)
+        self._generation = generation
+
+    def _add_article(self, article_id: int, difficulty: DifficultyEnum, keys: Set[TagKey]) -> None:
+        self._published.add(article_id)
+        self._article_keys[article_id] = keys
+        for key in keys:
+            self._postings.setdefault(key, set()).add(article_id)
+        if difficulty is not None:
+            self._article_difficulty[article_id] = difficulty
+            self._difficulty.setdefault(difficulty, set()).add(article_id)
+
+    def _remove_article(self, article_id: int) -> None:
+        self._published.discard(article_id)
+        for key in self._article_keys.pop(article_id, set()):
+            posting = self._postings.get(key)
+            if posting is not None:
+                posting.discard(article_id)
+                if not posting:
+                    del self._postings[key]
+        difficulty = self._article_difficulty.pop(article_id, None)
+        if difficulty is not None:
+            self._difficulty[difficulty].discard(article_id)
+
+    def lookup(
+        self,
+        tags: List[TagKey],
+        difficulty: Optional[DifficultyEnum] = None
+    ) -> List[int]:
+        """返回同时满足所有条件的已发布文章 ID（升序）"""
+        sets = [self._postings.get(key, set()) for key in tags]
+        if difficulty is not None:
+            sets.append(self._difficulty.get(difficulty, set()))
+        if not sets:
+            return sorted(self._published)
+
+        sets.sort(key=len)
+        result = set(sets[0])
+        for posting in sets[1:]:
+            if not result:
+                break
+            result &= posting
+        return sorted(result)
+
+
+tag_index = TagIndex()
+catalogue_cache.add_listener(tag_index.on_catalogue_change)
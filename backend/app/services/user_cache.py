@@ -0,0 +1,79 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import settings
+from app.models.user import User, GradeEnum
+from app.utils.cache import TieredCache
+
+
+class UserCache:
+    """已登录用户缓存（按用户 ID）
+
+    认证依赖每个请求都要按 ID 查询用户，这里缓存用户行的快照，
+    命中时不再访问数据库。返回的是与会话无关的只读快照，不放入会话的 identity map，
+    同一请求中 db.get(User, id) 等仍从数据库读取；写路径应自行加载用户行，不要修改快照。
+    用户数据变更后需调用 invalidate。
+    """
+
+    def __init__(self):
+        self._cache = TieredCache(
+            namespace="user",
+            max_size=settings.USER_CACHE_MAX_SIZE,
+            ttl=settings.USER_CACHE_TTL_SECONDS,
+        )
+
+    @staticmethod
+    def _to_snapshot(user: User) -> dict:
+        return {
+            "id": user.id,
+            "openid": user.openid,
+            "nickname": user.nickname,
+            "avatar_url": user.avatar_url,
+            "grade": user.grade.value if user.grade else None,
+            "total_readings": user.total_readings,
+            "streak_days": user.streak_days,
+            "max_streak_days": user.max_streak_days,
+            "created_at": user.created_at.isoformat() if user.created_at else None,
+            "updated_at": user.updated_at.isoformat() if user.updated_at else None,
+        }
+
+    @staticmethod
+    def _from_snapshot(data: dict) -> User:
+        user = User(
+            id=data["id"],
+            openid=data["openid"],
+            nickname=data["nickname"],
+            avatar_url=data["avatar_url"],
+            grade=GradeEnum(data["grade"]) if data["grade"] is not None else None,
+            total_readings=data["total_readings"],
+            streak_days=data["streak_days"],
+            max_streak_days=data["max_streak_days"],
+            created_at=datetime.fromisoformat(data["created_at"]) if data["created_at"] else None,
+            updated_at=datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else None,
+        )
+        make_transient_to_detached(user)
+        return user
+
+    async def get_user(self, db: AsyncSession, user_id: int) -> Optional[User]:
+        """获取用户的只读快照，优先读缓存，未命中时查库并回填"""
+        snapshot = await self._cache.get(user_id)
+        if snapshot is None:
+            result = await db.execute(select(User).where(User.id == user_id))
+            user = result.scalar_one_or_none()
+            if not user:
+                return None
+            snapshot = self._to_snapshot(user)
+            await self._cache.set(user_id, snapshot)
+        return self._from_snapshot(snapshot)
+
+    async def invalidate(self, user_id: int) -> None:
+        await self._cache.delete(user_id)
+
+    def clear(self) -> None:
+        self._cache.clear_local()
+
+
+user_cache = UserCache()
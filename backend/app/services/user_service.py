@@ -1,20 +1,24 @@
-from datetime import date, timedelta
+from datetime import date
 from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, Integer, cast
+from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from app.models.user import User, GradeEnum as DBGradeEnum
-from app.models.progress import UserProgress, QuestionAnswer
-from app.models.checkin import CheckIn
 from app.models.badge import Badge, UserBadge
 from app.models.user_ability import UserAbility
 from app.models.ability import AbilityDimension
+from app.services.user_cache import user_cache
+from app.services.user_stats import user_stats_counter
+from app.services.checkin_calendar import checkin_calendar
+from app.utils.exceptions import AuthenticationError
 from app.schemas.user import (
     UserUpdate, 
     UserStatsResponse, 
     AbilityScore,
     CheckInRecord,
+    CheckInYearSummary,
+    CheckInHistoryResponse,
     BadgeInfo
 )
 
@@ -23,7 +27,11 @@ class UserService:
     
     @staticmethod
     async def update_user(db: AsyncSession, user: User, data: UserUpdate) -> User:
+        """更新用户资料；传入的可能是缓存快照，这里重新加载用户行再修改"""
         try:
+            user = await db.get(User, user.id)
+            if not user:
+                raise AuthenticationError("请先登录")
             update_data = data.model_dump(exclude_unset=True)
             for field, value in update_data.items():
                 if field == "grade" and value is not None:
@@ -40,6 +48,7 @@ class UserService:
                     setattr(user, field, value)
             
             await db.commit()
+            await user_cache.invalidate(user.id)
             await db.refresh(user)
             return user
         except Exception as e:
@@ -52,33 +61,15 @@ class UserService:
     async def get_user_stats(db: AsyncSession, user_id: int) -> UserStatsResponse:
         try:
             result = await db.execute(select(User).where(User.id == user_id))
-            user = result.scalar_one()
+            user = result.scalar_one_or_none()
+            if not user:
+                raise AuthenticationError("请先登录")
             
-            answer_stats = await db.execute(
-                select(
-                    func.count(QuestionAnswer.id).label("total"),
-                    func.sum(cast(QuestionAnswer.is_correct, Integer)).label("correct")
-                )
-                .join(UserProgress)
-                .where(UserProgress.user_id == user_id)
-            )
-            stats = answer_stats.first()
-            total_questions = stats.total or 0
-            correct_count = stats.correct or 0
-            correct_rate = (correct_count / total_questions * 100) if total_questions > 0 else 0
-            
-            time_result = await db.execute(
-                select(func.sum(UserProgress.time_spent))
-                .where(UserProgress.user_id == user_id)
-            )
-            total_seconds = time_result.scalar() or 0
-            total_time = total_seconds // 60
-            
-            badge_result = await db.execute(
-                select(func.count(UserBadge.id))
-                .where(UserBadge.user_id == user_id)
-            )
-            total_badges = badge_result.scalar() or 0
+            stats = await user_stats_counter.get(db, user_id)
+            total_questions = stats.total_questions
+            correct_rate = (stats.correct_count / total_questions * 100) if total_questions > 0 else 0
+            total_time = stats.total_seconds // 60
+            total_badges = stats.badge_count
             
             return UserStatsResponse(
                 total_readings=user.total_readings,
@@ -133,31 +124,17 @@ class UserService:
     ) -> Tuple[int, List[CheckInRecord]]:
         try:
             user_result = await db.execute(select(User).where(User.id == user_id))
-            user = user_result.scalar_one()
-            
-            start_date = date(year, month, 1)
-            if month == 12:
-                end_date = date(year + 1, 1, 1)
-            else:
-                end_date = date(year, month + 1, 1)
-            
-            result = await db.execute(
-                select(CheckIn)
-                .where(
-                    CheckIn.user_id == user_id,
-                    CheckIn.check_date >= start_date,
-                    CheckIn.check_date < end_date
-                )
-                .order_by(CheckIn.check_date)
-            )
-            checkins = result.scalars().all()
+            user = user_result.scalar_one_or_none()
+            if not user:
+                raise AuthenticationError("请先登录")
             
+            calendars = await checkin_calendar.load(db, user_id, [year])
             records = [
                 CheckInRecord(
-                    date=ci.check_date,
+                    date=day,
                     article_title=None
                 )
-                for ci in checkins
+                for day in checkin_calendar.month_days(calendars, year, month)
             ]
             
             return user.streak_days, records
@@ -165,6 +142,22 @@ class UserService:
             await db.rollback()
             raise
     
+    @staticmethod
+    async def get_checkin_history(db: AsyncSession, user_id: int, today: date) -> CheckInHistoryResponse:
+        """历年打卡汇总：按位图重新计算当前连续天数和最长连续天数"""
+        calendars = await checkin_calendar.load(db, user_id)
+        years = [
+            CheckInYearSummary(year=year, days=days)
+            for year, days in checkin_calendar.yearly_counts(calendars)
+            if days
+        ]
+        return CheckInHistoryResponse(
+            current_streak=checkin_calendar.current_streak(calendars, today),
+            max_streak=checkin_calendar.max_streak(calendars),
+            total_days=sum(item.days for item in years),
+            years=years
+        )
+    
     @staticmethod
     async def get_badges(db: AsyncSession, user_id: int) -> Tuple[int, int, List[BadgeInfo]]:
         try:
@@ -0,0 +1,140 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, Integer, cast
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models.badge import UserBadge
+from app.models.progress import UserProgress, QuestionAnswer
+from app.models.user_stats import UserStats
+
+COUNTER_FIELDS = ("total_questions", "correct_count", "total_seconds", "badge_count")
+
+
+class UserStatsCounter:
+    """用户学习统计的增量维护
+
+    写路径在业务事务内对 user_stats 执行一条 UPDATE ... SET col = col + delta；
+    用户还没有统计行时（新用户或上线前的老用户）改为从明细表重建该行，
+    重建时会先 flush，当前事务中尚未提交的明细也会被计入，不会重复累加。
+    """
+
+    async def increment(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        total_questions: int = 0,
+        correct_count: int = 0,
+        total_seconds: int = 0,
+        badge_count: int = 0
+    ) -> None:
+        deltas = {
+            "total_questions": total_questions,
+            "correct_count": correct_count,
+            "total_seconds": total_seconds,
+            "badge_count": badge_count,
+        }
+        values = {
+            field: getattr(UserStats, field) + delta
+            for field, delta in deltas.items() if delta
+        }
+        if not values:
+            return
+
+        result = await db.execute(
+            update(UserStats)
+            .where(UserStats.user_id == user_id)
+            .values(**values, updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            await db.flush()
+            await self.rebuild(db, [user_id])
+
+    async def get(self, db: AsyncSession, user_id: int) -> UserStats:
+        """读取统计行，不存在时从明细重建并提交"""
+        result = await db.execute(
+            select(UserStats).where(UserStats.user_id == user_id)
+        )
+        stats = result.scalar_one_or_none()
+        if stats is None:
+            rows = await self.rebuild(db, [user_id])
+            await db.commit()
+            stats = UserStats(user_id=user_id, **rows[user_id])
+        return stats
+
+    async def rebuild(self, db: AsyncSession, user_ids: Sequence[int]) -> Dict[int, dict]:
+        """从明细表重新计算一批用户的统计并覆盖写入（不提交），返回写入的值"""
+        if not user_ids:
+            return {}
+        rows: Dict[int, dict] = {
+            user_id: dict.fromkeys(COUNTER_FIELDS, 0) for user_id in user_ids
+        }
+
+        answers = await db.execute(
+            select(
+                UserProgress.user_id,
+                func.count(QuestionAnswer.id),
+                func.sum(cast(QuestionAnswer.is_correct, Integer))
+            )
+            .join(QuestionAnswer, QuestionAnswer.progress_id == UserProgress.id)
+            .where(UserProgress.user_id.in_(user_ids))
+            .group_by(UserProgress.user_id)
+        )
+        for user_id, total, correct in answers.all():
+            rows[user_id]["total_questions"] = total or 0
+            rows[user_id]["correct_count"] = correct or 0
+
+        seconds = await db.execute(
+            select(UserProgress.user_id, func.sum(UserProgress.time_spent))
+            .where(UserProgress.user_id.in_(user_ids))
+            .group_by(UserProgress.user_id)
+        )
+        for user_id, total_seconds in seconds.all():
+            rows[user_id]["total_seconds"] = total_seconds or 0
+
+        badges = await db.execute(
+            select(UserBadge.user_id, func.count(UserBadge.id))
+            .where(UserBadge.user_id.in_(user_ids))
+            .group_by(UserBadge.user_id)
+        )
+        for user_id, badge_count in badges.all():
+            rows[user_id]["badge_count"] = badge_count or 0
+
+        await self._write(db, rows)
+        return rows
+
+    @staticmethod
+    async def _write(db: AsyncSession, rows: Dict[int, dict]) -> None:
+        now = datetime.now(timezone.utc)
+        values: List[dict] = [
+            {"user_id": user_id, **counters, "updated_at": now}
+            for user_id, counters in rows.items()
+        ]
+
+        dialect = db.bind.dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            upsert = pg_insert if dialect == "postgresql" else sqlite_insert
+            stmt = upsert(UserStats).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[UserStats.user_id],
+                set_={
+                    field: getattr(stmt.excluded, field)
+                    for field in (*COUNTER_FIELDS, "updated_at")
+                }
+            )
+            await db.execute(stmt)
+            return
+
+        # 其他数据库：逐行读取后覆盖
+        for row in values:
+            stats: Optional[UserStats] = await db.get(UserStats, row["user_id"])
+            if stats is None:
+                db.add(UserStats(**row))
+                continue
+            for field, value in row.items():
+                setattr(stats, field, value)
+
+
+user_stats_counter = UserStatsCounter()
@@ -1,30 +1,74 @@
 import httpx
 from typing import Optional
 from app.config import settings
+from app.utils.singleflight import SingleFlight
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
 
 
 class WechatService:
-    AUTH_URL = "https://api.weixin.qq.com/sns/jscode2session"
-    
-    @classmethod
-    async def code2session(cls, code: str) -> Optional[dict]:
+    AUTH_PATH = "/sns/jscode2session"
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._transport: Optional[httpx.AsyncBaseTransport] = None
+        self._singleflight = SingleFlight()
+
+    def configure(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        """替换底层传输（测试时指向本地模拟服务），下次请求时重建客户端"""
+        self._transport = transport
+        self._client = None
+
+    def get_client(self) -> httpx.AsyncClient:
+        """获取应用级共享的 HTTP 客户端（连接复用）"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=settings.WECHAT_API_BASE_URL,
+                http2=settings.WECHAT_HTTP2 and _http2_available(),
+                timeout=httpx.Timeout(
+                    settings.WECHAT_HTTP_TIMEOUT,
+                    connect=settings.WECHAT_HTTP_CONNECT_TIMEOUT
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.WECHAT_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.WECHAT_HTTP_MAX_KEEPALIVE
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def code2session(self, code: str) -> Optional[dict]:
+        """用 js_code 换取 openid，相同 code 的并发请求只调用一次微信接口"""
+        return await self._singleflight.do(code, lambda: self._code2session(code))
+
+    async def _code2session(self, code: str) -> Optional[dict]:
         params = {
             "appid": settings.WECHAT_APP_ID,
             "secret": settings.WECHAT_APP_SECRET,
             "js_code": code,
             "grant_type": "authorization_code"
         }
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(cls.AUTH_URL, params=params, timeout=10.0)
-            data = response.json()
-        
+
+        response = await self.get_client().get(self.AUTH_PATH, params=params)
+        data = response.json()
+
         if "openid" in data:
             return {
                 "openid": data["openid"],
                 "session_key": data.get("session_key", "")
             }
-        
+
         print(f"微信登录失败: {data}")
         return None
 
@@ -7,13 +7,40 @@ from app.models.user import User
 from app.models.article import Article, DifficultyEnum, ArticleStatusEnum
 from app.models.tag import Tag
 from app.models.question import Question, QuestionTypeEnum
+from app.services.user_cache import user_cache
+from app.services.catalogue_cache import catalogue_cache
+from app.services.tag_index import tag_index
+from app.services.search_index import search_index
+from app.services.recommendation_pool import recommendation_pool
+from app.services.ability_matrix import ability_matrix
+from app.services.badge_rules import badge_rules
+from app.services.completion_worker import completion_worker
+from app.services.idempotency import idempotency_store
+from app.services.active_users import active_user_counter
 
 
 @pytest.fixture(scope="function", autouse=True)
 async def setup_database():
     await init_db()
+    user_cache.clear()
+    catalogue_cache.clear()
+    tag_index.clear()
+    search_index.clear()
+    recommendation_pool.clear()
+    ability_matrix.clear()
+    badge_rules.clear()
+    completion_worker.clear()
+    idempotency_store.clear()
+    active_user_counter.clear()
     
     async with engine.begin() as conn:
+        await conn.execute(text("DELETE FROM completion_outbox"))
+        await conn.execute(text("DELETE FROM user_stats"))
+        await conn.execute(text("DELETE FROM check_in_calendars"))
+        await conn.execute(text("DELETE FROM daily_rollups"))
+        await conn.execute(text("DELETE FROM daily_ability_rollups"))
+        await conn.execute(text("DELETE FROM active_user_sketches"))
+        await conn.execute(text("DELETE FROM user_recommendations"))
         await conn.execute(text("DELETE FROM user_abilities"))
         await conn.execute(text("DELETE FROM user_badges"))
         await conn.execute(text("DELETE FROM question_answers"))
@@ -39,6 +66,33 @@ async def async_client():
         yield client
 
 
+@pytest.fixture
+async def wechat_mock_server():
+    """本地模拟微信 jscode2session 接口，WechatService 通过 ASGI 传输直连，无需联网"""
+    import asyncio
+    import httpx
+    from fastapi import FastAPI
+    from app.services.wechat_service import wechat_service
+
+    mock_app = FastAPI()
+    mock_app.state.calls = []
+    mock_app.state.delay = 0.0
+
+    @mock_app.get("/sns/jscode2session")
+    async def jscode2session(js_code: str):
+        mock_app.state.calls.append(js_code)
+        if mock_app.state.delay:
+            await asyncio.sleep(mock_app.state.delay)
+        if js_code.startswith("invalid"):
+            return {"errcode": 40029, "errmsg": "invalid code"}
+        return {"openid": f"openid_{js_code}", "session_key": "mock_session_key"}
+
+    wechat_service.configure(transport=httpx.ASGITransport(app=mock_app))
+    yield mock_app.state
+    await wechat_service.aclose()
+    wechat_service.configure()
+
+
 @pytest.fixture
 async def db_session():
     async with AsyncSessionLocal() as session:
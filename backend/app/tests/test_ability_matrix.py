@@ -0,0 +1,115 @@
+import pytest
+
+from app.models.ability import AbilityDimension, AbilityCategoryEnum
+from app.models.article import Article, ArticleStatusEnum, DifficultyEnum
+from app.models.progress import UserProgress
+from app.models.question import Question, QuestionAbility, QuestionTypeEnum
+from app.models.user_ability import UserAbility
+from app.services.ability_matrix import ability_matrix
+from app.services.admin.question_service import admin_question_service
+from app.services.article_service import article_service
+from app.schemas.admin.question import QuestionUpdateRequest, AbilityWeight
+
+
+async def _setup(db_session):
+    """两个能力；文章 A 主练细节，文章 B 主练推理，文章 C 各一半"""
+    detail = AbilityDimension(name="细节提取", code="detail", category=AbilityCategoryEnum.INFORMATION)
+    infer = AbilityDimension(name="推理判断", code="infer", category=AbilityCategoryEnum.ANALYSIS)
+    db_session.add_all([detail, infer])
+    await db_session.flush()
+
+    specs = {
+        "A": [(detail, 5)],
+        "B": [(infer, 5)],
+        "C": [(detail, 2), (infer, 2)],
+    }
+    articles = {}
+    for title, weights in specs.items():
+        article = Article(
+            title=title,
+            content="内容" * 10,
+            word_count=20,
+            reading_time=1,
+            status=ArticleStatusEnum.PUBLISHED,
+            article_difficulty=DifficultyEnum.EASY
+        )
+        db_session.add(article)
+        await db_session.flush()
+        for ability, weight in weights:
+            question = Question(
+                article_id=article.id,
+                type=QuestionTypeEnum.JUDGE,
+                content="问题",
+                answer="对"
+            )
+            db_session.add(question)
+            await db_session.flush()
+            db_session.add(QuestionAbility(question_id=question.id, ability_id=ability.id, weight=weight))
+        articles[title] = article
+    await db_session.commit()
+    return articles, detail, infer
+
+
+@pytest.mark.asyncio
+async def test_rank_by_deficit(db_session):
+    """测试按能力缺口排序：专练最弱能力的文章得分最高"""
+    articles, detail, infer = await _setup(db_session)
+    await ability_matrix.ensure_current(db_session)
+
+    scores = dict(zip(
+        ability_matrix.article_ids.tolist(),
+        ability_matrix.rank({detail.id: 20.0, infer.id: 80.0}).tolist()
+    ))
+    assert scores[articles["A"].id] == pytest.approx(0.8)
+    assert scores[articles["B"].id] == pytest.approx(0.2)
+    assert scores[articles["C"].id] == pytest.approx(0.5)
+
+    best = ability_matrix.best_article({detail.id: 20.0, infer.id: 80.0}, [])
+    assert best == articles["A"].id
+
+
+@pytest.mark.asyncio
+async def test_best_article_masks_read(db_session):
+    """测试已读文章被排除，全部读过时允许重读，满分时没有推荐"""
+    articles, detail, infer = await _setup(db_session)
+    await ability_matrix.ensure_current(db_session)
+    scores = {detail.id: 20.0, infer.id: 80.0}
+
+    assert ability_matrix.best_article(scores, [articles["A"].id]) == articles["C"].id
+    all_read = [a.id for a in articles.values()]
+    assert ability_matrix.best_article(scores, all_read) == articles["A"].id
+    assert ability_matrix.best_article({detail.id: 100.0, infer.id: 100.0}, []) is None
+
+
+@pytest.mark.asyncio
+async def test_weak_point_recommendation(db_session, test_user):
+    """测试补弱项推荐选择训练最弱能力且未读的文章"""
+    articles, detail, infer = await _setup(db_session)
+    db_session.add_all([
+        UserAbility(user_id=test_user.id, ability_id=detail.id, score=90.0),
+        UserAbility(user_id=test_user.id, ability_id=infer.id, score=10.0),
+        UserProgress(user_id=test_user.id, article_id=articles["B"].id, total_count=1),
+    ])
+    await db_session.commit()
+
+    result = await article_service.get_weak_point_recommendation(db_session, test_user)
+    assert result.title == "C"
+
+
+@pytest.mark.asyncio
+async def test_question_ability_update_rebuilds(db_session):
+    """测试修改题目能力权重后矩阵重建"""
+    articles, detail, infer = await _setup(db_session)
+    await ability_matrix.ensure_current(db_session)
+    assert ability_matrix.best_article({detail.id: 0.0}, []) == articles["A"].id
+
+    question = (await db_session.execute(
+        Question.__table__.select().where(Question.article_id == articles["B"].id)
+    )).first()
+    await admin_question_service.update_question(
+        db_session, question.id,
+        QuestionUpdateRequest(abilities=[AbilityWeight(ability_id=detail.id, weight=5)])
+    )
+    await ability_matrix.ensure_current(db_session)
+
+    assert ability_matrix.best_article({detail.id: 0.0}, [articles["A"].id]) == articles["B"].id
@@ -0,0 +1,136 @@
+import pytest
+from datetime import date, datetime, timedelta
+from sqlalchemy import select
+
+from app.models.progress import UserProgress
+from app.models.rollup import ActiveUserSketch
+from app.models.user import User
+from app.services.active_users import active_user_counter
+from app.services.progress_service import ProgressService
+from app.utils.dates import business_today
+from app.utils.hyperloglog import HyperLogLog
+from app.utils.security import create_access_token
+
+
+@pytest.fixture
+def admin_headers():
+    token = create_access_token({"sub": "admin", "role": "admin"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_hyperloglog_error_bound():
+    """测试大基数估计落在误差范围内，合并等价于并集"""
+    a, b = HyperLogLog(), HyperLogLog()
+    for i in range(60000):
+        a.add(i)
+    for i in range(40000, 100000):
+        b.add(i)
+
+    merged = HyperLogLog.union([a, b])
+    assert abs(merged.count() - 100000) / 100000 < 3 * merged.relative_error
+    assert abs(a.count() - 60000) / 60000 < 3 * a.relative_error
+    assert HyperLogLog.from_bytes(merged.to_bytes()).count() == merged.count()
+
+
+def test_hyperloglog_small_counts_exact():
+    sketch = HyperLogLog()
+    assert sketch.count() == 0
+    assert sketch.to_bytes() == b""
+    for user_id in range(1, 51):
+        sketch.add(user_id)
+    assert sketch.add(1) is False
+    assert sketch.count() == 50
+
+
+@pytest.mark.asyncio
+async def test_start_reading_feeds_sketch(db_session, test_user, test_article):
+    """测试开始阅读写入当天草图，重复用户不再写库"""
+    today = business_today()
+    user2 = User(openid="sketch_user_2")
+    db_session.add(user2)
+    await db_session.commit()
+
+    await ProgressService.start_reading(db_session, test_user.id, test_article.id)
+    await ProgressService.start_reading(db_session, user2.id, test_article.id)
+    first = await db_session.scalar(
+        select(ActiveUserSketch.updated_at).where(ActiveUserSketch.day == today)
+    )
+    await ProgressService.start_reading(db_session, test_user.id, test_article.id)
+
+    row = await db_session.scalar(
+        select(ActiveUserSketch)
+        .where(ActiveUserSketch.day == today)
+        .execution_options(populate_existing=True)
+    )
+    assert row.updated_at == first
+    assert HyperLogLog.from_bytes(row.registers).count() == 2
+
+    # 进程内副本丢失（如重启）后从库中恢复
+    active_user_counter.clear()
+    count, _ = await active_user_counter.estimate(db_session, today, today, today)
+    assert count == 2
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_add_not_cached(db_session, test_user):
+    """测试写入草图的事务回滚后，同一用户再次出现时仍会写库"""
+    today = business_today()
+    user_id = test_user.id
+
+    await active_user_counter.add(db_session, user_id, today)
+    await db_session.rollback()
+    await active_user_counter.add(db_session, user_id, today)
+    await db_session.commit()
+
+    registers = await db_session.scalar(
+        select(ActiveUserSketch.registers).where(ActiveUserSketch.day == today)
+    )
+    assert HyperLogLog.from_bytes(registers).count() == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_days_built_from_progress(db_session, test_user, test_article):
+    """测试没有草图的历史日期从明细补建并保存"""
+    today = date.today()
+    now = datetime.combine(today, datetime.min.time()) + timedelta(hours=12)
+    user2 = User(openid="sketch_user_3")
+    db_session.add(user2)
+    await db_session.commit()
+    db_session.add_all([
+        UserProgress(user_id=test_user.id, article_id=test_article.id, created_at=now - timedelta(days=3)),
+        UserProgress(user_id=user2.id, article_id=test_article.id, created_at=now - timedelta(days=3)),
+        UserProgress(user_id=user2.id, article_id=test_article.id, created_at=now - timedelta(days=20)),
+    ])
+    await db_session.commit()
+
+    count, error = await active_user_counter.estimate(db_session, today - timedelta(days=29), today, today)
+    await db_session.commit()
+    assert count == 2
+    assert round(error, 4) == 0.0081
+
+    days = (await db_session.execute(select(ActiveUserSketch.day))).scalars().all()
+    assert len(days) == 29
+    assert today not in days
+
+
+@pytest.mark.asyncio
+async def test_active_users_endpoint(async_client, admin_headers, db_session, test_user, test_article):
+    await ProgressService.start_reading(db_session, test_user.id, test_article.id)
+    today = business_today()
+
+    response = await async_client.get(
+        "/api/v1/admin/dashboard/active-users",
+        params={"from": (today - timedelta(days=6)).isoformat(), "to": today.isoformat()},
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["active_users"] == 1
+    assert data["relative_error"] == 0.81
+
+    response = await async_client.get(
+        "/api/v1/admin/dashboard/active-users",
+        params={"from": "2026-02-01", "to": "2026-01-01"},
+        headers=admin_headers
+    )
+    assert response.status_code == 422
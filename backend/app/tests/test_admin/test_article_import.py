@@ -0,0 +1,160 @@
+import json
+import pytest
+from sqlalchemy import event, select, func, text
+
+from app.database import engine
+from app.models.ability import AbilityDimension, AbilityCategoryEnum
+from app.models.article import Article, ArticleTag, ArticleStatusEnum
+from app.models.question import Question, QuestionAbility
+from app.models.tag import Tag, TagCategoryEnum
+from app.services.admin.import_service import admin_import_service, parse_csv
+from app.utils.security import create_access_token
+
+
+@pytest.fixture
+def admin_headers():
+    token = create_access_token({"sub": "admin", "role": "admin"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+async def import_refs(db_session):
+    db_session.add_all([
+        Tag(name="寓言", category=TagCategoryEnum.GENRE),
+        Tag(name="伊索寓言", category=TagCategoryEnum.SOURCE),
+        Tag(name="诚信", category=TagCategoryEnum.THEME),
+        Tag(name="诚信", category=TagCategoryEnum.CULTURE),
+        AbilityDimension(name="细节提取", code="detail", category=AbilityCategoryEnum.INFORMATION),
+    ])
+    await db_session.commit()
+
+
+def _article(title, **extra):
+    return {
+        "title": title,
+        "content": f"{title}的故事内容，用于测试批量导入。",
+        "source_book": "伊索寓言",
+        "tags": ["寓言", "source:伊索寓言"],
+        "questions": [
+            {"type": "choice", "content": "狐狸想吃什么？", "options": ["葡萄", "肉"], "answer": "葡萄",
+             "abilities": [{"ability": "detail", "weight": 2}]},
+            {"type": "judge", "content": "葡萄是酸的吗？", "answer": "不知道"},
+        ],
+        **extra
+    }
+
+
+async def _lines(text):
+    for line in text.split("\n"):
+        yield line
+
+
+async def _records(records):
+    for line, record in enumerate(records, start=1):
+        yield line, record
+
+
+@pytest.mark.asyncio
+async def test_import_jsonl_endpoint(async_client, admin_headers, db_session, import_refs):
+    body = "\n".join([
+        json.dumps(_article("狐狸和葡萄"), ensure_ascii=False),
+        json.dumps({"title": "缺少内容"}, ensure_ascii=False),
+        "",
+        json.dumps(_article("龟兔赛跑", tags=["诚信"]), ensure_ascii=False),
+        "{not json",
+        json.dumps(_article("北风和太阳", questions=[{"type": "choice", "content": "?", "answer": "A"}]),
+                   ensure_ascii=False),
+    ])
+    response = await async_client.post(
+        "/api/v1/admin/articles/import",
+        params={"publish": "true"},
+        content=body.encode(),
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    result = response.json()["data"]
+    assert (result["total"], result["imported"], result["failed"], result["questions"]) == (5, 1, 4, 2)
+    errors = {error["line"]: error for error in result["errors"]}
+    assert set(errors) == {2, 4, 5, 6}
+    assert "content" in errors[2]["message"]
+    assert "分类:名称" in errors[4]["message"]
+    assert errors[4]["title"] == "龟兔赛跑"
+    assert "JSON" in errors[5]["message"]
+    assert "选择题必须提供选项" in errors[6]["message"]
+
+    article = await db_session.scalar(select(Article).where(Article.title == "狐狸和葡萄"))
+    assert article.status == ArticleStatusEnum.PUBLISHED
+    assert article.question_count == 2
+    assert await db_session.scalar(
+        select(func.count(Question.id)).where(Question.article_id == article.id)
+    ) == 2
+    assert await db_session.scalar(
+        select(func.count(ArticleTag.id)).where(ArticleTag.article_id == article.id)
+    ) == 2
+    weights = (await db_session.execute(
+        select(QuestionAbility.weight).join(Question).where(Question.article_id == article.id)
+    )).scalars().all()
+    assert weights == [2]
+
+
+@pytest.mark.asyncio
+async def test_import_csv_multiline(db_session, import_refs):
+    questions = json.dumps([{"type": "fill", "content": "填空", "answer": "答案"}], ensure_ascii=False)
+    text = "\n".join([
+        "title,content,tags,questions",
+        f'乌鸦喝水,"第一段内容足够长。\n第二段，带逗号",寓言|theme:诚信,"{questions.replace(chr(34), chr(34) * 2)}"',
+        "只有两列,内容",
+    ])
+    result = await admin_import_service.import_records(db_session, parse_csv(_lines(text)))
+
+    assert (result.imported, result.failed) == (1, 1)
+    assert result.errors[0].line == 4
+    article = await db_session.scalar(select(Article).where(Article.title == "乌鸦喝水"))
+    assert article.content == "第一段内容足够长。\n第二段，带逗号"
+    assert article.status == ArticleStatusEnum.DRAFT
+    assert article.question_count == 1
+
+
+@pytest.mark.asyncio
+async def test_chunk_write_failure_reports_offending_record(db_session, import_refs):
+    """测试整块写入失败时逐条重试，只有出错的记录报告失败并带上数据库错误信息"""
+    await db_session.execute(text(
+        "CREATE TRIGGER reject_bad_title BEFORE INSERT ON articles WHEN NEW.title = '坏记录' "
+        "BEGIN SELECT RAISE(ABORT, 'title rejected by trigger'); END"
+    ))
+    await db_session.commit()
+
+    records = [_article("狐狸和葡萄"), _article("坏记录"), _article("龟兔赛跑")]
+    result = await admin_import_service.import_records(db_session, _records(records), chunk_size=10)
+
+    assert (result.total, result.imported, result.failed, result.questions) == (3, 2, 1, 4)
+    assert [error.line for error in result.errors] == [2]
+    assert result.errors[0].message.startswith("写入失败: IntegrityError")
+    assert "title rejected by trigger" in result.errors[0].message
+    titles = (await db_session.execute(select(Article.title))).scalars().all()
+    assert sorted(titles) == sorted(["狐狸和葡萄", "龟兔赛跑"])
+
+
+@pytest.mark.asyncio
+async def test_import_statements_per_chunk(db_session, import_refs):
+    """测试每块的写入语句数与记录数无关"""
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            statements.append(statement)
+
+    records = [_article(f"寓言{i}") for i in range(40)]
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        result = await admin_import_service.import_records(db_session, _records(records), chunk_size=20)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert (result.imported, result.questions) == (40, 80)
+    for table in ("article_tags", "question_abilities"):
+        assert sum(f"INSERT INTO {table} " in s for s in statements) == 2
+    if engine.dialect.name == "postgresql":
+        # SQLite 不支持按参数顺序批量 RETURNING，文章和题目会逐行插入
+        assert len(statements) == 2 * 4
+    assert await db_session.scalar(select(func.sum(Article.question_count))) == 80
@@ -295,3 +295,60 @@ async def test_publish_article_not_found(db_session):
 async def test_archive_article_not_found(db_session):
     success = await admin_article_service.archive_article(db_session, 99999)
     assert success is False
+
+
+@pytest.mark.asyncio
+async def test_question_count_maintained_and_list_without_n_plus_one(db_session, test_article):
+    from sqlalchemy import event, select, update
+    from app.database import engine
+    from app.models.question import Question, QuestionTypeEnum
+    from app.services.admin.question_service import admin_question_service
+    from app.schemas.admin.question import QuestionCreateRequest, QuestionTypeEnum as SchemaQuestionTypeEnum
+
+    for i in range(3):
+        db_session.add(Article(
+            title=f"列表文章{i}", content="内容", word_count=2, reading_time=1,
+            status=ArticleStatusEnum.PUBLISHED
+        ))
+    created = await admin_question_service.create_question(db_session, QuestionCreateRequest(
+        article_id=test_article.id,
+        type=SchemaQuestionTypeEnum.JUDGE,
+        content="对吗？",
+        answer="对"
+    ))
+    db_session.add(Question(
+        article_id=test_article.id, type=QuestionTypeEnum.FILL, content="填空", answer="答"
+    ))
+    await db_session.commit()
+    assert test_article.question_count == 2
+
+    await admin_question_service.delete_question(db_session, created.id)
+    stored = await db_session.scalar(select(Article.question_count).where(Article.id == test_article.id))
+    assert stored == 1
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        items, total = await admin_article_service.get_article_list(db_session, page_size=50)
+        detail = await admin_article_service.get_article_detail(db_session, test_article.id)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert total == 4
+    assert {item.id: item.question_count for item in items}[test_article.id] == 1
+    assert detail.question_count == 1
+    assert not any("FROM questions" in s for s in statements)
+
+    # 计数漂移后由校对修正
+    await db_session.execute(update(Article).where(Article.id == test_article.id).values(question_count=7))
+    fixed = await admin_article_service.reconcile_question_counts(
+        db_session, [item.id for item in items]
+    )
+    await db_session.commit()
+    assert fixed == [test_article.id]
+    stored = await db_session.scalar(select(Article.question_count).where(Article.id == test_article.id))
+    assert stored == 1
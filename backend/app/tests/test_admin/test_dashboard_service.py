@@ -222,3 +222,42 @@ async def test_get_dashboard_stats_comprehensive(db_session, test_user, test_art
     assert stats.published_articles == 3
     assert stats.total_questions == 5
     assert stats.checkins_today == 1
+
+
+@pytest.mark.asyncio
+async def test_get_dashboard_stats_single_query_per_table(db_session, test_user, test_article):
+    from datetime import datetime
+    from sqlalchemy import event
+    from app.database import engine
+
+    now = datetime.now()
+    user2 = User(openid="test_user_2")
+    db_session.add(user2)
+    await db_session.commit()
+    db_session.add_all([
+        UserProgress(user_id=test_user.id, article_id=test_article.id, created_at=now, completed_at=now),
+        UserProgress(user_id=test_user.id, article_id=test_article.id, created_at=now),
+        UserProgress(user_id=user2.id, article_id=test_article.id, created_at=now - timedelta(days=3)),
+        UserProgress(user_id=user2.id, article_id=test_article.id, created_at=now - timedelta(days=30)),
+    ])
+    await db_session.commit()
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        stats = await dashboard_service.get_stats(db_session)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert stats.active_users_today == 1
+    assert stats.active_users_week == 2
+    assert stats.active_users_error == 0.81
+    assert stats.total_readings == 1
+    assert stats.total_users == 2
+    progress_queries = [s for s in statements if "FROM user_progresses" in s]
+    assert not any("count(distinct" in s.lower() for s in progress_queries)
+    assert sum("FROM active_user_sketches" in s for s in statements) == 1
@@ -124,3 +124,87 @@ async def test_refresh_token_success(async_client: AsyncClient):
     assert data["data"]["is_new_user"] is False
 
 
+
+
+@pytest.mark.asyncio
+async def test_admin_login_throttled_after_failures(async_client: AsyncClient, monkeypatch):
+    """测试同一来源对管理员用户名连续登录失败后被限流，其他来源不受影响"""
+    from app.services.auth_service import admin_login_throttle, auth_service
+    from app.config import settings
+    from app.utils.security import get_password_hash
+
+    monkeypatch.setattr(settings, "ADMIN_USERNAME", "admin")
+    monkeypatch.setattr(settings, "ADMIN_PASSWORD_HASH", get_password_hash("admin123"))
+    admin_login_throttle.clear()
+    for _ in range(settings.ADMIN_LOGIN_MAX_FAILURES):
+        response = await async_client.post(
+            "/api/v1/auth/admin-login",
+            json={"username": "admin", "password": "wrong"}
+        )
+        assert response.status_code == 401
+
+    response = await async_client.post(
+        "/api/v1/auth/admin-login",
+        json={"username": "admin", "password": "admin123"}
+    )
+    assert response.status_code == 429
+    assert response.json()["detail"]["code"] == 1005
+
+    assert await auth_service.admin_login(None, "admin", "admin123", client_ip="10.0.0.2")
+    admin_login_throttle.clear()
+
+
+@pytest.mark.asyncio
+async def test_admin_login_unknown_username_not_recorded(async_client: AsyncClient):
+    """测试不存在的用户名失败不计数：不会被限流，也不占用限流缓存"""
+    from app.services.auth_service import admin_login_throttle
+    from app.config import settings
+
+    admin_login_throttle.clear()
+    for _ in range(settings.ADMIN_LOGIN_MAX_FAILURES + 1):
+        response = await async_client.post(
+            "/api/v1/auth/admin-login",
+            json={"username": "not_admin", "password": "wrong"}
+        )
+        assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_verify_password_async_does_not_block_event_loop():
+    """测试密码校验在线程池中执行，不阻塞事件循环"""
+    import asyncio
+    import time
+    from app.utils.security import verify_password_async
+
+    def slow_verify(plain, hashed):
+        time.sleep(0.2)
+        return True
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    async def verify_and_count():
+        result = await verify_password_async("pwd", "hash")
+        return result, ticks
+
+    with patch('app.utils.security.verify_password', side_effect=slow_verify):
+        (result, ticks_during_verify), _ = await asyncio.gather(verify_and_count(), ticker())
+
+    assert result is True
+    assert ticks_during_verify == 10
+
+
+@pytest.mark.asyncio
+async def test_password_task_rejected_when_queue_full():
+    """测试排队的密码校验任务超过上限时拒绝"""
+    from app.utils.security import verify_password_async
+    from app.utils.exceptions import TooManyRequestsError
+
+    with patch('app.utils.security._password_pending', 10**6):
+        with pytest.raises(TooManyRequestsError):
+            await verify_password_async("pwd", "hash")
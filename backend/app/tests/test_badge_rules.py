@@ -0,0 +1,95 @@
+import pytest
+from sqlalchemy import event
+
+from app.database import engine
+from app.models.ability import AbilityDimension, AbilityCategoryEnum
+from app.models.badge import Badge, UserBadge, BadgeConditionTypeEnum, BadgeCategoryEnum
+from app.models.user import User
+from app.models.user_ability import UserAbility
+from app.services.badge_rules import badge_rules
+from app.services.progress_service import ProgressService
+
+
+def _badge(name, condition_type, value, extra=None):
+    return Badge(
+        name=name,
+        description=f"获得{name}勋章",
+        category=BadgeCategoryEnum.READING,
+        condition_type=condition_type,
+        condition_value=value,
+        condition_extra=extra
+    )
+
+
+@pytest.mark.asyncio
+async def test_check_badges_uses_fixed_query_count(db_session):
+    """测试勋章判断的查询数与勋章数量无关"""
+    user = User(openid="badge_user", total_readings=12, streak_days=4)
+    detail = AbilityDimension(name="细节提取", code="detail", category=AbilityCategoryEnum.INFORMATION)
+    db_session.add_all([user, detail])
+    await db_session.flush()
+    owned = _badge("阅读新星", BadgeConditionTypeEnum.FIRST_READING, 1)
+    db_session.add_all([
+        owned,
+        _badge("三日", BadgeConditionTypeEnum.STREAK_DAYS, 3),
+        _badge("七日", BadgeConditionTypeEnum.STREAK_DAYS, 7),
+        _badge("十篇", BadgeConditionTypeEnum.TOTAL_READINGS, 10),
+        _badge("五十篇", BadgeConditionTypeEnum.TOTAL_READINGS, 50),
+        _badge("细节达人", BadgeConditionTypeEnum.ABILITY_ACCURACY, 80, "detail"),
+        _badge("细节能手", BadgeConditionTypeEnum.ABILITY_COUNT, 5, "detail"),
+        _badge("未知能力", BadgeConditionTypeEnum.ABILITY_COUNT, 1, "missing"),
+        UserAbility(user_id=user.id, ability_id=detail.id, correct_count=9, total_count=10, score=90.0),
+    ])
+    await db_session.flush()
+    db_session.add(UserBadge(user_id=user.id, badge_id=owned.id))
+    await db_session.commit()
+    await badge_rules.ensure_current(db_session)
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        new_badges = await ProgressService._check_badges(db_session, user)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    # 规则版本检查 + 用户快照
+    assert len(statements) == 2
+    assert [b.name for b in new_badges] == ["三日", "十篇", "细节达人", "细节能手"]
+
+
+@pytest.mark.asyncio
+async def test_accuracy_badge_requires_min_answers(db_session):
+    """测试正确率勋章要求至少 10 道题"""
+    user = User(openid="badge_user", total_readings=1)
+    detail = AbilityDimension(name="细节提取", code="detail", category=AbilityCategoryEnum.INFORMATION)
+    db_session.add_all([user, detail])
+    await db_session.flush()
+    db_session.add_all([
+        _badge("细节达人", BadgeConditionTypeEnum.ABILITY_ACCURACY, 80, "detail"),
+        UserAbility(user_id=user.id, ability_id=detail.id, correct_count=9, total_count=9, score=100.0),
+    ])
+    await db_session.commit()
+
+    assert await ProgressService._check_badges(db_session, user) == []
+
+
+@pytest.mark.asyncio
+async def test_rules_recompiled_when_badges_added(db_session):
+    """测试新增勋章后规则自动重新编译"""
+    user = User(openid="badge_user", total_readings=3)
+    db_session.add_all([user, _badge("一篇", BadgeConditionTypeEnum.TOTAL_READINGS, 1)])
+    await db_session.commit()
+
+    first = await ProgressService._check_badges(db_session, user)
+    await db_session.commit()
+    assert [b.name for b in first] == ["一篇"]
+
+    db_session.add(_badge("三篇", BadgeConditionTypeEnum.TOTAL_READINGS, 3))
+    await db_session.commit()
+
+    second = await ProgressService._check_badges(db_session, user)
+    assert [b.name for b in second] == ["三篇"]
@@ -0,0 +1,91 @@
+import pytest
+from unittest.mock import patch
+
+from app.models.article import Article, ArticleStatusEnum, DifficultyEnum
+from app.services.article_service import article_service
+from app.services.admin.article_service import admin_article_service
+from app.services.catalogue_cache import catalogue_cache
+from app.schemas.admin.article import ArticleUpdateRequest
+
+
+def _article(title: str, status=ArticleStatusEnum.PUBLISHED) -> Article:
+    return Article(
+        title=title,
+        content="测试内容" * 5,
+        word_count=20,
+        reading_time=1,
+        status=status,
+        article_difficulty=DifficultyEnum.EASY
+    )
+
+
+@pytest.mark.asyncio
+async def test_article_list_served_from_cache(db_session):
+    """测试相同筛选条件的列表第二次直接读缓存"""
+    db_session.add(_article("缓存文章"))
+    await db_session.commit()
+
+    items, total = await article_service.get_article_list(db_session, keyword="缓存")
+    assert total == 1
+
+    with patch.object(db_session, "execute", side_effect=AssertionError("不应查询数据库")):
+        cached_items, cached_total = await article_service.get_article_list(
+            db_session, keyword=" 缓存 "
+        )
+
+    assert cached_total == 1
+    assert cached_items[0].title == items[0].title
+
+
+@pytest.mark.asyncio
+async def test_publish_invalidates_article_list(db_session):
+    """测试发布文章后列表缓存失效"""
+    draft = _article("草稿文章", status=ArticleStatusEnum.DRAFT)
+    db_session.add(draft)
+    await db_session.commit()
+    await db_session.refresh(draft)
+
+    _, total = await article_service.get_article_list(db_session)
+    assert total == 0
+
+    await admin_article_service.publish_article(db_session, draft.id)
+
+    items, total = await article_service.get_article_list(db_session)
+    assert total == 1
+    assert items[0].title == "草稿文章"
+
+
+@pytest.mark.asyncio
+async def test_update_invalidates_article_detail(db_session):
+    """测试修改文章后详情缓存失效"""
+    article = _article("旧标题")
+    db_session.add(article)
+    await db_session.commit()
+    await db_session.refresh(article)
+
+    detail = await article_service.get_article_detail(db_session, article.id)
+    assert detail.title == "旧标题"
+
+    generation = await catalogue_cache.generation()
+    await admin_article_service.update_article(
+        db_session, article.id, ArticleUpdateRequest(title="新标题")
+    )
+
+    assert await catalogue_cache.generation() == generation + 1
+    detail = await article_service.get_article_detail(db_session, article.id)
+    assert detail.title == "新标题"
+
+
+@pytest.mark.asyncio
+async def test_archive_invalidates_article_detail(db_session):
+    """测试归档文章后详情不再返回"""
+    article = _article("待归档")
+    db_session.add(article)
+    await db_session.commit()
+    await db_session.refresh(article)
+
+    assert await article_service.get_article_detail(db_session, article.id) is not None
+
+    await admin_article_service.archive_article(db_session, article.id)
+
+    assert await article_service.get_article_detail(db_session, article.id) is None
@@ -0,0 +1,100 @@
+import pytest
+from datetime import date, timedelta
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.models.checkin import CheckIn
+from app.models.checkin_calendar import CheckInCalendar
+from app.models.progress import UserProgress
+from app.models.user import User
+from app.services.checkin_calendar import checkin_calendar, day_bit, encode
+from app.services.progress_service import ProgressService
+from scripts.migrate_checkin_calendars import migrate_chunk
+
+
+def _rows(*days):
+    bitmaps = {}
+    for day in days:
+        bitmaps[day.year] = bitmaps.get(day.year, 0) | (1 << day_bit(day))
+    return {
+        year: CheckInCalendar(user_id=1, year=year, bits=encode(bits), days_count=bin(bits).count("1"))
+        for year, bits in bitmaps.items()
+    }
+
+
+def test_month_days():
+    rows = _rows(date(2024, 2, 28), date(2024, 2, 29), date(2024, 3, 1), date(2024, 1, 31))
+    assert checkin_calendar.month_days(rows, 2024, 2) == [date(2024, 2, 28), date(2024, 2, 29)]
+    assert checkin_calendar.month_days(rows, 2023, 2) == []
+
+
+def test_streaks_across_year_boundary():
+    days = [date(2023, 12, 30) + timedelta(days=i) for i in range(5)] + [date(2024, 1, 10)]
+    rows = _rows(*days)
+
+    assert checkin_calendar.max_streak(rows) == 5
+    assert checkin_calendar.current_streak(rows, date(2024, 1, 3)) == 5
+    # 今天还没打卡时从昨天往前数
+    assert checkin_calendar.current_streak(rows, date(2024, 1, 4)) == 5
+    assert checkin_calendar.current_streak(rows, date(2024, 1, 5)) == 0
+    assert checkin_calendar.yearly_counts(rows) == [(2023, 2), (2024, 4)]
+
+
+@pytest.mark.asyncio
+async def test_handle_checkin_updates_bitmap(db_session, test_user, test_article):
+    """测试打卡同步写入位图，第二次打卡直接由位图判断"""
+    progress = UserProgress(user_id=test_user.id, article_id=test_article.id, total_count=0)
+    db_session.add(progress)
+    db_session.add(CheckIn(user_id=test_user.id, check_date=date.today() - timedelta(days=1)))
+    test_user.streak_days = 1
+    await db_session.commit()
+
+    assert await ProgressService._handle_checkin(db_session, test_user, progress, date.today()) == (True, 2)
+    await db_session.commit()
+
+    calendar = await db_session.get(CheckInCalendar, (test_user.id, date.today().year))
+    assert calendar is not None
+    assert checkin_calendar.has({calendar.year: calendar}, date.today())
+
+    assert await ProgressService._handle_checkin(db_session, test_user, progress, date.today()) == (False, 2)
+
+
+@pytest.mark.asyncio
+async def test_checkin_history(async_client: AsyncClient, auth_headers, test_user, db_session):
+    """测试历年打卡汇总"""
+    today = date.today()
+    db_session.add_all([
+        CheckIn(user_id=test_user.id, check_date=today),
+        CheckIn(user_id=test_user.id, check_date=today - timedelta(days=1)),
+        CheckIn(user_id=test_user.id, check_date=date(today.year - 2, 6, 1)),
+    ])
+    await db_session.commit()
+
+    response = await async_client.get("/api/v1/users/me/checkins/history", headers=auth_headers)
+
+    data = response.json()["data"]
+    assert data["current_streak"] == 2
+    assert data["max_streak"] == 2
+    assert data["total_days"] == 3
+    assert data["years"][0] == {"year": today.year - 2, "days": 1}
+
+
+@pytest.mark.asyncio
+async def test_migrate_chunk(db_session, test_user):
+    """测试迁移工具从打卡明细生成位图并修正最长连续天数"""
+    start = date(2025, 3, 1)
+    db_session.add_all([
+        CheckIn(user_id=test_user.id, check_date=start + timedelta(days=i)) for i in range(4)
+    ])
+    await db_session.commit()
+
+    assert await migrate_chunk([test_user.id], fix_max_streak=True) == 1
+    assert await migrate_chunk([test_user.id], fix_max_streak=True) == 1
+
+    rows = (await db_session.execute(
+        select(CheckInCalendar).where(CheckInCalendar.user_id == test_user.id)
+    )).scalars().all()
+    assert [(row.year, row.days_count) for row in rows] == [(2025, 4)]
+    assert checkin_calendar.month_days({2025: rows[0]}, 2025, 3) == [start + timedelta(days=i) for i in range(4)]
+    max_streak = await db_session.scalar(select(User.max_streak_days).where(User.id == test_user.id))
+    assert max_streak == 4
@@ -0,0 +1,224 @@
+import asyncio
+import pytest
+from datetime import timedelta
+from httpx import AsyncClient
+from sqlalchemy import select, update
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.badge import Badge, UserBadge, BadgeConditionTypeEnum, BadgeCategoryEnum
+from app.models.checkin import CheckIn
+from app.models.outbox import CompletionOutbox, OutboxStatusEnum
+from app.models.progress import UserProgress
+from app.models.rollup import DailyRollup
+from app.models.user import User
+from app.services.completion_worker import completion_worker
+from app.services.progress_service import ProgressService
+from app.utils.dates import business_today, day_bounds
+from app.utils.exceptions import ValidationError
+
+
+async def _completed_progress(db_session, test_user, test_article):
+    db_session.add(Badge(
+        name="阅读新星",
+        description="完成第一次阅读",
+        category=BadgeCategoryEnum.READING,
+        condition_type=BadgeConditionTypeEnum.FIRST_READING,
+        condition_value=1
+    ))
+    progress = UserProgress(user_id=test_user.id, article_id=test_article.id, total_count=0)
+    db_session.add(progress)
+    await db_session.commit()
+    return progress
+
+
+async def _event(db_session, progress_id):
+    return await db_session.scalar(
+        select(CompletionOutbox)
+        .where(CompletionOutbox.progress_id == progress_id)
+        .execution_options(populate_existing=True)
+    )
+
+
+@pytest.mark.asyncio
+async def test_complete_returns_before_processing(async_client: AsyncClient, auth_headers, test_user, test_article, db_session):
+    """测试完成接口立即返回，后处理结果在轮询接口中获取"""
+    progress = await _completed_progress(db_session, test_user, test_article)
+
+    response = await async_client.post(
+        f"/api/v1/progress/{progress.id}/complete", json={"time_spent": 60}, headers=auth_headers
+    )
+    data = response.json()["data"]
+    assert data["processing"] is True
+    assert data["new_badges"] == []
+    assert await db_session.scalar(select(CheckIn.id).where(CheckIn.user_id == test_user.id)) is None
+
+    response = await async_client.get(f"/api/v1/progress/{progress.id}/result", headers=auth_headers)
+    assert response.json()["data"]["status"] == "pending"
+
+    assert await completion_worker.process_pending() == 1
+
+    response = await async_client.get(f"/api/v1/progress/{progress.id}/result", headers=auth_headers)
+    data = response.json()["data"]
+    assert data["status"] == "done"
+    assert data["is_checked_in"] is True
+    assert data["streak_days"] == 1
+    assert [b["name"] for b in data["new_badges"]] == ["阅读新星"]
+    assert await db_session.scalar(
+        select(User.total_readings).where(User.id == test_user.id)
+    ) == 1
+
+
+@pytest.mark.asyncio
+async def test_result_requires_completion(async_client: AsyncClient, auth_headers, test_user, test_article, db_session):
+    """测试未完成的阅读不能查询后处理结果"""
+    progress = UserProgress(user_id=test_user.id, article_id=test_article.id, total_count=0)
+    db_session.add(progress)
+    await db_session.commit()
+
+    response = await async_client.get(f"/api/v1/progress/{progress.id}/result", headers=auth_headers)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_inline_mode_processes_in_request(db_session, test_user, test_article, monkeypatch):
+    """测试 inline 模式在请求内完成后处理"""
+    monkeypatch.setattr(settings, "COMPLETION_PIPELINE", "inline")
+    progress = await _completed_progress(db_session, test_user, test_article)
+
+    result = await ProgressService.complete_reading(db_session, progress.id, test_user.id, 60)
+
+    assert result.processing is False
+    assert result.is_checked_in is True
+    assert [b.name for b in result.new_badges] == ["阅读新星"]
+    assert (await _event(db_session, progress.id)).status == OutboxStatusEnum.DONE
+
+
+@pytest.mark.asyncio
+async def test_event_processed_once(db_session, test_user, test_article):
+    """测试同一任务并发处理时只有一个 worker 能领取"""
+    progress = await _completed_progress(db_session, test_user, test_article)
+    await ProgressService.complete_reading(db_session, progress.id, test_user.id, 60)
+    event = await _event(db_session, progress.id)
+
+    async def process():
+        async with AsyncSessionLocal() as session:
+            return await completion_worker.process(session, event.id)
+
+    results = await asyncio.gather(process(), process())
+
+    assert sum(result is not None for result in results) == 1
+    badges = await db_session.execute(select(UserBadge).where(UserBadge.user_id == test_user.id))
+    assert len(badges.scalars().all()) == 1
+    assert await db_session.scalar(
+        select(User.total_readings).where(User.id == test_user.id)
+    ) == 1
+
+
+@pytest.mark.asyncio
+async def test_duplicate_complete_rejected(db_session, test_user, test_article):
+    """测试重复完成返回"该阅读已完成"而不是唯一约束错误"""
+    progress = await _completed_progress(db_session, test_user, test_article)
+    user_id, article_id = test_user.id, test_article.id
+
+    # 另一个请求先完成：本会话中已加载的进度仍是未完成状态
+    async with AsyncSessionLocal() as other:
+        await ProgressService.complete_reading(other, progress.id, user_id, 60)
+    with pytest.raises(ValidationError, match="该阅读已完成"):
+        await ProgressService.complete_reading(db_session, progress.id, user_id, 60)
+
+    # 行锁不可用时（两个请求都通过了 completed_at 检查），由 outbox 唯一约束兜底
+    second = UserProgress(user_id=user_id, article_id=article_id, total_count=0)
+    db_session.add(second)
+    await db_session.flush()
+    completion_worker.enqueue(db_session, second)
+    await db_session.commit()
+    second_id = second.id
+    with pytest.raises(ValidationError, match="该阅读已完成"):
+        await ProgressService.complete_reading(db_session, second_id, user_id, 60)
+
+    events = await db_session.execute(
+        select(CompletionOutbox).where(CompletionOutbox.user_id == user_id)
+    )
+    assert len(events.scalars().all()) == 2
+
+
+@pytest.mark.asyncio
+async def test_late_event_checks_in_on_completion_day(db_session, test_user, test_article):
+    """测试完成事件过了零点才被处理时，打卡和汇总仍记在阅读完成的那一天"""
+    progress = await _completed_progress(db_session, test_user, test_article)
+    user_id, progress_id = test_user.id, progress.id
+    yesterday = business_today() - timedelta(days=1)
+    db_session.add(CheckIn(user_id=user_id, check_date=yesterday - timedelta(days=1)))
+    test_user.streak_days = 1
+    await db_session.commit()
+
+    await ProgressService.complete_reading(db_session, progress_id, user_id, 60)
+    # 前一天 23:59 完成，worker 在今天才处理
+    await db_session.execute(
+        update(UserProgress)
+        .where(UserProgress.id == progress_id)
+        .values(completed_at=day_bounds(yesterday)[1] - timedelta(minutes=1))
+    )
+    await db_session.commit()
+    assert await completion_worker.process_pending() == 1
+
+    check_date = await db_session.scalar(select(CheckIn.check_date).where(CheckIn.progress_id == progress_id))
+    assert check_date == yesterday
+    assert await db_session.scalar(select(User.streak_days).where(User.id == user_id)) == 2
+    rollup = await db_session.get(DailyRollup, yesterday, populate_existing=True)
+    assert (rollup.readings_completed, rollup.checkins) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_failed_event_retried_with_backoff(db_session, test_user, test_article, monkeypatch):
+    """测试处理失败后退避重试，超过次数标记为失败"""
+    monkeypatch.setattr(settings, "COMPLETION_MAX_ATTEMPTS", 2)
+    progress = await _completed_progress(db_session, test_user, test_article)
+    await ProgressService.complete_reading(db_session, progress.id, test_user.id, 60)
+    event_id = (await _event(db_session, progress.id)).id
+
+    async def broken(db, event):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(completion_worker, "_handler", broken)
+
+    assert await completion_worker.process_pending() == 0
+    event = await _event(db_session, progress.id)
+    assert event.status == OutboxStatusEnum.PENDING
+    assert event.attempts == 1
+    assert event.last_error == "RuntimeError: boom"
+
+    # 退避期内不会被扫表领取
+    assert await completion_worker.process_pending() == 0
+    assert (await _event(db_session, progress.id)).attempts == 1
+
+    async with AsyncSessionLocal() as session:
+        with pytest.raises(RuntimeError):
+            event = await session.get(CompletionOutbox, event_id)
+            event.available_at = event.created_at
+            await session.commit()
+            await completion_worker.process(session, event_id)
+
+    event = await _event(db_session, progress.id)
+    assert event.status == OutboxStatusEnum.FAILED
+    assert event.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_consumes_notifications(db_session, test_user, test_article):
+    """测试后台 worker 收到通知后处理任务"""
+    progress = await _completed_progress(db_session, test_user, test_article)
+    completion_worker.start()
+    try:
+        await ProgressService.complete_reading(db_session, progress.id, test_user.id, 60)
+        for _ in range(50):
+            event = await _event(db_session, progress.id)
+            if event.status == OutboxStatusEnum.DONE:
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        await completion_worker.stop()
+
+    assert event.status == OutboxStatusEnum.DONE
+    assert event.result["is_checked_in"] is True
@@ -0,0 +1,159 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.ability import AbilityDimension, AbilityCategoryEnum
+from app.models.checkin import CheckIn
+from app.models.question import QuestionAbility
+from app.models.rollup import DailyRollup, DailyAbilityRollup
+from app.services.active_users import active_user_counter
+from app.services.admin.dashboard_service import DashboardService
+from app.services.completion_worker import completion_worker
+from app.services.daily_rollup import daily_rollup
+from app.services.progress_service import ProgressService
+from app.utils.dates import business_today
+from app.utils.security import create_access_token
+
+FIELDS = ("active_users", "readings_completed", "answers", "correct_answers", "checkins")
+
+
+@pytest.fixture
+def admin_headers():
+    token = create_access_token({"sub": "admin", "role": "admin"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def _rollup(db_session, day):
+    row = await db_session.scalar(
+        select(DailyRollup)
+        .where(DailyRollup.day == day)
+        .execution_options(populate_existing=True)
+    )
+    return {field: getattr(row, field) for field in FIELDS}
+
+
+async def _read_and_complete(db_session, user_id, question):
+    started = await ProgressService.start_reading(db_session, user_id, question.article_id)
+    await ProgressService.submit_answer(
+        db_session, started.progress_id, user_id, question.id, question.answer
+    )
+    await ProgressService.complete_reading(db_session, started.progress_id, user_id, 120)
+    await completion_worker.process_pending()
+
+
+@pytest.mark.asyncio
+async def test_write_paths_update_rollups(db_session, test_user, test_question):
+    """测试开始阅读、答题完成和打卡增量更新当天的汇总"""
+    ability = AbilityDimension(name="细节提取", code="detail", category=AbilityCategoryEnum.INFORMATION)
+    db_session.add(ability)
+    await db_session.flush()
+    db_session.add(QuestionAbility(question_id=test_question.id, ability_id=ability.id))
+    await db_session.commit()
+
+    today = business_today()
+    await _read_and_complete(db_session, test_user.id, test_question)
+    # 同一天再读一次：活跃用户和打卡不重复计数
+    await _read_and_complete(db_session, test_user.id, test_question)
+
+    assert await _rollup(db_session, today) == {
+        "active_users": 1, "readings_completed": 2, "answers": 2, "correct_answers": 2, "checkins": 1
+    }
+    ability_row = await db_session.scalar(
+        select(DailyAbilityRollup)
+        .where(DailyAbilityRollup.day == today, DailyAbilityRollup.ability_id == ability.id)
+        .execution_options(populate_existing=True)
+    )
+    assert (ability_row.answers, ability_row.correct_answers) == (2, 2)
+
+
+@pytest.fixture
+def business_tz_off_utc(monkeypatch):
+    """把业务时区设为与 UTC 不在同一天的时区（UTC+14 和 UTC-12 总有一个）"""
+    for tz in ("Etc/GMT-14", "Etc/GMT+12"):
+        monkeypatch.setattr(settings, "BUSINESS_TZ", tz)
+        if business_today() != datetime.now(timezone.utc).date():
+            break
+
+
+@pytest.mark.asyncio
+async def test_day_boundary_follows_business_tz(db_session, test_user, test_question, business_tz_off_utc):
+    """测试打卡、汇总、活跃草图、看板和重算都按业务时区归日"""
+    today = business_today()
+    await _read_and_complete(db_session, test_user.id, test_question)
+
+    check_date = await db_session.scalar(select(CheckIn.check_date).where(CheckIn.user_id == test_user.id))
+    assert check_date == today
+    incremental = await _rollup(db_session, today)
+    assert incremental == {
+        "active_users": 1, "readings_completed": 1, "answers": 1, "correct_answers": 1, "checkins": 1
+    }
+    stats = await DashboardService.get_stats(db_session)
+    assert (stats.active_users_today, stats.checkins_today) == (1, 1)
+
+    await daily_rollup.rebuild(db_session, today - timedelta(days=1), today + timedelta(days=1))
+    await db_session.commit()
+    assert await _rollup(db_session, today) == incremental
+    assert await _rollup(db_session, today - timedelta(days=1)) == dict.fromkeys(FIELDS, 0)
+
+    active_user_counter.clear()
+    count, _ = await active_user_counter.estimate(db_session, today, today, today)
+    assert count == 1
+
+
+@pytest.mark.asyncio
+async def test_rebuild_matches_incremental(db_session, test_user, test_question):
+    """测试从明细重算的结果与增量维护一致"""
+    today = business_today()
+    await _read_and_complete(db_session, test_user.id, test_question)
+    incremental = await _rollup(db_session, today)
+
+    days = await daily_rollup.rebuild(db_session, today - timedelta(days=6), today)
+    await db_session.commit()
+
+    assert days == 7
+    assert await _rollup(db_session, today) == incremental
+    assert await _rollup(db_session, today - timedelta(days=1)) == dict.fromkeys(FIELDS, 0)
+
+
+@pytest.mark.asyncio
+async def test_timeseries_endpoint(async_client, admin_headers, db_session, test_user, test_question):
+    """测试趋势接口按天补零并计算正确率"""
+    today = business_today()
+    await _read_and_complete(db_session, test_user.id, test_question)
+
+    params = {"from": (today - timedelta(days=2)).isoformat(), "to": today.isoformat()}
+    response = await async_client.get(
+        "/api/v1/admin/dashboard/timeseries",
+        params={**params, "metric": "readings_completed"},
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert [point["value"] for point in data["points"]] == [0, 0, 1]
+
+    response = await async_client.get(
+        "/api/v1/admin/dashboard/timeseries",
+        params={**params, "metric": "accuracy"},
+        headers=admin_headers
+    )
+    assert response.json()["data"]["points"][-1]["value"] == 100.0
+
+
+@pytest.mark.asyncio
+async def test_timeseries_validation(async_client, admin_headers):
+    """测试趋势接口的参数校验"""
+    cases = [
+        {"metric": "unknown"},
+        {"metric": "ability_accuracy"},
+        {"metric": "answers", "from": "2026-02-01", "to": "2026-01-01"},
+        {"metric": "answers", "from": "2024-01-01", "to": "2026-01-01"},
+    ]
+    for params in cases:
+        response = await async_client.get(
+            "/api/v1/admin/dashboard/timeseries", params=params, headers=admin_headers
+        )
+        assert response.status_code == 422
+
+    response = await async_client.get("/api/v1/admin/dashboard/timeseries")
+    assert response.status_code == 401
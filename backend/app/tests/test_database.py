@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import text
+
+from app.database import get_db, pool_metrics
+
+
+@pytest.mark.asyncio
+async def test_get_db_does_not_checkout_until_first_query():
+    """测试会话在首次执行 SQL 前不借出连接"""
+    pool_metrics.reset()
+    gen = get_db()
+    session = await gen.__anext__()
+
+    assert pool_metrics.checkouts == 0
+
+    await session.execute(text("SELECT 1"))
+    assert pool_metrics.checkouts == 1
+    assert pool_metrics.checked_out == 1
+
+    await gen.aclose()
+    assert pool_metrics.checked_out == 0
+    assert pool_metrics.peak_checked_out == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_user_request_does_not_checkout(async_client, test_user, auth_headers):
+    """测试命中用户缓存的请求不占用连接"""
+    response = await async_client.get("/api/v1/users/me", headers=auth_headers)
+    assert response.status_code == 200
+
+    pool_metrics.reset()
+    response = await async_client.get("/api/v1/users/me", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert pool_metrics.checkouts == 0
+
+
+@pytest.mark.asyncio
+async def test_get_pool_stats(async_client):
+    """测试管理后台连接池统计接口"""
+    from app.utils.security import create_access_token
+    token = create_access_token({"sub": "admin", "role": "admin"})
+
+    response = await async_client.get(
+        "/api/v1/admin/dashboard/pool",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert "checkouts" in data
+    assert "peak_checked_out" in data
+    assert data["checked_out"] >= 0
@@ -289,3 +289,63 @@ async def test_get_admin_user_database_error():
         
         assert exc_info.value.detail["code"] == 1001
         assert exc_info.value.detail["message"] == "数据库查询失败"
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_id_valid_token():
+    """测试有效token直接返回用户ID"""
+    from app.api.deps import get_current_user_id
+    from app.utils.security import create_access_token
+
+    token = create_access_token({"sub": "123"})
+
+    assert await get_current_user_id(authorization=f"Bearer {token}") == 123
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_id_rejects_invalid_token():
+    """测试缺少或无效token时抛出认证错误"""
+    from app.api.deps import get_current_user_id
+    from app.utils.security import create_access_token
+
+    admin_token = create_access_token({"sub": "admin", "role": "admin"})
+    for authorization in [None, "InvalidFormat", "Bearer invalid_token", f"Bearer {admin_token}"]:
+        with pytest.raises(AuthenticationError):
+            await get_current_user_id(authorization=authorization)
+
+
+@pytest.mark.asyncio
+async def test_current_user_loads_lazily():
+    """测试CurrentUser只在调用load时查询数据库"""
+    from app.api.deps import CurrentUser, get_current_principal
+
+    mock_session = AsyncMock(spec=AsyncSession)
+    mock_user = User(id=123, openid="test_openid")
+    mock_result = Mock()
+    mock_result.scalar_one_or_none.return_value = mock_user
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    principal = await get_current_principal(user_id=123, db=mock_session)
+
+    assert isinstance(principal, CurrentUser)
+    assert principal.id == 123
+    mock_session.execute.assert_not_called()
+
+    loaded = await principal.load()
+    assert (loaded.id, loaded.openid) == (123, "test_openid")
+    assert await principal.load() is loaded
+    assert mock_session.execute.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_current_user_load_missing_user():
+    """测试用户不存在时load抛出认证错误"""
+    from app.api.deps import CurrentUser
+
+    mock_session = AsyncMock(spec=AsyncSession)
+    mock_result = Mock()
+    mock_result.scalar_one_or_none.return_value = None
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    with pytest.raises(AuthenticationError):
+        await CurrentUser(456, mock_session).load()
@@ -0,0 +1,166 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, func
+
+from app.models.progress import UserProgress, QuestionAnswer
+
+
+async def _progress_count(db_session, user_id):
+    return await db_session.scalar(
+        select(func.count(UserProgress.id)).where(UserProgress.user_id == user_id)
+    )
+
+
+@pytest.mark.asyncio
+async def test_start_reading_replayed(async_client: AsyncClient, auth_headers, test_user, test_article, db_session):
+    """测试相同 Idempotency-Key 的重试回放首次响应，不重复创建进度"""
+    headers = {**auth_headers, "Idempotency-Key": "start-1"}
+    first = await async_client.post("/api/v1/progress/start", json={"article_id": test_article.id}, headers=headers)
+    second = await async_client.post("/api/v1/progress/start", json={"article_id": test_article.id}, headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert await _progress_count(db_session, test_user.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_start_reading_without_key(async_client: AsyncClient, auth_headers, test_user, test_article, db_session):
+    """测试不带 Idempotency-Key 时行为不变"""
+    for _ in range(2):
+        response = await async_client.post(
+            "/api/v1/progress/start", json={"article_id": test_article.id}, headers=auth_headers
+        )
+        assert response.status_code == 200
+
+    assert await _progress_count(db_session, test_user.id) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_merged(async_client: AsyncClient, auth_headers, test_user, test_article, db_session):
+    """测试同一 key 的并发请求只执行一次"""
+    headers = {**auth_headers, "Idempotency-Key": "start-concurrent"}
+    responses = await asyncio.gather(*[
+        async_client.post("/api/v1/progress/start", json={"article_id": test_article.id}, headers=headers)
+        for _ in range(3)
+    ])
+
+    assert {r.json()["data"]["progress_id"] for r in responses} == {responses[0].json()["data"]["progress_id"]}
+    assert await _progress_count(db_session, test_user.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_key_reused_for_other_request(async_client: AsyncClient, auth_headers, test_article):
+    """测试同一 key 用于不同请求时拒绝"""
+    headers = {**auth_headers, "Idempotency-Key": "reused"}
+    await async_client.post("/api/v1/progress/start", json={"article_id": test_article.id}, headers=headers)
+
+    response = await async_client.post("/api/v1/progress/start", json={"article_id": test_article.id + 1}, headers=headers)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_concurrent_key_reuse_rejected():
+    """测试首个请求仍在处理时，同一 key 带不同请求体的并发请求返回 422 而不是共享结果"""
+    from pydantic import BaseModel
+    from app.services.idempotency import idempotency_store
+    from app.utils.exceptions import ValidationError
+
+    class Echo(BaseModel):
+        value: int
+
+    started = asyncio.Event()
+    calls = []
+
+    async def handler(value):
+        calls.append(value)
+        started.set()
+        await asyncio.sleep(0.05)
+        return Echo(value=value)
+
+    first = asyncio.ensure_future(idempotency_store.run(
+        1, "inflight", "scope", {"v": 1}, lambda: handler(1), Echo
+    ))
+    await started.wait()
+    with pytest.raises(ValidationError):
+        await idempotency_store.run(1, "inflight", "scope", {"v": 2}, lambda: handler(2), Echo)
+
+    assert (await first).value == 1
+    assert calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_follower_survives_cancelled_leader():
+    """测试先到的请求被取消（客户端断开）后，等待中的相同请求用自己的会话重新执行"""
+    from pydantic import BaseModel
+    from app.services.idempotency import idempotency_store
+
+    class Echo(BaseModel):
+        session: str
+
+    started = asyncio.Event()
+    calls = []
+
+    async def handler(session):
+        calls.append(session)
+        started.set()
+        await asyncio.sleep(0.2 if session == "leader" else 0)
+        return Echo(session=session)
+
+    leader = asyncio.ensure_future(idempotency_store.run(
+        1, "cancelled", "scope", {"v": 1}, lambda: handler("leader"), Echo
+    ))
+    await started.wait()
+    follower = asyncio.ensure_future(idempotency_store.run(
+        1, "cancelled", "scope", {"v": 1}, lambda: handler("follower"), Echo
+    ))
+    await asyncio.sleep(0.05)
+    leader.cancel()
+
+    assert (await follower).session == "follower"
+    assert calls == ["leader", "follower"]
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_submit_answer_retry_replayed(async_client: AsyncClient, auth_headers, test_user, test_question, db_session):
+    """测试重复提交答案的重试回放首次结果，而不是报重复作答"""
+    progress = UserProgress(user_id=test_user.id, article_id=test_question.article_id, total_count=1)
+    db_session.add(progress)
+    await db_session.commit()
+
+    headers = {**auth_headers, "Idempotency-Key": "submit-1"}
+    body = {"question_id": test_question.id, "user_answer": "A"}
+    first = await async_client.post(f"/api/v1/progress/{progress.id}/submit", json=body, headers=headers)
+    second = await async_client.post(f"/api/v1/progress/{progress.id}/submit", json=body, headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    answers = await db_session.scalar(
+        select(func.count(QuestionAnswer.id)).where(QuestionAnswer.progress_id == progress.id)
+    )
+    assert answers == 1
+
+
+@pytest.mark.asyncio
+async def test_failure_not_cached(async_client: AsyncClient, auth_headers, test_user, test_article, db_session):
+    """测试失败的请求不缓存，同一 key 可以重试"""
+    progress = UserProgress(user_id=test_user.id, article_id=test_article.id, total_count=0)
+    db_session.add(progress)
+    await db_session.commit()
+
+    headers = {**auth_headers, "Idempotency-Key": "complete-1"}
+    failed = await async_client.post(
+        f"/api/v1/progress/{progress.id + 1}/complete", json={"time_spent": 10}, headers=headers
+    )
+    assert failed.status_code != 200
+
+    response = await async_client.post(
+        f"/api/v1/progress/{progress.id}/complete", json={"time_spent": 10}, headers=headers
+    )
+    assert response.status_code == 200
+    replay = await async_client.post(
+        f"/api/v1/progress/{progress.id}/complete", json={"time_spent": 10}, headers=headers
+    )
+    assert replay.json() == response.json()
@@ -0,0 +1,138 @@
+import pytest
+from datetime import datetime, timedelta
+from httpx import AsyncClient
+
+from app.models.article import Article, ArticleStatusEnum, DifficultyEnum
+from app.models.progress import UserProgress
+from app.models.question import Question, QuestionTypeEnum
+from app.services.admin.question_service import admin_question_service
+from app.services.progress_service import progress_service
+from app.utils.exceptions import ValidationError
+from app.utils.pagination import encode_cursor, decode_cursor, next_cursor
+
+
+def test_cursor_round_trip():
+    """测试游标编码解码，包括 datetime"""
+    now = datetime(2026, 3, 1, 8, 30, 15, 123456)
+    cursor = encode_cursor([now, 42])
+    assert decode_cursor(cursor, datetime, int) == (now, 42)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    encode_cursor([1, 2, 3]),
+    encode_cursor([1, 2]),
+    encode_cursor([datetime(2026, 3, 1), "42"]),
+    encode_cursor([datetime(2026, 3, 1), True]),
+    encode_cursor([{"dt": "yesterday"}, 42]),
+])
+def test_invalid_cursor(cursor):
+    """测试格式错误、长度或类型不符的游标"""
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor, datetime, int)
+
+
+def test_next_cursor_only_when_page_full():
+    """测试本页不满时没有下一页游标"""
+    item = Article(id=7)
+    assert next_cursor([item], 2, "id") is None
+    assert decode_cursor(next_cursor([item, item], 2, "id"), int) == (7,)
+
+
+@pytest.mark.asyncio
+async def test_history_cursor_walk(async_client: AsyncClient, auth_headers, test_user, test_article, db_session):
+    """测试按游标翻页遍历阅读历史，完成时间相同的记录不重复不遗漏"""
+    base = datetime(2026, 3, 1, 8, 0, 0)
+    for i in range(7):
+        db_session.add(UserProgress(
+            user_id=test_user.id,
+            article_id=test_article.id,
+            total_count=1,
+            score=i,
+            completed_at=base + timedelta(minutes=i // 2)
+        ))
+    await db_session.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"page_size": 3, "with_total": "false"}
+        if cursor:
+            params["cursor"] = cursor
+        response = await async_client.get("/api/v1/progress/history", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["total"] is None
+        seen.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+
+    items, total = await progress_service.get_history(db_session, test_user.id, 1, 7)
+    assert total == 7
+    assert [item.id for item in items] == seen
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cursor", ["bad", encode_cursor([42, 42]), encode_cursor(["2026-03-01", 42])])
+async def test_history_invalid_cursor(async_client: AsyncClient, auth_headers, cursor):
+    """测试非法游标（包括排序键类型不符）返回 422 而不是服务器错误"""
+    response = await async_client.get(
+        "/api/v1/progress/history", params={"cursor": cursor}, headers=auth_headers
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_admin_question_cursor_walk(db_session, test_article):
+    """测试管理端题目列表按 (article_id, display_order, id) 游标翻页"""
+    for i in range(5):
+        db_session.add(Question(
+            article_id=test_article.id,
+            type=QuestionTypeEnum.JUDGE,
+            content=f"问题{i}",
+            answer="对",
+            display_order=i % 2
+        ))
+    await db_session.commit()
+
+    first, total = await admin_question_service.get_question_list(db_session, page_size=3)
+    cursor = next_cursor(first, 3, "article_id", "display_order", "id")
+    second, no_total = await admin_question_service.get_question_list(
+        db_session, page_size=3, cursor=cursor, with_total=False
+    )
+
+    assert total == 5
+    assert no_total is None
+    ordered = first + second
+    assert len({item.id for item in ordered}) == 5
+    assert [item.display_order for item in ordered] == [0, 0, 0, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_article_list_cursor(async_client: AsyncClient, db_session):
+    """测试文章列表游标翻页"""
+    for i in range(5):
+        db_session.add(Article(
+            title=f"文章{i}",
+            content="内容",
+            word_count=2,
+            reading_time=1,
+            status=ArticleStatusEnum.PUBLISHED,
+            article_difficulty=DifficultyEnum.EASY
+        ))
+    await db_session.commit()
+
+    response = await async_client.get("/api/v1/articles/", params={"page_size": 2})
+    first = response.json()["data"]
+    response = await async_client.get(
+        "/api/v1/articles/", params={"page_size": 2, "cursor": first["next_cursor"]}
+    )
+    second = response.json()["data"]
+
+    assert [item["title"] for item in first["items"]] == ["文章0", "文章1"]
+    assert [item["title"] for item in second["items"]] == ["文章2", "文章3"]
+    assert second["total"] == 5
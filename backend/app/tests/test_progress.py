@@ -452,3 +452,114 @@ async def test_submit_answer_case_insensitive_choice(async_client: AsyncClient,
     assert response.status_code == 200
     data = response.json()
     assert data["data"]["is_correct"] is True
+
+
+async def _quiz(db_session, user, article, count=5):
+    """创建 count 道选择题（答案 A，均关联同一能力）和一条进度"""
+    ability = AbilityDimension(name="整体感知", code="overall", category=AbilityCategoryEnum.COMPREHENSION)
+    db_session.add(ability)
+    await db_session.flush()
+    questions = []
+    for i in range(count):
+        question = Question(
+            article_id=article.id,
+            type=QuestionTypeEnum.CHOICE,
+            content=f"问题{i}",
+            options=["A", "B"],
+            answer="A",
+            difficulty=DifficultyEnum.EASY,
+            display_order=i
+        )
+        db_session.add(question)
+        await db_session.flush()
+        db_session.add(QuestionAbility(question_id=question.id, ability_id=ability.id))
+        questions.append(question)
+    progress = UserProgress(user_id=user.id, article_id=article.id, total_count=count)
+    db_session.add(progress)
+    await db_session.commit()
+    await db_session.refresh(progress)
+    return progress, questions
+
+
+@pytest.mark.asyncio
+async def test_submit_batch(async_client: AsyncClient, auth_headers, test_user, test_article, db_session):
+    """Test submitting all answers of a quiz in one request"""
+    from sqlalchemy import event
+    from app.database import engine
+    from app.models.user_stats import UserStats
+
+    progress, questions = await _quiz(db_session, test_user, test_article)
+    db_session.add(UserStats(user_id=test_user.id))
+    await db_session.commit()
+    answers = [
+        {"question_id": q.id, "user_answer": "A" if i % 2 == 0 else "B"}
+        for i, q in enumerate(questions)
+    ]
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        response = await async_client.post(
+            f"/api/v1/progress/{progress.id}/submit-batch",
+            json={"answers": answers},
+            headers=auth_headers
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["correct_count"] == 3
+    assert data["total_count"] == 5
+    assert [r["question_id"] for r in data["results"]] == [q.id for q in questions]
+    assert [r["is_correct"] for r in data["results"]] == [True, False, True, False, True]
+    assert data["results"][0]["ability_names"] == ["整体感知"]
+
+    inserts = [s for s in statements if s.startswith("INSERT INTO question_answers")]
+    assert len(inserts) == 1
+    assert len([s for s in statements if not s.startswith(("BEGIN", "COMMIT", "ROLLBACK"))]) <= 5
+
+    result = await db_session.execute(
+        select(QuestionAnswer).where(QuestionAnswer.progress_id == progress.id)
+    )
+    assert len(result.scalars().all()) == 5
+    await db_session.refresh(progress)
+    assert progress.correct_count == 3
+
+
+@pytest.mark.asyncio
+async def test_submit_batch_rejects_invalid(async_client: AsyncClient, auth_headers, test_user, test_article, db_session):
+    """Test the batch is rejected as a whole on duplicates, foreign or answered questions"""
+    progress, questions = await _quiz(db_session, test_user, test_article, count=2)
+    other = Article(
+        title="其他文章",
+        content="内容",
+        word_count=2,
+        reading_time=1,
+        status=ArticleStatusEnum.PUBLISHED,
+        article_difficulty=DifficultyEnum.EASY
+    )
+    db_session.add(other)
+    await db_session.flush()
+    foreign = Question(article_id=other.id, type=QuestionTypeEnum.JUDGE, content="问题", answer="对")
+    db_session.add(foreign)
+    db_session.add(QuestionAnswer(progress_id=progress.id, question_id=questions[1].id, user_answer="A", is_correct=True))
+    await db_session.commit()
+
+    url = f"/api/v1/progress/{progress.id}/submit-batch"
+    for answers in (
+        [{"question_id": questions[0].id, "user_answer": "A"}] * 2,
+        [{"question_id": questions[0].id, "user_answer": "A"}, {"question_id": foreign.id, "user_answer": "对"}],
+        [{"question_id": questions[0].id, "user_answer": "A"}, {"question_id": questions[1].id, "user_answer": "A"}],
+    ):
+        response = await async_client.post(url, json={"answers": answers}, headers=auth_headers)
+        assert response.status_code == 422
+
+    result = await db_session.execute(
+        select(QuestionAnswer).where(QuestionAnswer.progress_id == progress.id)
+    )
+    assert len(result.scalars().all()) == 1
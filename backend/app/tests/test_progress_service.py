@@ -2,6 +2,7 @@ import pytest
 from datetime import datetime, date, timedelta
 from sqlalchemy import select
 from app.services.progress_service import ProgressService
+from app.services.completion_worker import completion_worker
 from app.models.user import User
 from app.models.article import Article, ArticleStatusEnum, DifficultyEnum
 from app.models.question import Question, QuestionTypeEnum, QuestionAbility
@@ -325,8 +326,13 @@ async def test_complete_reading(db_session):
     assert result.correct_count == 1
     assert result.total_count == 1
     assert result.time_spent == 180
-    assert result.is_checked_in == True
-    assert result.streak_days >= 1
+    assert result.processing == True
+
+    assert await completion_worker.process_pending() == 1
+    completion = await ProgressService.get_completion_result(db_session, progress.id, user.id)
+    assert completion.status == "done"
+    assert completion.is_checked_in == True
+    assert completion.streak_days >= 1
 
     await db_session.refresh(progress)
     assert progress.score == 100
@@ -440,6 +446,80 @@ async def test_update_user_abilities(db_session):
     assert user_ability.score == 50.0
 
 
+@pytest.mark.asyncio
+async def test_update_user_abilities_accumulates(db_session):
+    """Should aggregate several abilities in one upsert and accumulate existing rows"""
+    from sqlalchemy import event
+    from app.database import engine
+
+    user = User(openid="test_user")
+    article = Article(
+        title="测试文章",
+        content="内容",
+        word_count=100,
+        reading_time=1,
+        status=ArticleStatusEnum.PUBLISHED,
+        article_difficulty=DifficultyEnum.EASY
+    )
+    detail = AbilityDimension(name="细节提取", code="detail", category=AbilityCategoryEnum.INFORMATION)
+    infer = AbilityDimension(name="推理判断", code="infer", category=AbilityCategoryEnum.ANALYSIS)
+    db_session.add_all([user, article, detail, infer])
+    await db_session.flush()
+
+    questions = []
+    for i in range(3):
+        question = Question(
+            article_id=article.id, type=QuestionTypeEnum.JUDGE, content=f"问题{i}", answer="对"
+        )
+        db_session.add(question)
+        questions.append(question)
+    await db_session.flush()
+    db_session.add_all([
+        QuestionAbility(question_id=questions[0].id, ability_id=detail.id),
+        QuestionAbility(question_id=questions[1].id, ability_id=detail.id),
+        QuestionAbility(question_id=questions[1].id, ability_id=infer.id),
+        QuestionAbility(question_id=questions[2].id, ability_id=infer.id),
+    ])
+    existing = UserAbility(user_id=user.id, ability_id=detail.id, correct_count=3, total_count=4, score=75.0)
+    db_session.add(existing)
+    progress = UserProgress(user_id=user.id, article_id=article.id, total_count=3)
+    db_session.add(progress)
+    await db_session.flush()
+    db_session.add_all([
+        QuestionAnswer(progress_id=progress.id, question_id=questions[0].id, user_answer="对", is_correct=True),
+        QuestionAnswer(progress_id=progress.id, question_id=questions[1].id, user_answer="错", is_correct=False),
+        QuestionAnswer(progress_id=progress.id, question_id=questions[2].id, user_answer="对", is_correct=True),
+    ])
+    await db_session.commit()
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        scores = await ProgressService._update_user_abilities(db_session, progress)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+    await db_session.commit()
+
+    assert len(statements) == 2
+    assert [(s.ability_name, s.correct_count, s.total_count, s.score) for s in scores] == [
+        ("细节提取", 1, 2, 50.0),
+        ("推理判断", 1, 2, 50.0),
+    ]
+
+    assert existing.correct_count == 4
+    assert existing.total_count == 6
+    assert existing.score == pytest.approx(66.67, abs=0.01)
+    result = await db_session.execute(
+        select(UserAbility).where(UserAbility.user_id == user.id, UserAbility.ability_id == infer.id)
+    )
+    created = result.scalar_one()
+    assert (created.correct_count, created.total_count, created.score) == (1, 2, 50.0)
+
+
 @pytest.mark.asyncio
 async def test_handle_checkin_first_time(db_session):
     """Should handle first-time check-in"""
@@ -465,7 +545,7 @@ async def test_handle_checkin_first_time(db_session):
     await db_session.commit()
     await db_session.refresh(progress)
 
-    is_checked_in, streak = await ProgressService._handle_checkin(db_session, user, progress)
+    is_checked_in, streak = await ProgressService._handle_checkin(db_session, user, progress, date.today())
 
     assert is_checked_in == True
     assert streak == 1
@@ -506,7 +586,7 @@ async def test_handle_checkin_already_checked_in(db_session):
     db_session.add(checkin)
     await db_session.commit()
 
-    is_checked_in, streak = await ProgressService._handle_checkin(db_session, user, progress)
+    is_checked_in, streak = await ProgressService._handle_checkin(db_session, user, progress, date.today())
 
     assert is_checked_in == False
     assert streak == 5
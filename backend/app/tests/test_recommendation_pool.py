@@ -0,0 +1,99 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from app.models.article import Article, ArticleTag, ArticleStatusEnum, DifficultyEnum
+from app.models.progress import UserProgress
+from app.models.tag import Tag, TagCategoryEnum
+from app.services.admin.article_service import admin_article_service
+from app.services.progress_service import progress_service
+from app.services.recommendation_pool import recommendation_pool
+
+
+async def _create_articles(db_session, count=3, grade=None, difficulty=DifficultyEnum.EASY):
+    tag = None
+    if grade:
+        tag = Tag(name=grade, category=TagCategoryEnum.GRADE)
+        db_session.add(tag)
+        await db_session.flush()
+    articles = []
+    for i in range(count):
+        article = Article(
+            title=f"{grade or '文章'}{i}",
+            content="内容" * 10,
+            word_count=20,
+            reading_time=1,
+            status=ArticleStatusEnum.PUBLISHED,
+            article_difficulty=difficulty
+        )
+        db_session.add(article)
+        await db_session.flush()
+        if tag is not None:
+            db_session.add(ArticleTag(article_id=article.id, tag_id=tag.id))
+        articles.append(article)
+    await db_session.commit()
+    return articles
+
+
+def test_sample_skips_excluded():
+    """测试抽样跳过已读，全部已读时返回 None"""
+    pool = [1, 2, 3]
+    for _ in range(20):
+        assert recommendation_pool.sample(pool, {1, 2}) == 3
+    assert recommendation_pool.sample(pool, {1, 2, 3}) is None
+    assert recommendation_pool.sample([], set()) is None
+
+
+@pytest.mark.asyncio
+async def test_pools_by_grade_and_difficulty(db_session):
+    """测试按年级、难度划分候选池"""
+    grade3 = await _create_articles(db_session, 2, grade="3年级", difficulty=DifficultyEnum.MEDIUM)
+    easy = await _create_articles(db_session, 2)
+
+    assert await recommendation_pool.get_pool(db_session, grade="3年级") == [a.id for a in grade3]
+    assert await recommendation_pool.get_pool(db_session, difficulty=DifficultyEnum.EASY) == [a.id for a in easy]
+    assert len(await recommendation_pool.get_pool(db_session)) == 4
+
+
+@pytest.mark.asyncio
+async def test_pick_today_excludes_only_today(db_session, test_user):
+    """测试只排除今天读过的文章，昨天读过的仍可推荐"""
+    articles = await _create_articles(db_session, 2)
+    db_session.add_all([
+        UserProgress(user_id=test_user.id, article_id=articles[0].id, total_count=0),
+        UserProgress(
+            user_id=test_user.id,
+            article_id=articles[1].id,
+            total_count=0,
+            created_at=datetime.now() - timedelta(days=2)
+        ),
+    ])
+    await db_session.commit()
+
+    for _ in range(10):
+        assert await recommendation_pool.pick_today(db_session, test_user.id, None) == articles[1].id
+
+
+@pytest.mark.asyncio
+async def test_start_reading_marks_read(db_session, test_user):
+    """测试开始阅读后直接更新今日已读集合，不再查库"""
+    articles = await _create_articles(db_session, 2)
+    assert await recommendation_pool.get_reads_today(db_session, test_user.id) == set()
+
+    await progress_service.start_reading(db_session, test_user.id, articles[0].id)
+
+    with patch.object(recommendation_pool, "_load_reads", side_effect=AssertionError("不应查询数据库")):
+        assert await recommendation_pool.get_reads_today(db_session, test_user.id) == {articles[0].id}
+        assert await recommendation_pool.pick_today(db_session, test_user.id, None) == articles[1].id
+
+
+@pytest.mark.asyncio
+async def test_archive_refreshes_pool(db_session, test_user):
+    """测试归档文章后候选池刷新"""
+    articles = await _create_articles(db_session, 2, grade="2年级")
+    assert len(await recommendation_pool.get_pool(db_session, grade="2年级")) == 2
+
+    await admin_article_service.archive_article(db_session, articles[0].id)
+
+    assert await recommendation_pool.get_pool(db_session, grade="2年级") == [articles[1].id]
+    assert await recommendation_pool.pick_today(db_session, test_user.id, "2年级") == articles[1].id
@@ -0,0 +1,147 @@
+import pytest
+from datetime import date, timedelta
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.models.ability import AbilityDimension, AbilityCategoryEnum
+from app.models.article import Article, ArticleStatusEnum, DifficultyEnum
+from app.models.progress import UserProgress
+from app.models.question import Question, QuestionAbility, QuestionTypeEnum
+from app.models.recommendation import UserRecommendation, RecommendationKindEnum
+from app.models.user_ability import UserAbility
+from app.services.admin.article_service import admin_article_service
+from app.services.recommendation_queue import recommendation_queue
+
+
+async def _create_articles(db_session, count):
+    articles = []
+    for i in range(count):
+        article = Article(
+            title=f"文章{i}",
+            content="内容" * 10,
+            word_count=20,
+            reading_time=1,
+            status=ArticleStatusEnum.PUBLISHED,
+            article_difficulty=DifficultyEnum.EASY
+        )
+        db_session.add(article)
+        articles.append(article)
+    await db_session.commit()
+    return articles
+
+
+async def _queue(db_session, user_id, kind):
+    result = await db_session.execute(
+        select(UserRecommendation).where(
+            UserRecommendation.user_id == user_id, UserRecommendation.kind == kind
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+@pytest.mark.asyncio
+async def test_precompute_today_prefers_unread(db_session, test_user):
+    """测试今日推荐队列不重复，未读文章排在前面"""
+    articles = await _create_articles(db_session, 4)
+    db_session.add(UserProgress(user_id=test_user.id, article_id=articles[0].id, total_count=0))
+    await db_session.commit()
+
+    written = await recommendation_queue.precompute(db_session, [test_user.id], date.today(), size=4)
+
+    assert written == 1
+    queue = await _queue(db_session, test_user.id, RecommendationKindEnum.TODAY)
+    assert sorted(queue.article_ids) == sorted(a.id for a in articles)
+    assert queue.article_ids[-1] == articles[0].id
+    assert await _queue(db_session, test_user.id, RecommendationKindEnum.WEAK_POINT) is None
+
+
+@pytest.mark.asyncio
+async def test_precompute_weak_point(db_session, test_user):
+    """测试补弱项队列按能力缺口排序"""
+    articles = await _create_articles(db_session, 2)
+    ability = AbilityDimension(name="细节提取", code="detail", category=AbilityCategoryEnum.INFORMATION)
+    db_session.add(ability)
+    await db_session.flush()
+    question = Question(article_id=articles[1].id, type=QuestionTypeEnum.JUDGE, content="问题", answer="对")
+    db_session.add(question)
+    await db_session.flush()
+    db_session.add_all([
+        QuestionAbility(question_id=question.id, ability_id=ability.id, weight=3),
+        UserAbility(user_id=test_user.id, ability_id=ability.id, score=40.0),
+    ])
+    await db_session.commit()
+
+    await recommendation_queue.precompute(db_session, [test_user.id], date.today(), size=5)
+
+    queue = await _queue(db_session, test_user.id, RecommendationKindEnum.WEAK_POINT)
+    assert queue.article_ids == [articles[1].id]
+
+
+@pytest.mark.asyncio
+async def test_today_endpoint_pops_queue(async_client: AsyncClient, auth_headers, test_user, db_session):
+    """测试接口按顺序取队列，跳过已下架文章，队列用完后实时计算"""
+    articles = await _create_articles(db_session, 3)
+    db_session.add(UserRecommendation(
+        user_id=test_user.id,
+        kind=RecommendationKindEnum.TODAY,
+        for_date=date.today(),
+        article_ids=[articles[2].id, articles[0].id, articles[1].id]
+    ))
+    await db_session.commit()
+    await admin_article_service.archive_article(db_session, articles[0].id)
+
+    titles = []
+    for _ in range(3):
+        response = await async_client.get("/api/v1/articles/today", headers=auth_headers)
+        assert response.status_code == 200
+        titles.append(response.json()["data"]["title"])
+
+    assert titles[:2] == ["文章2", "文章1"]
+    assert titles[2] in {"文章1", "文章2"}
+    remaining = await db_session.scalar(
+        select(UserRecommendation.article_ids).where(UserRecommendation.user_id == test_user.id)
+    )
+    assert remaining == []
+
+
+@pytest.mark.asyncio
+async def test_stale_queue_ignored(db_session, test_user):
+    """测试过期队列不会被使用，purge_before 会删除"""
+    articles = await _create_articles(db_session, 1)
+    db_session.add(UserRecommendation(
+        user_id=test_user.id,
+        kind=RecommendationKindEnum.TODAY,
+        for_date=date.today() - timedelta(days=1),
+        article_ids=[articles[0].id]
+    ))
+    await db_session.commit()
+
+    assert await recommendation_queue.pop(db_session, test_user.id, RecommendationKindEnum.TODAY) is None
+
+    await recommendation_queue.purge_before(db_session, date.today())
+    assert await _queue(db_session, test_user.id, RecommendationKindEnum.TODAY) is None
+
+
+@pytest.mark.asyncio
+async def test_pop_from_two_sessions_never_repeats(db_session, test_user):
+    """测试不同会话交替出队时，每篇文章只会被取出一次"""
+    from app.database import AsyncSessionLocal
+
+    db_session.add(UserRecommendation(
+        user_id=test_user.id,
+        kind=RecommendationKindEnum.TODAY,
+        for_date=date.today(),
+        article_ids=[11, 12, 13]
+    ))
+    await db_session.commit()
+    user_id = test_user.id
+
+    # 本会话持有队列行对象（identity map 中保留），另一个会话出队后它就是旧值
+    queue = await _queue(db_session, user_id, RecommendationKindEnum.TODAY)
+    popped = [await recommendation_queue.pop(db_session, user_id, RecommendationKindEnum.TODAY)]
+    async with AsyncSessionLocal() as other:
+        popped.append(await recommendation_queue.pop(other, user_id, RecommendationKindEnum.TODAY))
+    popped.append(await recommendation_queue.pop(db_session, user_id, RecommendationKindEnum.TODAY))
+
+    assert popped == [11, 12, 13]
+    assert queue.article_ids == []
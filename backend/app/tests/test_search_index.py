@@ -0,0 +1,114 @@
+import pytest
+
+from app.models.article import Article, ArticleTag, ArticleStatusEnum, DifficultyEnum
+from app.models.tag import Tag, TagCategoryEnum
+from app.services.article_service import article_service
+from app.services.admin.article_service import admin_article_service
+from app.services.search_index import search_index, index_terms, query_terms
+from app.schemas.admin.article import ArticleUpdateRequest
+
+
+def _article(title, content, source_book=None, status=ArticleStatusEnum.PUBLISHED):
+    return Article(
+        title=title,
+        content=content,
+        source_book=source_book,
+        word_count=len(content),
+        reading_time=1,
+        status=status,
+        article_difficulty=DifficultyEnum.EASY
+    )
+
+
+def test_terms():
+    """测试中文按二字切分，英文按词切分"""
+    assert query_terms("小蝌蚪") == ["小蝌", "蝌蚪"]
+    assert query_terms("狐") == ["狐"]
+    assert query_terms("Aesop 寓言！") == ["aesop", "寓言"]
+    assert index_terms("龟兔") == ["龟", "兔", "龟兔"]
+
+
+@pytest.mark.asyncio
+async def test_search_content_and_rank(db_session):
+    """测试正文短语可被搜到，标题命中排在正文命中之前"""
+    in_content = _article("森林里的故事", "一只狐狸看见了葡萄架上的葡萄。")
+    in_title = _article("狐狸和葡萄", "很久以前，有一只饥饿的动物。")
+    unrelated = _article("龟兔赛跑", "乌龟和兔子比赛跑步。")
+    draft = _article("狐狸草稿", "狐狸", status=ArticleStatusEnum.DRAFT)
+    db_session.add_all([in_content, in_title, unrelated, draft])
+    await db_session.commit()
+
+    items, total = await article_service.get_article_list(db_session, keyword="狐狸")
+    assert total == 2
+    assert [item.title for item in items] == ["狐狸和葡萄", "森林里的故事"]
+
+    # 所有二字词项都需命中
+    _, total = await article_service.get_article_list(db_session, keyword="狐狸赛跑")
+    assert total == 0
+
+    items, total = await article_service.get_article_list(db_session, keyword="葡萄架")
+    assert total == 1
+    assert items[0].title == "森林里的故事"
+
+
+@pytest.mark.asyncio
+async def test_search_source_book_with_tag_filter(db_session):
+    """测试关键词搜索与标签筛选取交集"""
+    grade3 = Tag(name="3年级", category=TagCategoryEnum.GRADE)
+    db_session.add(grade3)
+    first = _article("狼来了", "放羊的孩子。", source_book="伊索寓言")
+    second = _article("狐狸和乌鸦", "乌鸦叼着肉。", source_book="伊索寓言")
+    db_session.add_all([first, second])
+    await db_session.flush()
+    db_session.add(ArticleTag(article_id=first.id, tag_id=grade3.id))
+    await db_session.commit()
+
+    _, total = await article_service.get_article_list(db_session, keyword="伊索")
+    assert total == 2
+
+    items, total = await article_service.get_article_list(
+        db_session, keyword="伊索", grade="3年级"
+    )
+    assert total == 1
+    assert items[0].title == "狼来了"
+
+
+@pytest.mark.asyncio
+async def test_search_pagination(db_session):
+    """测试搜索结果分页，总数为全部命中数"""
+    for i in range(5):
+        db_session.add(_article(f"故事{i}", "小蝌蚪找妈妈" * (i + 1)))
+    await db_session.commit()
+
+    first_page, total = await article_service.get_article_list(
+        db_session, keyword="蝌蚪", page=1, page_size=2
+    )
+    second_page, _ = await article_service.get_article_list(
+        db_session, keyword="蝌蚪", page=2, page_size=2
+    )
+    assert total == 5
+    assert len(first_page) == 2
+    assert not {item.id for item in first_page} & {item.id for item in second_page}
+
+
+@pytest.mark.asyncio
+async def test_index_updated_incrementally(db_session):
+    """测试管理端修改、归档文章后索引增量更新"""
+    article = _article("旧标题", "普通内容。")
+    db_session.add(article)
+    await db_session.commit()
+    await db_session.refresh(article)
+
+    assert await article_service.get_article_list(db_session, keyword="彩虹") == ([], 0)
+
+    await admin_article_service.update_article(
+        db_session, article.id, ArticleUpdateRequest(content="下过一场大雨以后，天边出现了彩虹。")
+    )
+    assert len(search_index) == 1
+    _, total = await article_service.get_article_list(db_session, keyword="彩虹")
+    assert total == 1
+
+    await admin_article_service.archive_article(db_session, article.id)
+    assert len(search_index) == 0
+    _, total = await article_service.get_article_list(db_session, keyword="彩虹")
+    assert total == 0
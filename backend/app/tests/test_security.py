@@ -69,6 +69,51 @@ async def test_verify_token_empty():
     assert payload is None
 
 
+@pytest.mark.asyncio
+async def test_verify_token_cached():
+    """测试验证通过的Token被缓存，重复验证不再解码"""
+    from unittest.mock import patch
+    from app.utils.security import clear_token_cache
+
+    clear_token_cache()
+    token = create_access_token({"sub": "321"})
+
+    first = verify_token(token)
+    with patch("app.utils.security.jwt.decode", side_effect=AssertionError("不应再次解码")):
+        second = verify_token(token)
+
+    assert second == first
+    second["sub"] = "tampered"
+    assert verify_token(token)["sub"] == "321"
+
+
+@pytest.mark.asyncio
+async def test_verify_token_cache_honours_exp():
+    """测试缓存不超过Token有效期"""
+    from unittest.mock import patch
+    from app.utils.security import clear_token_cache
+
+    clear_token_cache()
+    token = create_access_token({"sub": "654"}, timedelta(seconds=30))
+
+    with patch("app.utils.cache.time.monotonic", return_value=1000.0):
+        assert verify_token(token) is not None
+    with patch("app.utils.cache.time.monotonic", return_value=1031.0), \
+            patch("app.utils.security.jwt.decode", side_effect=AssertionError("已过期条目应重新解码")):
+        with pytest.raises(AssertionError):
+            verify_token(token)
+
+
+@pytest.mark.asyncio
+async def test_verify_token_invalid_not_cached():
+    """测试验证失败的Token不进入缓存"""
+    from app.utils.security import clear_token_cache, _token_cache
+
+    clear_token_cache()
+    assert verify_token("invalid.token.string") is None
+    assert len(_token_cache) == 0
+
+
 @pytest.mark.skip(reason="passlib/bcrypt version incompatibility during initialization")
 @pytest.mark.asyncio
 async def test_get_password_hash():
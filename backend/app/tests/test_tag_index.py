@@ -0,0 +1,122 @@
+import pytest
+from unittest.mock import patch
+
+from app.models.article import Article, ArticleTag, ArticleStatusEnum, DifficultyEnum
+from app.models.tag import Tag, TagCategoryEnum
+from app.services.article_service import article_service
+from app.services.admin.article_service import admin_article_service
+from app.services.catalogue_cache import catalogue_cache
+from app.services.tag_index import tag_index
+from app.schemas.admin.article import ArticleUpdateRequest
+
+
+async def _create_articles(db_session):
+    grade3 = Tag(name="3年级", category=TagCategoryEnum.GRADE)
+    fable = Tag(name="寓言", category=TagCategoryEnum.GENRE)
+    aesop = Tag(name="伊索寓言", category=TagCategoryEnum.SOURCE)
+    db_session.add_all([grade3, fable, aesop])
+    await db_session.flush()
+
+    specs = [
+        ("狐狸和葡萄", DifficultyEnum.EASY, ArticleStatusEnum.PUBLISHED, [grade3, fable, aesop]),
+        ("龟兔赛跑", DifficultyEnum.MEDIUM, ArticleStatusEnum.PUBLISHED, [grade3, fable]),
+        ("小蝌蚪找妈妈", DifficultyEnum.EASY, ArticleStatusEnum.PUBLISHED, [grade3]),
+        ("草稿寓言", DifficultyEnum.EASY, ArticleStatusEnum.DRAFT, [grade3, fable]),
+    ]
+    articles = []
+    for title, difficulty, status, tags in specs:
+        article = Article(
+            title=title,
+            content="内容" * 10,
+            word_count=20,
+            reading_time=1,
+            status=status,
+            article_difficulty=difficulty
+        )
+        db_session.add(article)
+        await db_session.flush()
+        for tag in tags:
+            db_session.add(ArticleTag(article_id=article.id, tag_id=tag.id))
+        articles.append(article)
+    await db_session.commit()
+    return articles, {"grade3": grade3, "fable": fable, "aesop": aesop}
+
+
+@pytest.mark.asyncio
+async def test_lookup_intersects_filters(db_session):
+    """测试多个筛选条件取交集，且只包含已发布文章"""
+    articles, _ = await _create_articles(db_session)
+    await tag_index.ensure_current(db_session)
+
+    grade = (TagCategoryEnum.GRADE, "3年级")
+    genre = (TagCategoryEnum.GENRE, "寓言")
+    source = (TagCategoryEnum.SOURCE, "伊索寓言")
+
+    assert tag_index.lookup([grade]) == [articles[0].id, articles[1].id, articles[2].id]
+    assert tag_index.lookup([grade, genre]) == [articles[0].id, articles[1].id]
+    assert tag_index.lookup([grade, genre, source]) == [articles[0].id]
+    assert tag_index.lookup([grade, genre], DifficultyEnum.EASY) == [articles[0].id]
+    assert tag_index.lookup([(TagCategoryEnum.GENRE, "童话")]) == []
+    assert tag_index.lookup([]) == [articles[0].id, articles[1].id, articles[2].id]
+
+
+@pytest.mark.asyncio
+async def test_article_list_uses_index(db_session):
+    """测试标签筛选的列表只加载当页文章，不再执行 count 查询"""
+    articles, _ = await _create_articles(db_session)
+    await tag_index.ensure_current(db_session)
+
+    executed = []
+    original_execute = db_session.execute
+
+    async def tracking_execute(statement, *args, **kwargs):
+        executed.append(str(statement))
+        return await original_execute(statement, *args, **kwargs)
+
+    with patch.object(db_session, "execute", side_effect=tracking_execute):
+        items, total = await article_service.get_article_list(
+            db_session, page=1, page_size=1, grade="3年级", genre="寓言"
+        )
+
+    assert total == 2
+    assert [item.title for item in items] == ["狐狸和葡萄"]
+    assert not any("count(" in sql for sql in executed)
+    assert not any("article_tags.article_id" in sql and "IN (SELECT" in sql for sql in executed)
+
+
+@pytest.mark.asyncio
+async def test_index_updated_on_publish_and_tag_change(db_session):
+    """测试发布文章、修改标签后索引增量更新"""
+    articles, tags = await _create_articles(db_session)
+    await tag_index.ensure_current(db_session)
+    genre = (TagCategoryEnum.GENRE, "寓言")
+
+    await admin_article_service.publish_article(db_session, articles[3].id)
+    assert articles[3].id in tag_index.lookup([genre])
+
+    await admin_article_service.update_article(
+        db_session, articles[0].id, ArticleUpdateRequest(tag_ids=[tags["grade3"].id])
+    )
+    assert articles[0].id not in tag_index.lookup([genre])
+    assert tag_index._generation == await catalogue_cache.generation()
+
+    await admin_article_service.archive_article(db_session, articles[1].id)
+    assert tag_index.lookup([genre]) == [articles[3].id]
+
+
+@pytest.mark.asyncio
+async def test_index_rebuilt_when_generation_moves(db_session):
+    """测试目录版本被外部改变后重建索引"""
+    articles, _ = await _create_articles(db_session)
+    await tag_index.ensure_current(db_session)
+
+    await catalogue_cache.bump()
+    await db_session.execute(
+        Article.__table__.update()
+        .where(Article.id == articles[2].id)
+        .values(status=ArticleStatusEnum.ARCHIVED)
+    )
+    await db_session.commit()
+
+    await tag_index.ensure_current(db_session)
+    assert articles[2].id not in tag_index.lookup([(TagCategoryEnum.GRADE, "3年级")])
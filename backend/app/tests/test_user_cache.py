@@ -0,0 +1,96 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import update
+
+from app.models.user import User, GradeEnum
+from app.services.user_cache import user_cache
+from app.utils.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """测试超过容量时淘汰最久未使用的条目"""
+    cache = LRUCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_expires_entries():
+    """测试条目过期后不再返回"""
+    cache = LRUCache(max_size=10, ttl=60)
+    with patch("app.utils.cache.time.monotonic", return_value=1000.0):
+        cache.set("a", 1)
+    with patch("app.utils.cache.time.monotonic", return_value=1059.0):
+        assert cache.get("a") == 1
+    with patch("app.utils.cache.time.monotonic", return_value=1061.0):
+        assert cache.get("a") is None
+    assert "a" not in cache
+
+
+@pytest.mark.asyncio
+async def test_get_user_served_from_cache(db_session):
+    """测试缓存命中时不再查询数据库"""
+    user = User(openid="cache_user", nickname="小明", grade=GradeEnum.GRADE_3)
+    db_session.add(user)
+    await db_session.commit()
+    await db_session.refresh(user)
+
+    first = await user_cache.get_user(db_session, user.id)
+    assert first.nickname == "小明"
+
+    db_session.expunge_all()
+    with patch.object(db_session, "execute", side_effect=AssertionError("不应查询数据库")):
+        cached = await user_cache.get_user(db_session, user.id)
+
+    assert cached.id == user.id
+    assert cached.nickname == "小明"
+    assert cached.grade == GradeEnum.GRADE_3
+
+
+@pytest.mark.asyncio
+async def test_cached_snapshot_not_merged_into_session(db_session):
+    """测试缓存快照不进入会话，同一会话中按 ID 加载仍读取数据库的最新值"""
+    user = User(openid="snapshot_user", nickname="旧昵称")
+    db_session.add(user)
+    await db_session.commit()
+    user_id = user.id
+    await user_cache.get_user(db_session, user_id)
+    db_session.expunge_all()
+
+    await db_session.execute(update(User).where(User.id == user_id).values(nickname="新昵称"))
+    await db_session.commit()
+
+    cached = await user_cache.get_user(db_session, user_id)
+    assert cached.nickname == "旧昵称"
+    assert cached not in db_session
+    assert (await db_session.get(User, user_id)).nickname == "新昵称"
+
+
+@pytest.mark.asyncio
+async def test_update_user_invalidates_cache(async_client, test_user, auth_headers):
+    """测试更新用户信息后缓存失效"""
+    response = await async_client.get("/api/v1/users/me", headers=auth_headers)
+    assert response.json()["data"]["nickname"] is None
+
+    response = await async_client.put(
+        "/api/v1/users/me",
+        json={"nickname": "新昵称"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    response = await async_client.get("/api/v1/users/me", headers=auth_headers)
+    assert response.json()["data"]["nickname"] == "新昵称"
+
+
+@pytest.mark.asyncio
+async def test_get_user_not_found_is_not_cached(db_session):
+    """测试不存在的用户不写入缓存"""
+    assert await user_cache.get_user(db_session, 999999) is None
+    assert 999999 not in user_cache._cache.local
@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import select
+
+from app.models.badge import Badge, BadgeConditionTypeEnum, BadgeCategoryEnum
+from app.models.progress import UserProgress, QuestionAnswer
+from app.models.user_stats import UserStats
+from app.services.completion_worker import completion_worker
+from app.services.progress_service import ProgressService
+from app.services.user_service import UserService
+from app.services.user_stats import user_stats_counter
+
+
+async def _stats_row(db_session, user_id):
+    return await db_session.scalar(
+        select(UserStats)
+        .where(UserStats.user_id == user_id)
+        .execution_options(populate_existing=True)
+    )
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_answers_and_completion(db_session, test_user, test_question):
+    """测试答题、完成阅读和勋章发放增量更新统计"""
+    db_session.add(Badge(
+        name="阅读新星",
+        description="完成第一次阅读",
+        category=BadgeCategoryEnum.READING,
+        condition_type=BadgeConditionTypeEnum.FIRST_READING,
+        condition_value=1
+    ))
+    progress = UserProgress(user_id=test_user.id, article_id=test_question.article_id, total_count=1)
+    db_session.add(progress)
+    await db_session.commit()
+
+    await ProgressService.submit_answer(db_session, progress.id, test_user.id, test_question.id, test_question.answer)
+    row = await _stats_row(db_session, test_user.id)
+    assert (row.total_questions, row.correct_count) == (1, 1)
+
+    await ProgressService.complete_reading(db_session, progress.id, test_user.id, 150)
+    await completion_worker.process_pending()
+
+    row = await _stats_row(db_session, test_user.id)
+    assert (row.total_questions, row.correct_count, row.total_seconds, row.badge_count) == (1, 1, 150, 1)
+
+    stats = await UserService.get_user_stats(db_session, test_user.id)
+    assert stats.total_questions == 1
+    assert stats.correct_rate == 100.0
+    assert stats.total_badges == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_row_rebuilt_without_double_count(db_session, test_user, test_question):
+    """测试老用户首次增量时从明细重建，不重复累加当前事务中的答题"""
+    progress = UserProgress(
+        user_id=test_user.id, article_id=test_question.article_id, total_count=2, time_spent=120
+    )
+    db_session.add(progress)
+    await db_session.flush()
+    db_session.add(QuestionAnswer(
+        progress_id=progress.id, question_id=test_question.id, user_answer="B", is_correct=False
+    ))
+    await db_session.commit()
+
+    db_session.add(QuestionAnswer(
+        progress_id=progress.id, question_id=test_question.id, user_answer="A", is_correct=True
+    ))
+    await user_stats_counter.increment(db_session, test_user.id, total_questions=1, correct_count=1)
+    await db_session.commit()
+
+    row = await _stats_row(db_session, test_user.id)
+    assert (row.total_questions, row.correct_count, row.total_seconds) == (2, 1, 120)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_fixes_drift(db_session, test_user):
+    """测试重建覆盖漂移的计数"""
+    db_session.add(UserStats(user_id=test_user.id, total_questions=99, correct_count=50, badge_count=7))
+    await db_session.commit()
+
+    await user_stats_counter.rebuild(db_session, [test_user.id])
+    await db_session.commit()
+
+    row = await _stats_row(db_session, test_user.id)
+    assert (row.total_questions, row.correct_count, row.total_seconds, row.badge_count) == (0, 0, 0, 0)
@@ -102,6 +102,18 @@ async def test_get_user_stats(async_client: AsyncClient, db_session, auth_header
     assert data["data"]["total_questions"] == 0
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/api/v1/users/me/stats", "/api/v1/users/me/checkins"])
+async def test_deleted_user_token_unauthorized(async_client: AsyncClient, path):
+    """测试已删除用户的有效 token 返回 401 而不是服务器错误"""
+    from app.utils.security import create_access_token
+
+    token = create_access_token({"sub": "987654"})
+    response = await async_client.get(path, headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 401
+
+
 @pytest.mark.asyncio
 async def test_get_user_stats_with_data(
     async_client: AsyncClient, 
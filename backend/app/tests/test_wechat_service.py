@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+
+from app.services.wechat_service import wechat_service
+
+
+@pytest.mark.asyncio
+async def test_code2session_success(wechat_mock_server):
+    """测试换取 openid 成功"""
+    result = await wechat_service.code2session("abc")
+
+    assert result == {"openid": "openid_abc", "session_key": "mock_session_key"}
+    assert wechat_mock_server.calls == ["abc"]
+
+
+@pytest.mark.asyncio
+async def test_code2session_invalid_code(wechat_mock_server):
+    """测试无效 code 返回 None"""
+    assert await wechat_service.code2session("invalid_code") is None
+
+
+@pytest.mark.asyncio
+async def test_code2session_reuses_client(wechat_mock_server):
+    """测试多次调用复用同一个 HTTP 客户端"""
+    await wechat_service.code2session("first")
+    client = wechat_service.get_client()
+    await wechat_service.code2session("second")
+
+    assert wechat_service.get_client() is client
+    assert wechat_mock_server.calls == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_code2session_singleflight(wechat_mock_server):
+    """测试相同 code 的并发请求只调用一次微信接口"""
+    wechat_mock_server.delay = 0.05
+
+    results = await asyncio.gather(*[wechat_service.code2session("same") for _ in range(5)])
+    other = await wechat_service.code2session("other")
+
+    assert all(r == results[0] for r in results)
+    assert results[0]["openid"] == "openid_same"
+    assert other["openid"] == "openid_other"
+    assert wechat_mock_server.calls == ["same", "other"]
+
+
+@pytest.mark.asyncio
+async def test_code2session_singleflight_cancel_does_not_affect_others(wechat_mock_server):
+    """测试某个等待者被取消不影响其他等待者"""
+    wechat_mock_server.delay = 0.05
+
+    first = asyncio.ensure_future(wechat_service.code2session("shared"))
+    second = asyncio.ensure_future(wechat_service.code2session("shared"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    result = await second
+    assert result["openid"] == "openid_shared"
+    assert wechat_mock_server.calls == ["shared"]
+
+
+@pytest.mark.asyncio
+async def test_wechat_login_with_mock_server(async_client: AsyncClient, wechat_mock_server):
+    """测试通过本地模拟服务完成微信登录"""
+    response = await async_client.post(
+        "/api/v1/auth/wechat-login",
+        json={"code": "login_code"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["data"]["is_new_user"] is True
+    assert wechat_mock_server.calls == ["login_code"]
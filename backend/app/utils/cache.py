@@ -0,0 +1,128 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+_redis_client = None
+
+
+def get_redis():
+    """获取共享的 Redis 客户端（未配置 REDIS_URL 时返回 None）"""
+    global _redis_client
+    if not settings.REDIS_URL:
+        return None
+    if _redis_client is None:
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            return None
+        _redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _redis_client
+
+
+class LRUCache:
+    """进程内 LRU 缓存，条目按 TTL 过期"""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+
+class TieredCache:
+    """两级缓存：进程内 LRU + 可选 Redis
+
+    值需可 JSON 序列化。Redis 不可用时自动退化为仅进程内缓存，
+    缓存故障不会影响正常请求。
+    """
+
+    def __init__(self, namespace: str, max_size: int = 1024, ttl: float = 60.0):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.local = LRUCache(max_size=max_size, ttl=ttl)
+
+    def _redis_key(self, key: Any) -> str:
+        return f"{settings.APP_NAME}:{self.namespace}:{key}"
+
+    async def get(self, key: Any) -> Optional[Any]:
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        redis = get_redis()
+        if redis is None:
+            return None
+        try:
+            raw = await redis.get(self._redis_key(key))
+        except Exception as e:
+            logger.warning("Redis 读取失败: %s", e)
+            return None
+        if raw is None:
+            return None
+
+        value = json.loads(raw)
+        self.local.set(key, value)
+        return value
+
+    async def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        self.local.set(key, value, ttl)
+
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.set(self._redis_key(key), json.dumps(value), ex=max(1, int(ttl)))
+        except Exception as e:
+            logger.warning("Redis 写入失败: %s", e)
+
+    async def delete(self, key: Any) -> None:
+        self.local.delete(key)
+
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(self._redis_key(key))
+        except Exception as e:
+            logger.warning("Redis 删除失败: %s", e)
+
+    def clear_local(self) -> None:
+        self.local.clear()
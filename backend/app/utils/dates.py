@@ -0,0 +1,46 @@
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import case, literal, Date
+
+from app.config import settings
+
+
+def business_tz() -> Optional[tzinfo]:
+    """业务时区（BUSINESS_TZ）；未配置时返回 None，表示使用服务器本地时区"""
+    return ZoneInfo(settings.BUSINESS_TZ) if settings.BUSINESS_TZ else None
+
+
+def business_today() -> date:
+    """业务上的“今天”：打卡、连续天数、每日汇总、活跃用户草图和看板统计都按它归日"""
+    return datetime.now(business_tz()).date()
+
+
+def business_date(moment: datetime) -> date:
+    """库中时间戳（UTC，不带时区）所在的业务日期"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    tz = business_tz()
+    return (moment.astimezone(tz) if tz else moment.astimezone()).date()
+
+
+def day_bounds(day: date) -> Tuple[datetime, datetime]:
+    """业务日期 day 对应的 UTC 时间范围 [start, end)，与库中不带时区的时间戳直接比较"""
+    def to_utc(d: date) -> datetime:
+        tz = business_tz()
+        local = datetime.combine(d, time.min, tzinfo=tz) if tz else datetime.combine(d, time.min).astimezone()
+        return local.astimezone(timezone.utc).replace(tzinfo=None)
+    return to_utc(day), to_utc(day + timedelta(days=1))
+
+
+def day_column(column, days: List[date]):
+    """把 UTC 时间戳列映射为业务日期的 SQL 表达式（只覆盖 days 这些连续日期）
+
+    按各天的 UTC 边界展开成 CASE，与数据库方言和夏令时无关；调用方需同时按
+    day_bounds(days[0])[0] 到 day_bounds(days[-1])[1] 过滤。
+    """
+    return case(
+        *[(column < day_bounds(day)[1], literal(day, Date)) for day in days],
+        else_=None
+    )
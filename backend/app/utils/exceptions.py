@@ -29,3 +29,9 @@ class ValidationError(AppException):
     """验证错误"""
     def __init__(self, message: str = "参数验证失败"):
         super().__init__(code=1004, message=message, status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
+class TooManyRequestsError(AppException):
+    """请求过于频繁"""
+    def __init__(self, message: str = "请求过于频繁，请稍后再试"):
+        super().__init__(code=1005, message=message, status_code=status.HTTP_429_TOO_MANY_REQUESTS)
@@ -0,0 +1,80 @@
+import hashlib
+import math
+from typing import Hashable, Iterable, Optional
+
+DEFAULT_PRECISION = 14
+
+
+def _hash64(value: Hashable) -> int:
+    digest = hashlib.blake2b(str(value).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    """HyperLogLog 基数估计
+
+    2^precision 个寄存器，每个 1 字节；相对标准误差约 1.04 / sqrt(2^precision)
+    （默认精度 14 时约 0.81%）。两个同精度的草图按寄存器取最大值即可合并，
+    合并结果等价于对两边元素的并集计数，所以按天保存的草图可以合并出任意区间。
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Optional[bytes] = None):
+        self.precision = precision
+        self.m = 1 << precision
+        self._registers = bytearray(registers) if registers else bytearray(self.m)
+        if len(self._registers) != self.m:
+            raise ValueError("寄存器数量与精度不匹配")
+
+    @classmethod
+    def from_bytes(cls, raw: Optional[bytes], precision: int = DEFAULT_PRECISION) -> "HyperLogLog":
+        return cls(precision, raw or None)
+
+    def to_bytes(self) -> bytes:
+        """序列化寄存器；空草图存为空串"""
+        return bytes(self._registers) if any(self._registers) else b""
+
+    @classmethod
+    def union(cls, sketches: Iterable["HyperLogLog"], precision: int = DEFAULT_PRECISION) -> "HyperLogLog":
+        merged = cls(precision)
+        for sketch in sketches:
+            merged.merge(sketch)
+        return merged
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+    def copy(self) -> "HyperLogLog":
+        return HyperLogLog(self.precision, bytes(self._registers))
+
+    def add(self, value: Hashable) -> bool:
+        """加入一个元素，返回寄存器是否发生变化"""
+        x = _hash64(value)
+        width = 64 - self.precision
+        index = x >> width
+        rank = width - (x & ((1 << width) - 1)).bit_length() + 1
+        if rank <= self._registers[index]:
+            return False
+        self._registers[index] = rank
+        return True
+
+    def merge(self, other: "HyperLogLog") -> bool:
+        """合并另一个草图，返回自身是否发生变化"""
+        if other.precision != self.precision:
+            raise ValueError("只能合并相同精度的草图")
+        merged = bytearray(map(max, self._registers, other._registers))
+        if merged == self._registers:
+            return False
+        self._registers = merged
+        return True
+
+    def count(self) -> int:
+        m = self.m
+        zeros = self._registers.count(0)
+        if zeros == m:
+            return 0
+        estimate = (0.7213 / (1 + 1.079 / m)) * m * m / sum(2.0 ** -r for r in self._registers)
+        # 小基数时用线性计数修正
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
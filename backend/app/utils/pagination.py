@@ -0,0 +1,64 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+from sqlalchemy import and_, or_
+
+from app.utils.exceptions import ValidationError
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """把排序键的值编码为不透明的游标字符串"""
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_value(value: Any, kind: type) -> Any:
+    if kind is datetime:
+        if not isinstance(value, dict) or not isinstance(value.get("dt"), str):
+            raise ValueError(value)
+        return datetime.fromisoformat(value["dt"])
+    if kind is int:
+        # bool 是 int 的子类，不能当作 ID
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValueError(value)
+        return value
+    raise TypeError(kind)
+
+
+def decode_cursor(cursor: str, *kinds: type) -> Tuple[Any, ...]:
+    """按排序键各列的类型（int 或 datetime）解析游标，格式或类型不对时抛出 ValidationError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(kinds):
+            raise ValueError(cursor)
+        return tuple(_decode_value(value, kind) for value, kind in zip(payload, kinds))
+    except (ValueError, TypeError, KeyError):
+        raise ValidationError("分页游标无效")
+
+
+def next_cursor(items: Sequence[Any], page_size: int, *fields: str) -> Optional[str]:
+    """本页已满时用最后一条记录的排序键生成下一页游标"""
+    if not items or len(items) < page_size:
+        return None
+    last = items[-1]
+    return encode_cursor([getattr(last, field) for field in fields])
+
+
+def keyset_after(columns: Sequence[Any], values: Sequence[Any], descending: bool = False):
+    """排序键 (c1, c2, ...) 严格位于游标之后的条件
+
+    展开成 c1 > v1 OR (c1 = v1 AND c2 > v2) ...，降序时比较方向相反，
+    各数据库都能用上 (c1, c2, ...) 上的联合索引。
+    """
+    clauses = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        compare = column < value if descending else column > value
+        equals = [c == v for c, v in zip(columns[:i], values[:i])]
+        clauses.append(and_(*equals, compare) if equals else compare)
+    return or_(*clauses)
@@ -1,11 +1,20 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from app.config import settings
+from app.utils.cache import LRUCache
+from app.utils.exceptions import TooManyRequestsError
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# 已验证 Token 缓存：key 为 Token 摘要，条目在 Token 过期时失效
+_token_cache = LRUCache(max_size=settings.TOKEN_CACHE_MAX_SIZE, ttl=settings.TOKEN_CACHE_MAX_TTL_SECONDS)
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """创建 JWT Token"""
@@ -20,8 +29,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def verify_token(token: str) -> Optional[dict]:
-    """验证 JWT Token"""
+def _decode_token(token: str) -> Optional[dict]:
+    """完整解码并校验 JWT Token（不走缓存）"""
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         return payload
@@ -29,6 +38,33 @@ def verify_token(token: str) -> Optional[dict]:
         return None
 
 
+def verify_token(token: str) -> Optional[dict]:
+    """验证 JWT Token
+
+    验证通过的 Token 按摘要缓存，缓存时长不超过 Token 剩余有效期；
+    验证失败的 Token 不缓存。
+    """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = _token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
+
+    payload = _decode_token(token)
+    if payload is None:
+        return None
+
+    exp = payload.get("exp")
+    if exp is not None:
+        remaining = float(exp) - time.time()
+        if remaining > 0:
+            _token_cache.set(key, dict(payload), ttl=min(remaining, _token_cache.ttl))
+    return payload
+
+
+def clear_token_cache() -> None:
+    _token_cache.clear()
+
+
 def get_password_hash(password: str) -> str:
     """密码哈希（用于管理员账号）"""
     if len(password.encode('utf-8')) > 72:
@@ -41,3 +77,65 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     if len(plain_password.encode('utf-8')) > 72:
         plain_password = plain_password[:72]
     return pwd_context.verify(plain_password, hashed_password)
+
+
+# bcrypt 计算放到独立线程池，避免阻塞事件循环
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_password_pending = 0
+
+
+async def _run_password_task(func, *args):
+    """在密码线程池中执行，排队任务超过上限时直接拒绝"""
+    global _password_pending
+    if _password_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise TooManyRequestsError("登录请求过多，请稍后再试")
+    _password_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, func, *args)
+    finally:
+        _password_pending -= 1
+
+
+async def get_password_hash_async(password: str) -> str:
+    """密码哈希（线程池执行）"""
+    return await _run_password_task(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """验证密码（线程池执行）"""
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
+
+class LoginThrottle:
+    """按键（如 客户端 IP + 用户名）限制登录失败次数
+
+    window 秒内失败达到 max_failures 次后拒绝该键的登录，
+    直到最早的一次失败移出时间窗口。
+    """
+
+    def __init__(self, max_failures: int, window: float, max_size: int = 10000):
+        self.max_failures = max_failures
+        self.window = window
+        self._failures = LRUCache(max_size=max_size, ttl=window)
+
+    def _recent(self, key: str) -> list:
+        cutoff = time.monotonic() - self.window
+        return [t for t in self._failures.get(key, []) if t > cutoff]
+
+    def check(self, key: str) -> None:
+        if len(self._recent(key)) >= self.max_failures:
+            raise TooManyRequestsError("登录失败次数过多，请稍后再试")
+
+    def record_failure(self, key: str) -> None:
+        failures = self._recent(key)
+        failures.append(time.monotonic())
+        self._failures.set(key, failures)
+
+    def reset(self, key: str) -> None:
+        self._failures.delete(key)
+
+    def clear(self) -> None:
+        self._failures.clear()
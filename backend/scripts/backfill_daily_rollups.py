@@ -0,0 +1,45 @@
+"""
+从明细表重算每日汇总（daily_rollups / daily_ability_rollups），可重复执行
+运行方式: python -m scripts.backfill_daily_rollups [--from 2026-01-01] [--to 2026-03-31] [--days 90] [--chunk-days 31]
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+
+from app.database import AsyncSessionLocal
+from app.services.daily_rollup import daily_rollup
+from app.utils.dates import business_today
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="回填每日汇总")
+    parser.add_argument("--from", dest="start", type=date.fromisoformat, help="开始日期（默认结束日期前 --days 天）")
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, help="结束日期（默认今天）")
+    parser.add_argument("--days", type=int, default=90, help="未指定开始日期时回填的天数")
+    parser.add_argument("--chunk-days", type=int, default=31, help="每个事务处理的天数")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    end = args.end or business_today()
+    start = args.start or end - timedelta(days=args.days - 1)
+    started = time.perf_counter()
+
+    print(f"开始回填 {start} ~ {end} 的每日汇总...")
+    days = 0
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(chunk_start + timedelta(days=args.chunk_days - 1), end)
+        async with AsyncSessionLocal() as session:
+            days += await daily_rollup.rebuild(session, chunk_start, chunk_end)
+            await session.commit()
+        chunk_start = chunk_end + timedelta(days=1)
+
+    elapsed = time.perf_counter() - started
+    print(f"✓ 已回填 {days} 天，用时 {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
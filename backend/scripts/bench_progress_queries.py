@@ -0,0 +1,132 @@
+"""
+统计答题主流程（开始阅读 → 提交答案 → 完成阅读）每个请求执行的 SQL 条数，
+对比「加载完整用户」与「只信任 Token 中的用户 ID」两种认证方式。
+运行方式: python -m scripts.bench_progress_queries
+"""
+import asyncio
+import uuid
+from datetime import timedelta
+
+from fastapi import Depends
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from app.main import app
+from app.database import AsyncSessionLocal, engine, init_db
+from app.api.deps import get_current_user, get_current_user_id
+from app.models.user import User
+from app.models.article import Article, ArticleStatusEnum, DifficultyEnum
+from app.models.question import Question, QuestionTypeEnum
+from app.services.user_cache import user_cache
+from app.utils.security import create_access_token
+
+QUESTION_COUNT = 5
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+async def _full_user_id(user: User = Depends(get_current_user)) -> int:
+    """旧方式：每次请求都加载完整用户"""
+    return user.id
+
+
+async def create_fixture():
+    async with AsyncSessionLocal() as session:
+        user = User(openid=f"bench_{uuid.uuid4().hex}")
+        article = Article(
+            title="基准测试文章",
+            content="基准测试内容" * 20,
+            word_count=120,
+            reading_time=1,
+            status=ArticleStatusEnum.PUBLISHED,
+            article_difficulty=DifficultyEnum.EASY
+        )
+        session.add_all([user, article])
+        await session.flush()
+        questions = [
+            Question(
+                article_id=article.id,
+                type=QuestionTypeEnum.CHOICE,
+                content=f"问题{i}",
+                options=["A", "B", "C", "D"],
+                answer="A",
+                display_order=i
+            )
+            for i in range(QUESTION_COUNT)
+        ]
+        session.add_all(questions)
+        await session.commit()
+        return user.id, article.id, [q.id for q in questions]
+
+
+async def run_hot_path(client: AsyncClient, counter: QueryCounter, headers: dict,
+                       article_id: int, question_ids: list, cold_cache: bool) -> list:
+    """执行一次完整答题流程，返回每个请求的 SQL 条数"""
+    counts = []
+
+    async def call(method: str, url: str, payload: dict) -> dict:
+        if cold_cache:
+            user_cache.clear()
+        counter.count = 0
+        response = await client.request(method, url, json=payload, headers=headers)
+        response.raise_for_status()
+        counts.append(counter.count)
+        return response.json()["data"]
+
+    data = await call("POST", "/api/v1/progress/start", {"article_id": article_id})
+    progress_id = data["progress_id"]
+    for question_id in question_ids:
+        await call("POST", f"/api/v1/progress/{progress_id}/submit",
+                   {"question_id": question_id, "user_answer": "A"})
+    await call("POST", f"/api/v1/progress/{progress_id}/complete", {"time_spent": 60})
+    return counts
+
+
+async def main():
+    await init_db()
+    user_id, article_id, question_ids = await create_fixture()
+    token = create_access_token({"sub": str(user_id)}, expires_delta=timedelta(hours=1))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+
+    scenarios = [
+        ("完整用户（无缓存）", True, True),
+        ("完整用户（缓存命中）", True, False),
+        ("仅用户 ID", False, False),
+    ]
+    results = {}
+    try:
+        async with AsyncClient(app=app, base_url="http://bench") as client:
+            for name, load_full_user, cold_cache in scenarios:
+                if load_full_user:
+                    app.dependency_overrides[get_current_user_id] = _full_user_id
+                else:
+                    app.dependency_overrides.pop(get_current_user_id, None)
+                results[name] = await run_hot_path(
+                    client, counter, headers, article_id, question_ids, cold_cache
+                )
+    finally:
+        app.dependency_overrides.clear()
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+    requests = 2 + QUESTION_COUNT
+    baseline = sum(results[scenarios[0][0]])
+    print(f"答题主流程：{requests} 个请求（{QUESTION_COUNT} 道题）")
+    for name, counts in results.items():
+        total = sum(counts)
+        print(
+            f"  {name:<12} 共 {total:>3} 条 SQL，平均 {total / requests:.2f} 条/请求，"
+            f"比无缓存少 {(baseline - total) / requests:.2f} 条/请求"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+"""
+从 JSONL 或 CSV 文件批量导入文章（含题目、能力维度和标签）
+运行方式: python -m scripts.import_articles data/aesop.jsonl [--format csv] [--publish] [--chunk-size 500]
+
+JSONL 每行一篇文章:
+  {"title": "狐狸和葡萄", "content": "...", "source_book": "伊索寓言", "tags": ["genre:寓言"],
+   "questions": [{"type": "choice", "content": "...", "options": ["A", "B"], "answer": "A",
+                  "abilities": [{"ability": "detail_extraction", "weight": 2}]}]}
+CSV 首行为表头，列名与 JSONL 字段相同；tags 用 | 分隔，questions 为 JSON 数组。
+"""
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from app.database import AsyncSessionLocal
+from app.services.admin.import_service import IMPORT_FORMATS, admin_import_service, parse_csv, parse_jsonl
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="批量导入文章")
+    parser.add_argument("path", type=Path, help="JSONL 或 CSV 文件")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="文件格式（默认按扩展名判断）")
+    parser.add_argument("--publish", action="store_true", help="导入后直接发布")
+    parser.add_argument("--chunk-size", type=int, help="每个事务处理的记录数（默认 IMPORT_CHUNK_SIZE）")
+    return parser.parse_args()
+
+
+async def read_lines(path: Path):
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        for line in f:
+            yield line.rstrip("\r\n")
+
+
+async def main():
+    args = parse_args()
+    fmt = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "jsonl")
+    started = time.perf_counter()
+
+    lines = read_lines(args.path)
+    records = parse_csv(lines) if fmt == "csv" else parse_jsonl(lines)
+    async with AsyncSessionLocal() as session:
+        result = await admin_import_service.import_records(
+            session, records, publish=args.publish, chunk_size=args.chunk_size
+        )
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"✓ 已导入 {result.imported}/{result.total} 篇文章、{result.questions} 道题，"
+        f"失败 {result.failed} 篇，用时 {elapsed:.1f}s"
+    )
+    for error in result.errors:
+        title = f"《{error.title}》" if error.title else ""
+        print(f"  第 {error.line} 行{title}: {error.message}")
+    if result.errors_truncated:
+        print(f"  ……仅显示前 {len(result.errors)} 条错误")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""
+从 check_ins 明细生成打卡位图（check_in_calendars），可重复执行
+运行方式: python -m scripts.migrate_checkin_calendars [--chunk-size 500] [--fix-max-streak]
+"""
+import argparse
+import asyncio
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from sqlalchemy import select, delete
+
+from app.database import AsyncSessionLocal
+from app.models.checkin import CheckIn
+from app.models.checkin_calendar import CheckInCalendar
+from app.models.user import User
+from app.services.checkin_calendar import checkin_calendar, day_bit, encode
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="从打卡明细生成打卡位图")
+    parser.add_argument("--chunk-size", type=int, default=500, help="每批处理的用户数")
+    parser.add_argument(
+        "--fix-max-streak", action="store_true", help="按位图重新计算并修正用户的最长连续打卡天数"
+    )
+    return parser.parse_args()
+
+
+async def user_chunks(chunk_size: int):
+    """按用户 ID 游标分批返回有打卡记录的用户"""
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(CheckIn.user_id)
+                .where(CheckIn.user_id > last_id)
+                .group_by(CheckIn.user_id)
+                .order_by(CheckIn.user_id)
+                .limit(chunk_size)
+            )
+            user_ids = list(result.scalars().all())
+        if not user_ids:
+            return
+        yield user_ids
+        last_id = user_ids[-1]
+
+
+async def migrate_chunk(user_ids: List[int], fix_max_streak: bool) -> int:
+    """重建一批用户的全部位图行，返回写入的行数"""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(CheckIn.user_id, CheckIn.check_date).where(CheckIn.user_id.in_(user_ids))
+        )
+        bitmaps: Dict[int, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        for user_id, check_date in result.all():
+            bitmaps[user_id][check_date.year] |= 1 << day_bit(check_date)
+
+        await session.execute(
+            delete(CheckInCalendar).where(CheckInCalendar.user_id.in_(user_ids))
+        )
+        rows = [
+            CheckInCalendar(
+                user_id=user_id, year=year, bits=encode(bits), days_count=bin(bits).count("1")
+            )
+            for user_id, years in bitmaps.items()
+            for year, bits in years.items()
+        ]
+        session.add_all(rows)
+
+        if fix_max_streak:
+            users = await session.execute(select(User).where(User.id.in_(user_ids)))
+            for user in users.scalars().all():
+                calendars = {row.year: row for row in rows if row.user_id == user.id}
+                user.max_streak_days = max(
+                    checkin_calendar.max_streak(calendars), user.streak_days or 0
+                )
+
+        await session.commit()
+        return len(rows)
+
+
+async def main():
+    args = parse_args()
+    started = time.perf_counter()
+
+    users = 0
+    rows = 0
+    async for user_ids in user_chunks(args.chunk_size):
+        rows += await migrate_chunk(user_ids, args.fix_max_streak)
+        users += len(user_ids)
+
+    elapsed = time.perf_counter() - started
+    print(f"✓ {users} 个用户，写入 {rows} 行打卡位图，用时 {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""
+预计算活跃用户的推荐队列（建议每天凌晨执行一次）
+运行方式: python -m scripts.precompute_recommendations [--size 10] [--active-days 30] [--chunk-size 500] [--workers 4]
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models.progress import UserProgress
+from app.services.recommendation_queue import recommendation_queue
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="预计算活跃用户的推荐队列")
+    parser.add_argument("--size", type=int, default=10, help="每个队列的文章数")
+    parser.add_argument("--active-days", type=int, default=30, help="最近多少天有阅读记录算活跃用户")
+    parser.add_argument("--chunk-size", type=int, default=500, help="每批处理的用户数")
+    parser.add_argument("--workers", type=int, default=4, help="并发处理的批数")
+    return parser.parse_args()
+
+
+async def active_user_chunks(since: datetime, chunk_size: int):
+    """按用户 ID 游标分批返回活跃用户"""
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(UserProgress.user_id)
+                .where(UserProgress.created_at >= since, UserProgress.user_id > last_id)
+                .group_by(UserProgress.user_id)
+                .order_by(UserProgress.user_id)
+                .limit(chunk_size)
+            )
+            user_ids = list(result.scalars().all())
+        if not user_ids:
+            return
+        yield user_ids
+        last_id = user_ids[-1]
+
+
+async def process_chunk(user_ids: List[int], for_date: date, size: int, semaphore: asyncio.Semaphore) -> int:
+    async with semaphore:
+        async with AsyncSessionLocal() as session:
+            return await recommendation_queue.precompute(session, user_ids, for_date, size)
+
+
+async def main():
+    args = parse_args()
+    for_date = date.today()
+    since = datetime.combine(for_date - timedelta(days=args.active_days), datetime.min.time())
+    semaphore = asyncio.Semaphore(args.workers)
+    started = time.perf_counter()
+
+    print(f"开始预计算 {for_date} 的推荐队列...")
+    tasks = []
+    users = 0
+    async for user_ids in active_user_chunks(since, args.chunk_size):
+        users += len(user_ids)
+        tasks.append(asyncio.create_task(process_chunk(user_ids, for_date, args.size, semaphore)))
+    queues = sum(await asyncio.gather(*tasks))
+
+    async with AsyncSessionLocal() as session:
+        await recommendation_queue.purge_before(session, for_date)
+
+    elapsed = time.perf_counter() - started
+    print(f"✓ {users} 个活跃用户，写入 {queues} 个推荐队列，用时 {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+"""
+校对文章的题目数（articles.question_count），修正与 questions 表不一致的文章
+运行方式: python -m scripts.reconcile_question_counts [--chunk-size 1000]
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models.article import Article
+from app.services.admin.article_service import AdminArticleService
+from app.services.catalogue_cache import catalogue_cache
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="校对文章题目数")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="每批处理的文章数")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+    started = time.perf_counter()
+
+    articles = 0
+    fixed = []
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(Article.id)
+                .where(Article.id > last_id)
+                .order_by(Article.id)
+                .limit(args.chunk_size)
+            )
+            article_ids = list(result.scalars().all())
+            if not article_ids:
+                break
+            chunk_fixed = await AdminArticleService.reconcile_question_counts(session, article_ids)
+            await session.commit()
+            for article_id in chunk_fixed:
+                await catalogue_cache.bump(session, article_id)
+        fixed.extend(chunk_fixed)
+        articles += len(article_ids)
+        last_id = article_ids[-1]
+
+    elapsed = time.perf_counter() - started
+    print(f"✓ 已校对 {articles} 篇文章，修正 {len(fixed)} 篇，用时 {elapsed:.1f}s")
+    if fixed:
+        print(f"  修正的文章: {', '.join(map(str, fixed[:50]))}{' ...' if len(fixed) > 50 else ''}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+"""
+从答题、阅读和勋章明细重建用户统计计数（user_stats）
+运行方式: python -m scripts.reconcile_user_stats [--chunk-size 500] [--user-id 1 --user-id 2]
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models.user import User
+from app.services.user_stats import user_stats_counter
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="重建用户统计计数")
+    parser.add_argument("--chunk-size", type=int, default=500, help="每批处理的用户数")
+    parser.add_argument("--user-id", type=int, action="append", help="只重建指定用户（可重复）")
+    return parser.parse_args()
+
+
+async def user_chunks(chunk_size: int):
+    """按用户 ID 游标分批返回全部用户"""
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(User.id)
+                .where(User.id > last_id)
+                .order_by(User.id)
+                .limit(chunk_size)
+            )
+            user_ids = list(result.scalars().all())
+        if not user_ids:
+            return
+        yield user_ids
+        last_id = user_ids[-1]
+
+
+async def rebuild(user_ids) -> None:
+    async with AsyncSessionLocal() as session:
+        await user_stats_counter.rebuild(session, user_ids)
+        await session.commit()
+
+
+async def main():
+    args = parse_args()
+    started = time.perf_counter()
+
+    users = 0
+    if args.user_id:
+        await rebuild(args.user_id)
+        users = len(args.user_id)
+    else:
+        async for user_ids in user_chunks(args.chunk_size):
+            await rebuild(user_ids)
+            users += len(user_ids)
+
+    elapsed = time.perf_counter() - started
+    print(f"✓ 已重建 {users} 个用户的统计计数，用时 {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())